@@ -0,0 +1,4 @@
+"""
+Benchmark suite: synthetic instructions files generator (:mod:`benchmarks.generate`) and phase
+timings runner of every available engine (:mod:`benchmarks.run`).
+"""
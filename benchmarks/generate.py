@@ -0,0 +1,66 @@
+"""
+Generate synthetic instructions files of configurable grid size, number of mowers, number of moves
+per mower and distribution of L/R/F moves.
+
+Usage:
+    python -m benchmarks.generate OUTPUT [--grid-size X Y] [--mowers N] [--moves M]
+                                         [--weights L R F] [--seed SEED]
+"""
+
+import io
+import random
+from argparse import ArgumentParser
+from typing import List, Optional, Sequence, Tuple
+
+# Moves are written by pieces of at most this number of chars, to bound memory
+_MOVES_PIECE_SIZE = 1 << 16
+
+
+def generate(stream: io.TextIOBase, grid_size: Tuple[int, int], n_mowers: int, n_moves: int,
+             weights: Sequence[float] = (1, 1, 8), seed: int = 0):
+    """
+    Write a random instructions file to stream.
+
+    Args:
+        stream: output stream.
+        grid_size: grid size.
+        n_mowers: number of mowers.
+        n_moves: number of moves of each mower.
+        weights: relative frequencies of L, R and F moves.
+        seed: random seed.
+    """
+    rng = random.Random(seed)
+    max_x, max_y = grid_size
+
+    stream.write(f'{max_x} {max_y}\n')
+
+    for _ in range(n_mowers):
+        x, y = rng.randint(0, max_x), rng.randint(0, max_y)
+        stream.write(f'{x} {y} {rng.choice("NESW")}\n')
+
+        for start in range(0, n_moves, _MOVES_PIECE_SIZE):
+            k = min(_MOVES_PIECE_SIZE, n_moves - start)
+            stream.write(''.join(rng.choices('LRF', weights=weights, k=k)))
+        stream.write('\n')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = ArgumentParser(description='Generate a synthetic instructions file')
+    parser.add_argument('output', help='output instructions file')
+    parser.add_argument('--grid-size', type=int, nargs=2, default=(1000, 1000),
+                        metavar=('X', 'Y'), help='grid size (default: 1000 1000)')
+    parser.add_argument('--mowers', type=int, default=1000, help='number of mowers (default: 1000)')
+    parser.add_argument('--moves', type=int, default=1000,
+                        help='number of moves of each mower (default: 1000)')
+    parser.add_argument('--weights', type=float, nargs=3, default=(1, 1, 8),
+                        metavar=('L', 'R', 'F'),
+                        help='relative frequencies of L, R and F moves (default: 1 1 8)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    args = parser.parse_args(argv)
+
+    with open(args.output, 'w') as f:
+        generate(f, args.grid_size, args.mowers, args.moves, args.weights, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Time parse, simulate and output phases of instructions files through the mower CLI, separately for
+every available execution mode (engines, batch, stream, bulk and ranges parsers, memory-mapped
+input), and report moves/sec and peak memory as JSON.
+
+Every mode runs in a fresh process, so that its peak memory is measured independently.
+
+Usage:
+    python -m benchmarks.run INPUT [INPUT ...] [--modes MODE ...] [--output JSON]
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from mower import cli
+from mower.batch import np
+from mower.engines import ENGINES
+
+# CLI flags of every benchmarked execution mode
+MODES = OrderedDict([(engine, ['--engine', engine]) for engine in sorted(ENGINES)] + [
+    ('batch', ['--batch']),
+    ('stream', ['--stream']),
+    ('bulk', ['--parser', 'bulk']),
+    ('ranges', ['--parser', 'ranges', '--jobs', str(os.cpu_count() or 1)]),
+    ('mmap', ['--mmap'])
+])
+
+
+def available_modes() -> List[str]:
+    """
+    Names of execution modes runnable in current environment.
+    """
+    return [mode for mode in MODES if mode != 'batch' or np is not None]
+
+
+def run_mode(path: str, mode: str) -> Dict[str, Any]:
+    """
+    Run the mower CLI on an instructions file in a given execution mode, discarding results, and
+    return its stats: phase timings, numbers of mowers and moves, moves/sec, wall hits and peak
+    memory.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats_path = os.path.join(tmp_dir, 'stats.json')
+        cli.main([path, *MODES[mode], '--no-cache', '--output', os.devnull,
+                  '--stats-json', stats_path])
+        with open(stats_path) as f:
+            return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = ArgumentParser(description='Benchmark mower execution modes on instructions files')
+    parser.add_argument('inputs', nargs='+', metavar='INPUT', help='instructions files')
+    parser.add_argument('--modes', nargs='+', choices=available_modes(),
+                        default=available_modes(),
+                        help='execution modes to benchmark (default: all available)')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='output JSON file (default: bench_results.json)')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for path in args.inputs:
+        results[path] = {}
+        for mode in args.modes:
+            # Fresh process per mode, for independent peak memory measurements
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                stats = executor.submit(run_mode, path, mode).result()
+
+            results[path][mode] = stats
+            print(f'{path} {mode}: {stats["phase_seconds"]["simulate"]:.3f}s simulate, '
+                  f'{stats["moves_per_second"] or 0:,.0f} moves/s, '
+                  f'{stats["peak_rss_bytes"] / 2 ** 20:.1f} MiB peak RSS', file=sys.stderr)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'modes': {mode: MODES[mode] for mode in args.modes},
+        'results': results
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
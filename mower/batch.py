@@ -0,0 +1,116 @@
+"""
+Vectorized batch engine moving many mowers in lockstep.
+
+All mowers states are kept in NumPy arrays (x, y, orientation index), and move t of every mower is
+applied at once. Mowers whose moves are exhausted are masked out.
+
+Requires NumPy (`pip install mower[batch]`).
+"""
+
+from typing import List, Sequence
+
+from mower.structs import DELTAS, ORIENTATIONS, Mower, Orientation, Position
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Number of moves of each mower copied into arrays at once
+BLOCK_SIZE = 4096
+
+# Largest grid size coordinate: states are held in int64 arrays, and may step one cell past the
+# grid before being clamped back into it
+MAX_COORDINATE = (1 << 63) - 2
+
+
+def simulate_batch(mowers: Sequence[Mower], all_moves: Sequence[str]) -> List[Mower]:
+    """
+    Apply moves to mowers, all of them at once, and return the mowers in their final state.
+
+    Args:
+        mowers: mowers in their initial state (left untouched).
+        all_moves: validated moves specification (concatenated L/R/F chars) of each mower.
+    """
+    if np is None:  # pragma: no cover
+        raise ImportError('NumPy is required by the batch engine; pip install mower[batch]')
+
+    if len(mowers) != len(all_moves):
+        raise ValueError(f'Got {len(all_moves)} moves specifications for {len(mowers)} mowers')
+
+    for mower in mowers:
+        if max(mower.grid_size) > MAX_COORDINATE:
+            raise ValueError(f'Grid size {mower.grid_size} too large for the batch engine: '
+                             f'coordinates must be <= {MAX_COORDINATE}')
+
+    # Sort mowers by decreasing number of moves, so that those still moving at step t are the
+    # first ones
+    lengths = np.array([len(moves) for moves in all_moves], dtype=np.int64)
+    order = np.argsort(-lengths, kind='stable')
+    lengths = lengths[order]
+
+    sorted_mowers = [mowers[i] for i in order]
+    sorted_moves = [all_moves[i] for i in order]
+
+    x = np.array([mower.x for mower in sorted_mowers], dtype=np.int64)
+    y = np.array([mower.y for mower in sorted_mowers], dtype=np.int64)
+    o = np.array([mower.orientation_index for mower in sorted_mowers], dtype=np.int64)
+    max_x = np.array([mower.grid_size[0] for mower in sorted_mowers], dtype=np.int64)
+    max_y = np.array([mower.grid_size[1] for mower in sorted_mowers], dtype=np.int64)
+
+    max_length = int(lengths[0]) if len(lengths) else 0
+
+    for start in range(0, max_length, BLOCK_SIZE):
+        n_active = int(np.count_nonzero(lengths > start))
+        block = _moves_block(sorted_moves[:n_active], start, BLOCK_SIZE)
+
+        ax, ay, ao = x[:n_active], y[:n_active], o[:n_active]
+        amax_x, amax_y = max_x[:n_active], max_y[:n_active]
+
+        for codes in block:
+            ao += _TURNS[codes]
+            ao &= 3
+
+            forward = _FORWARD[codes]
+            ax += _DX[ao] * forward
+            ay += _DY[ao] * forward
+
+            np.clip(ax, 0, amax_x, out=ax)
+            np.clip(ay, 0, amax_y, out=ay)
+
+    final_mowers = [None] * len(sorted_mowers)
+    for i, mower, final_x, final_y, final_o in zip(order.tolist(), sorted_mowers, x.tolist(),
+                                                   y.tolist(), o.tolist()):
+        final_mowers[i] = Mower(Position(final_x, final_y), Orientation(ORIENTATIONS[final_o]),
+                                mower.grid_size)
+
+    return final_mowers
+
+
+def _moves_block(all_moves: Sequence[str], start: int, size: int) -> 'np.ndarray':
+    """
+    Copy moves [start, start + size) of each mower into a (step, mower) array of move bytes.
+
+    Mowers with fewer moves are padded with zeros (no-op moves).
+    """
+    block = np.zeros((len(all_moves), size), dtype=np.uint8)
+    for row, moves in zip(block, all_moves):
+        chunk = moves[start:start + size].encode('ascii')
+        row[:len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+
+    return np.ascontiguousarray(block.T)
+
+
+if np is not None:
+
+    # Quarter clockwise turns and forward flag of each move byte; other bytes are no-op moves.
+    # Orientations are in clockwise order: a right turn adds 1 to orientation index, a left turn 3
+    _TURNS = np.zeros(256, dtype=np.int64)
+    _TURNS[ord('R')] = 1
+    _TURNS[ord('L')] = 3
+
+    _FORWARD = np.zeros(256, dtype=np.int64)
+    _FORWARD[ord('F')] = 1
+
+    # Unit displacement of each orientation index
+    _DX, _DY = np.array(DELTAS, dtype=np.int64).T.copy()
@@ -0,0 +1,166 @@
+"""
+Fast alternative to :mod:`mower.parser`, parsing whole instructions files at the bytes level.
+
+The file is read in large blocks and split into lines in bulk. All lines of a block are then
+validated at once: initial state lines with a regular expression, before being split into ints and
+orientations in bulk, and moves lines with :meth:`bytes.translate`, rather than one line or char at
+a time. Only a block holding an unusual (e.g. "+1 2 N") or invalid line is parsed line by line.
+Parsing errors raise the same :exception:`ValueError` messages as :mod:`mower.parser`.
+"""
+
+import io
+import itertools
+import re
+from typing import Iterator, List, Tuple
+
+from mower.parser import parse_grid_size_line, parse_mower_line
+from mower.structs import ORIENTATIONS, Mower
+
+# Default number of bytes read from stream at once
+BLOCK_SIZE = 1 << 24
+
+_VALID_MOVE_TOKENS = b'LRF'
+
+# Initial state lines joined by newlines, in their most common form
+_MOWER_LINES_PATTERN = re.compile(rb'(?:[0-9]+ [0-9]+ [NESW]\n)*')
+
+_ORIENTATION_INDICES = {orientation.encode(): index
+                        for index, orientation in enumerate(ORIENTATIONS)}
+
+
+def parse_instructions(stream: io.BufferedIOBase, block_size: int = BLOCK_SIZE) \
+        -> Tuple[Tuple[int, int], Iterator[Tuple[Mower, str]]]:
+    """
+    Parse grid size from a binary instructions file stream, and lazily parse mowers initial states
+    and moves from the rest of it.
+
+    Args:
+        stream: binary input specification file stream.
+        block_size: number of bytes read from stream at once.
+
+    Returns:
+        grid size and an iterator over (mower, moves) pairs.
+    """
+    line_blocks = _iter_line_blocks(stream, block_size)
+
+    first_lines = next(line_blocks, [b''])
+    grid_size = parse_grid_size_line(decode_line(first_lines[0]))
+
+    return grid_size, _iter_mowers(itertools.chain([first_lines[1:]], line_blocks), grid_size)
+
+
+def parse_moves_line(line: bytes) -> str:
+    """
+    Validate a moves line read as bytes, all at once, and return it as a moves specification
+    (concatenated one-char moves).
+    """
+    if line.translate(None, _VALID_MOVE_TOKENS):
+        raise ValueError(f'Invalid moves: "{decode_line(line)}"')
+
+    return line.decode('ascii')
+
+
+def decode_line(line: bytes) -> str:
+    """
+    Decode a line read as bytes, for parsing by :mod:`mower.parser` or reporting in error messages.
+    """
+    return line.decode('utf8', errors='replace')
+
+
+def _iter_mowers(line_blocks: Iterator[List[bytes]],
+                 grid_size: Tuple[int, int]) -> Iterator[Tuple[Mower, str]]:
+    """
+    Parse mowers initial states and moves from blocks of lines, until an empty initial state line.
+    """
+    # Initial state line whose moves line is in the next block
+    pending = []
+
+    for lines in line_blocks:
+        if pending:
+            lines = pending + lines
+        pending = lines[-1:] if len(lines) % 2 else []
+
+        mower_lines = lines[:len(lines) - len(pending):2]
+        moves_lines = lines[1::2]
+
+        try:
+            n_mowers = mower_lines.index(b'')
+            ended = True
+        except ValueError:
+            n_mowers = len(mower_lines)
+            ended = False
+
+        yield from _parse_mower_blocks(mower_lines[:n_mowers], moves_lines[:n_mowers], grid_size)
+
+        if ended:
+            return
+
+    if pending and pending[0]:
+        yield from _parse_mower_blocks(pending, [b''], grid_size)
+
+
+def _parse_mower_blocks(mower_lines: List[bytes], moves_lines: List[bytes],
+                        grid_size: Tuple[int, int]) -> Iterator[Tuple[Mower, str]]:
+    """
+    Parse mowers initial states and moves from non-empty initial state lines and their moves lines.
+    """
+    mower_text = b'\n'.join(mower_lines) + b'\n'
+    moves_text = b'\n'.join(moves_lines)
+
+    if (not _MOWER_LINES_PATTERN.fullmatch(mower_text) or
+            moves_text.translate(None, _VALID_MOVE_TOKENS + b'\n')):
+        # Parse line by line, for errors to be raised in input order
+        for mower_line, moves_line in zip(mower_lines, moves_lines):
+            mower = parse_mower_line(decode_line(mower_line), grid_size)
+            yield mower, parse_moves_line(moves_line)
+        return
+
+    # Split all lines at once: x, y, orientation, x, y, orientation, etc.
+    tokens = mower_text.split()
+    max_x, max_y = grid_size
+    xs, ys = list(map(int, tokens[0::3])), list(map(int, tokens[1::3]))
+    # Force initial positions inside grid
+    if xs and max(xs) > max_x:
+        xs = [min(x, max_x) for x in xs]
+    if ys and max(ys) > max_y:
+        ys = [min(y, max_y) for y in ys]
+    orientation_indices = map(_ORIENTATION_INDICES.__getitem__, tokens[2::3])
+
+    all_moves = moves_text.decode('ascii').split('\n')
+
+    new_mower = Mower.__new__
+    for x, y, orientation_index, moves in zip(xs, ys, orientation_indices, all_moves):
+        # Lines are valid: skip validation of Mower.__init__
+        mower = new_mower(Mower)
+        mower._max_x, mower._max_y = max_x, max_y
+        mower.x, mower.y, mower.orientation_index = x, y, orientation_index
+        yield mower, moves
+
+
+def _iter_line_blocks(stream: io.BufferedIOBase, block_size: int) -> Iterator[List[bytes]]:
+    """
+    Read stream by blocks of `block_size` bytes, and yield lists of the stripped lines ending in
+    each of them (the last one also yielding the unterminated last line, if any).
+    """
+    # Pieces of the current line, which may span several blocks
+    pieces = []
+
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+
+        if block.find(b'\n') < 0:
+            pieces.append(block)
+            continue
+
+        lines = block.split(b'\n')
+        pieces.append(lines[0])
+        lines[0] = b''.join(pieces)
+        pieces = [lines.pop()]
+
+        yield list(map(bytes.strip, lines))
+
+    last_line = b''.join(pieces)
+    if last_line:
+        yield [last_line.strip()]
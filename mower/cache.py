@@ -0,0 +1,122 @@
+"""
+Persistent cache of mowers final states, in a single local SQLite file.
+
+Entries are keyed by a hash of the grid size, the mower initial state and its moves, so that
+simulations submitted again are skipped entirely. The cache is bounded in number of entries, least
+recently used ones being evicted first.
+"""
+
+import hashlib
+import sqlite3
+
+from mower.structs import ORIENTATIONS, Mower
+
+# Default maximum number of cached entries
+CACHE_MAX_ENTRIES = 1000000
+
+# Number of stored entries between two commits to disk
+_COMMIT_EVERY = 10000
+
+
+class ResultCache:
+    """
+    A size-bounded, least-recently-used, on-disk cache of mowers final states.
+
+    Args:
+        path: path of the SQLite cache file, created if needed.
+        max_entries: maximum number of cached entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = CACHE_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError(f'Invalid cache size: {max_entries}, must be an integer >= 1')
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '
+                                 'state TEXT NOT NULL, used INTEGER NOT NULL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+
+        self._n_entries, last_used = self._connection.execute(
+            'SELECT COUNT(*), MAX(used) FROM results').fetchone()
+        self._used = last_used or 0
+        self._n_uncommitted = 0
+
+    @staticmethod
+    def key(mower: Mower, moves: str) -> str:
+        """
+        Hash grid size, initial state of mower and its moves into a cache key.
+        """
+        max_x, max_y = mower.grid_size
+        digest = hashlib.sha256(f'{max_x} {max_y}\n{mower}\n'.encode('ascii'))
+        digest.update(moves.encode('ascii'))
+        return digest.hexdigest()
+
+    def restore(self, key: str, mower: Mower) -> bool:
+        """
+        Restore mower to its cached final state, if any.
+
+        Returns:
+            whether the cache was hit.
+        """
+        row = self._connection.execute('SELECT state FROM results WHERE key = ?',
+                                       (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+
+        x, y, orientation = row[0].split(' ')
+        mower.x, mower.y = int(x), int(y)
+        mower.orientation_index = ORIENTATIONS.index(orientation)
+
+        self._used += 1
+        self._connection.execute('UPDATE results SET used = ? WHERE key = ?', (self._used, key))
+        self._n_uncommitted += 1
+
+        return True
+
+    def store(self, key: str, mower: Mower):
+        """
+        Cache final state of mower, evicting the least recently used entries if needed.
+        """
+        self._used += 1
+        cursor = self._connection.execute('INSERT OR IGNORE INTO results VALUES (?, ?, ?)',
+                                          (key, str(mower), self._used))
+        self._n_entries += cursor.rowcount
+        self._n_uncommitted += 1
+
+        if self._n_entries > self.max_entries:
+            self._evict(self._n_entries - self.max_entries)
+
+        if self._n_uncommitted >= _COMMIT_EVERY:
+            self._commit()
+
+    def close(self):
+        """
+        Commit pending changes and close the cache file.
+        """
+        self._commit()
+        self._connection.close()
+
+    def _evict(self, n_entries: int):
+        """
+        Evict the `n_entries` least recently used entries.
+        """
+        self._connection.execute('DELETE FROM results WHERE key IN '
+                                 '(SELECT key FROM results ORDER BY used LIMIT ?)', (n_entries,))
+        self._n_entries -= n_entries
+
+    def _commit(self):
+        self._connection.commit()
+        self._n_uncommitted = 0
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,156 @@
+"""
+Checkpoints of mowers states, for append-only moves logs.
+
+A checkpoint is a JSON sidecar file of an instructions file, holding for each mower its initial
+state, the number of moves applied so far, a hash of these moves and the state they led to. When
+moves are later appended to moves lines, mowers resume from their checkpointed state, and only new
+moves are applied. A mower checkpoint is invalidated, and the mower moved from scratch, as soon as
+its initial state or the prefix of its moves changed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+from mower.structs import Mower
+
+# Version of the checkpoint file format
+VERSION = 1
+
+
+class Checkpoint:
+    """
+    Checkpointed states of the mowers of an instructions file.
+
+    Args:
+        path: path of the JSON checkpoint file, read if it exists, and written on :meth:`save`.
+        grid_size: grid size; a checkpoint of another grid size is invalidated.
+
+    Attributes:
+        resumed: number of mowers resumed from their checkpoint.
+        invalidated: number of mowers whose checkpoint was invalidated.
+    """
+
+    def __init__(self, path: str, grid_size: Tuple[int, int]):
+        self.path = path
+        self.grid_size = grid_size
+        self.resumed = 0
+        self.invalidated = 0
+
+        self._entries = self._load()
+        self._new_entries: List[Dict[str, Any]] = []
+
+    def resume(self, i: int, mower: Mower, moves: str) -> int:
+        """
+        Restore i-th mower (0-based) to its checkpointed state, if its checkpoint is still valid for
+        its initial state and moves.
+
+        Returns:
+            number of moves already applied to mower, to be skipped (0 if not resumed).
+        """
+        if i >= len(self._entries):
+            return 0
+
+        entry = self._entries[i]
+        if not _is_valid_entry(entry, self.grid_size) or entry['initial'] != str(mower) or \
+                entry['offset'] > len(moves) or entry['hash'] != _hash(moves[:entry['offset']]):
+            self.invalidated += 1
+            return 0
+
+        mower.x, mower.y, mower.orientation_index = entry['state']
+        self.resumed += 1
+
+        return entry['offset']
+
+    def update(self, initial: str, mower: Mower, moves: str):
+        """
+        Checkpoint state of the next mower, after all of its moves.
+
+        Args:
+            initial: initial state of mower, as a string.
+            mower: mower, after all of its moves.
+            moves: moves applied to mower since its initial state.
+        """
+        self._new_entries.append({
+            'initial': initial,
+            'offset': len(moves),
+            'hash': _hash(moves),
+            'state': [mower.x, mower.y, mower.orientation_index]
+        })
+
+    def save(self):
+        """
+        Atomically replace checkpoint file with updated mowers states.
+        """
+        content = {
+            'version': VERSION,
+            'grid_size': list(self.grid_size),
+            'mowers': self._new_entries
+        }
+
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(content, f)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """
+        Read checkpointed mowers states, if any and valid for grid size.
+        """
+        try:
+            with open(self.path) as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupted checkpoint
+            return []
+
+        if not isinstance(content, dict) or content.get('version') != VERSION or \
+                content.get('grid_size') != list(self.grid_size) or \
+                not isinstance(content.get('mowers'), list):
+            return []
+
+        return content['mowers']
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        # Keep previous checkpoint on failure
+        if exc_type is None:
+            self.save()
+
+
+def checkpoint_path(path: str) -> str:
+    """
+    Path of the checkpoint sidecar file of an instructions file.
+    """
+    return f'{path}.checkpoint'
+
+
+def _is_valid_entry(entry: Any, grid_size: Tuple[int, int]) -> bool:
+    """
+    Whether a mower checkpoint, as read from a checkpoint file, is well-formed, with a state inside
+    the grid.
+    """
+    if not isinstance(entry, dict):
+        return False
+
+    initial, offset, hash_, state = (entry.get(key) for key in ('initial', 'offset', 'hash',
+                                                                 'state'))
+    if not isinstance(initial, str) or not _is_int(offset) or offset < 0 or \
+            not isinstance(hash_, str) or not isinstance(state, list) or len(state) != 3 or \
+            not all(map(_is_int, state)):
+        return False
+
+    x, y, orientation_index = state
+    return 0 <= x <= grid_size[0] and 0 <= y <= grid_size[1] and 0 <= orientation_index < 4
+
+
+def _is_int(value: Any) -> bool:
+    # JSON booleans are read as ints
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _hash(moves: str) -> str:
+    return hashlib.sha256(moves.encode('ascii')).hexdigest()
@@ -1,60 +1,716 @@
+import asyncio
 import logging
-from argparse import ArgumentParser
+import os
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from contextlib import ExitStack
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from mower.parser import parse_grid_size, parse_moves, parse_mower
+from mower.batch import simulate_batch
+from mower.bulkparser import parse_instructions
+from mower.cache import CACHE_MAX_ENTRIES, ResultCache
+from mower.checkpoint import Checkpoint, checkpoint_path
+from mower.compressed import execute_program, program_length
+from mower.coverage import MAX_MAP_CELLS, check_map_size, make_coverage
+from mower.engines import ENGINES, Engine, run_length_engine
+from mower.files import expand_paths, is_multi_file, output_path, simulate_files
+from mower.fleet import MowerFleet
+from mower.mapped import map_instructions
+from mower.occupancy import OccupancyIndex
+from mower.output import FORMATS, ResultWriter
+from mower.packed import convert as convert_instructions
+from mower.packed import is_packed_file, packed_engine, read_packed
+from mower.parallel import simulate_parallel
+from mower.parser import (Program, iter_mower_lines, iter_mowers, iter_moves_chunks,
+                          parse_grid_size, parse_mower)
+from mower.rangeparser import parse_instructions_parallel
+from mower.server import MAX_CONCURRENT_REQUESTS, MAX_REQUEST_SIZE, MowerServer
+from mower.stats import NoStats, Stats
+from mower.structs import Mower
+from mower.trace import TraceWriter, check_grid_size
+from mower.trajectory import SNAPSHOT_INTERVAL, TrajectoryIndex, is_up_to_date
+from mower.watch import POLL_INTERVAL, WatchedFile
 
 LOGGER = logging.getLogger(__name__)
 
+# Parsed moves: a string, or a program for compressed moves
+Moves = Union[str, Program]
 
-def main():
 
+def main(argv: Optional[List[str]] = None):
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Dispatch subcommands
+
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
 
     # Parse command line
 
-    parser = ArgumentParser(description='Move mowers on a lawn')
-    parser.add_argument('path', help='instructions file for moving mowers on the lawn')
+    parser = ArgumentParser(description='Move mowers on a lawn',
+                            epilog=f'subcommands: {", ".join(COMMANDS)} '
+                                   f'(run "mower <subcommand> --help" for details)')
+    parser.add_argument('paths', nargs='+', metavar='path',
+                        help='instructions file for moving mowers on the lawn; several files, '
+                             'directories or glob patterns move mowers of many files at once')
     parser.add_argument('--verbose', '-v', action='store_true', help='debug_mode')
-    args = parser.parse_args()
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='rle',
+                        help='moves execution engine (default: rle); debug mode always executes '
+                             'moves one at a time')
+    parser.add_argument('--stream', action='store_true',
+                        help='simulate and print each mower as soon as it is parsed, reading '
+                             'moves lines in chunks, in constant memory')
+    parser.add_argument('--batch', action='store_true',
+                        help='move all mowers at once with the vectorized batch engine (requires '
+                             'numpy)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of processes moving mowers in parallel, or parsing the '
+                             'instructions file with --parser ranges (default: 1)')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='cache final states of mowers in a local file, and skip moving mowers '
+                             'found in it (default: $MOWER_CACHE, if set, in modes supporting it)')
+    parser.add_argument('--no-cache', action='store_true', help='disable cache')
+    parser.add_argument('--cache-size', type=int, default=CACHE_MAX_ENTRIES,
+                        help=f'maximum number of cached mowers, least recently used ones being '
+                             f'evicted first (default: {CACHE_MAX_ENTRIES})')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='write trajectories of mowers (mower id, step, x, y, orientation) to '
+                             'a binary trace file')
+    parser.add_argument('--parser', choices=['text', 'bulk', 'ranges'], default='text',
+                        help='input file parser (default: text); bulk parses whole files at the '
+                             'bytes level, much faster; ranges parses byte ranges of the file on '
+                             '--jobs processes')
+    parser.add_argument('--mmap', action='store_true',
+                        help='memory-map input file and move mowers straight from it, without '
+                             'copy (rle engine only)')
+    parser.add_argument('--compressed', action='store_true',
+                        help='read moves lines in compressed syntax, where a parenthesized block '
+                             'of moves followed by *N is repeated N times, e.g. (FFRFFL)*1000000')
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='checkpoint mowers states to a <path>.checkpoint sidecar file, and '
+                             'resume from it, applying only moves appended since the last run')
+    parser.add_argument('--collisions', action='store_true',
+                        help='move mowers one after another, in input order, a mower never driving '
+                             'into a cell where an earlier mower is parked (rle engine only)')
+    parser.add_argument('--coverage', action='store_true',
+                        help='print the number of cells mowed by mowers to stderr (rle engine '
+                             'only)')
+    parser.add_argument('--coverage-map', metavar='FILE',
+                        help='write cells mowed by mowers to a binary PBM image, for grids of '
+                             f'up to {MAX_MAP_CELLS:,} cells (implies --coverage)')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep watching instructions file, and on every change, move again '
+                             'only mowers whose instructions changed, printing "<mower id>: '
+                             '<result>" lines')
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, metavar='SECONDS',
+                        help=f'with --watch, number of seconds between two checks of instructions '
+                             f'file (default: {POLL_INTERVAL})')
+    parser.add_argument('--format', choices=list(FORMATS), default='text',
+                        help='output format (default: text); jsonl, csv and binary results hold '
+                             'mower ids')
+    parser.add_argument('--output', metavar='FILE',
+                        help='write results to a file rather than to stdout')
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help='with many instructions files, write results of each file to '
+                             'DIR/<file name>.out rather than to a combined output tagged with '
+                             'file names')
+    parser.add_argument('--stats', action='store_true',
+                        help='print phase timings and counters to stderr')
+    parser.add_argument('--stats-json', metavar='FILE',
+                        help='dump phase timings and counters to a JSON file')
+    args = parser.parse_args(argv)
+
+    args.coverage = args.coverage or bool(args.coverage_map)
+    if args.no_cache:
+        args.cache = None
+
+    # With --parser ranges, --jobs processes parse the instructions file, and mowers move in the
+    # main process
+    parallel_moves = args.jobs > 1 and args.parser != 'ranges'
+
+    if args.batch and args.stream:
+        parser.error('--batch and --stream are mutually exclusive')
+    if args.jobs < 1:
+        parser.error('--jobs must be >= 1')
+    if parallel_moves and (args.batch or args.stream):
+        parser.error('--jobs is incompatible with --batch and --stream')
+    if args.cache and (args.batch or args.stream or parallel_moves):
+        parser.error('--cache is incompatible with --batch, --stream and --jobs')
+    if args.trace and (args.batch or parallel_moves or args.cache):
+        parser.error('--trace is incompatible with --batch, --jobs and --cache')
+    if args.parser == 'bulk' and (args.stream or parallel_moves):
+        parser.error('--parser bulk is incompatible with --stream and --jobs')
+    if args.parser == 'ranges' and args.stream:
+        parser.error('--parser ranges is incompatible with --stream')
+    if args.mmap and (args.engine != 'rle' or args.stream or args.batch or parallel_moves or
+                      args.cache or args.trace or args.parser != 'text'):
+        parser.error('--mmap only supports the rle engine, and is incompatible with --stream, '
+                     '--batch, --jobs, --cache, --trace and --parser')
+    if args.compressed and (args.stream or args.batch or parallel_moves or args.cache or
+                            args.trace or args.mmap or args.parser != 'text'):
+        parser.error('--compressed is incompatible with --stream, --batch, --jobs, --cache, '
+                     '--trace, --mmap and --parser')
+    if args.checkpoint and (args.stream or args.batch or parallel_moves or args.cache or
+                            args.trace or args.mmap or args.compressed):
+        parser.error('--checkpoint is incompatible with --stream, --batch, --jobs, --cache, '
+                     '--trace, --mmap and --compressed')
+    if args.collisions and (args.engine != 'rle' or args.stream or args.batch or parallel_moves or
+                            args.cache or args.trace or args.mmap or args.compressed or
+                            args.checkpoint):
+        parser.error('--collisions only supports the rle engine, and is incompatible with '
+                     '--stream, --batch, --jobs, --cache, --trace, --mmap, --compressed and '
+                     '--checkpoint')
+    if args.coverage and (args.engine != 'rle' or args.stream or args.batch or parallel_moves or
+                          args.cache or args.trace or args.mmap or args.compressed or
+                          args.checkpoint or args.collisions):
+        parser.error('--coverage only supports the rle engine, and is incompatible with --stream, '
+                     '--batch, --jobs, --cache, --trace, --mmap, --compressed, --checkpoint and '
+                     '--collisions')
+    if args.watch and (args.stream or args.batch or parallel_moves or args.cache or args.trace or
+                       args.mmap or args.parser != 'text' or args.compressed or args.checkpoint or
+                       args.collisions or args.coverage or args.stats or args.stats_json):
+        parser.error('--watch is incompatible with --stream, --batch, --jobs, --cache, --trace, '
+                     '--mmap, --parser, --compressed, --checkpoint, --collisions, --coverage, '
+                     '--stats and --stats-json')
+    if args.poll_interval <= 0:
+        parser.error('--poll-interval must be > 0')
+    if args.cache_size < 1:
+        parser.error('--cache-size must be >= 1')
+
+    many_files = is_multi_file(args.paths)
+    if many_files and (args.stream or args.batch or args.cache or args.trace or args.mmap or
+                       args.parser != 'text' or args.compressed or args.checkpoint or
+                       args.collisions or args.coverage):
+        parser.error('many instructions files are incompatible with --stream, --batch, --cache, '
+                     '--trace, --mmap, --parser, --compressed, --checkpoint, --collisions and '
+                     '--coverage')
+    packed = not many_files and is_packed_file(args.paths[0])
+    if (many_files or packed) and args.watch:
+        parser.error('--watch requires a single text instructions file')
+    if packed and (args.stream or args.batch or parallel_moves or args.cache or args.trace or
+                   args.mmap or args.parser != 'text' or args.compressed or args.checkpoint or
+                   args.collisions or args.coverage):
+        parser.error('packed instructions files are incompatible with --stream, --batch, --jobs, '
+                     '--cache, --trace, --mmap, --parser, --compressed, --checkpoint, '
+                     '--collisions and --coverage')
+    if (many_files or args.watch) and (args.format != 'text' or args.output):
+        parser.error('--format and --output are incompatible with many instructions files and '
+                     '--watch')
+    if args.output_dir and not many_files:
+        parser.error('--output-dir requires many instructions files')
+
+    # Only an explicit --cache is rejected by incompatible modes: the default one is left out
+    if args.cache is None and not args.no_cache and not (
+            args.stream or args.batch or parallel_moves or args.trace or args.mmap or
+            args.compressed or args.checkpoint or args.collisions or args.coverage or
+            args.watch or many_files or packed):
+        args.cache = os.environ.get('MOWER_CACHE')
+
+    if many_files:
+        paths = expand_paths(args.paths)
+        if args.output_dir:
+            output_paths = [output_path(args.output_dir, path) for path in paths]
+            if len(set(output_paths)) < len(output_paths):
+                parser.error('--output-dir requires instructions files with distinct names')
 
     # Setup logging
 
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
 
-    # Parse input file
+    engine = ENGINES[args.engine]
+
+    stats = Stats() if args.stats or args.stats_json else NoStats()
+
+    failures = 0
+    if args.watch:
+        _watch(args.paths[0], engine, args.poll_interval)
+    elif many_files:
+        failures = _run_files(args, paths, stats)
+    else:
+        if args.trace:
+            # Don't leave a truncated trace behind on grids too large for it
+            with open(args.paths[0]) as f:
+                check_grid_size(parse_grid_size(f))
+
+        with ExitStack() as stack:
+            tracer = stack.enter_context(TraceWriter(args.trace)) if args.trace else None
+            stream = stack.enter_context(open(args.output, 'wb')) if args.output else \
+                sys.stdout.buffer
+            writer = stack.enter_context(ResultWriter(stream, args.format))
+
+            _run(args, args.paths[0], engine, tracer, writer, stats)
+
+            with stats.phase('output'):
+                writer.flush()
+
+    if args.stats:
+        print(stats, file=sys.stderr)
+    if args.stats_json:
+        stats.dump(args.stats_json)
+
+    if failures:
+        sys.exit(1)
+
+
+def _run(args: Namespace, path: str, engine: Engine, tracer: Optional[TraceWriter],
+         writer: ResultWriter, stats: Stats):
+    """
+    Parse input file, execute moves and write results, as configured on command line.
+    """
+    if is_packed_file(path):
+
+        # Parse, execute moves and print result one mower at a time, straight from packed moves
+
+        with open(path, 'rb') as f:
+            grid_size, mowers_and_moves = read_packed(f)
+            LOGGER.debug(f' Parsed grid size: {grid_size}')
+            LOGGER.debug('')
+
+            for i, (mower, packed) in enumerate(mowers_and_moves, 1):
+                LOGGER.debug(f' Mower {i}')
+                LOGGER.debug(f'   {mower}')
+
+                with stats.phase('simulate'):
+                    wall_hits = packed_engine(mower, packed)
+                stats.count(1, packed.length, wall_hits)
+
+                LOGGER.debug(f'   {mower}')
+                LOGGER.debug('')
+
+                with stats.phase('output'):
+                    writer.write(mower)
+
+        return
+
+    if args.mmap:
+
+        # Parse, execute moves and print result one mower at a time, straight from mapped file
+
+        with map_instructions(path) as (grid_size, mowers_and_moves):
+            LOGGER.debug(f' Parsed grid size: {grid_size}')
+            LOGGER.debug('')
+
+            for i, (mower, moves) in enumerate(mowers_and_moves, 1):
+                LOGGER.debug(f' Mower {i}')
+                LOGGER.debug(f'   {mower}')
+
+                with stats.phase('simulate'):
+                    wall_hits = run_length_engine(mower, moves)
+                stats.count(1, len(moves), wall_hits)
+
+                LOGGER.debug(f'   {mower}')
+                LOGGER.debug('')
+
+                with stats.phase('output'):
+                    writer.write(mower)
+
+        return
+
+    if args.parser == 'ranges':
+        with stats.phase('parse'):
+            fleet = parse_instructions_parallel(path, args.jobs)
+
+        _simulate_and_print(args, fleet.grid_size, fleet, fleet.moves, engine, tracer, writer,
+                            stats)
+        return
+
+    if args.parser == 'bulk':
+        with open(path, 'rb') as f:
+            with stats.phase('parse'):
+                grid_size, mowers_and_moves = parse_instructions(f)
+                all_mowers, all_moves = _collect(args, grid_size, mowers_and_moves)
+
+        _simulate_and_print(args, grid_size, all_mowers, all_moves, engine, tracer, writer,
+                            stats)
+        return
+
+    with open(path) as f:
+        with stats.phase('parse'):
+            grid_size = parse_grid_size(f)
+
+        if args.jobs > 1:
+
+            # Parse and execute moves of batches of mowers in parallel, print results in order
+
+            LOGGER.debug(f' Parsed grid size: {grid_size}')
+
+            all_mower_lines = _count_mower_lines(iter_mower_lines(f), stats)
+
+            with stats.phase('simulate'):
+                writer.write_all(simulate_parallel(all_mower_lines, grid_size, args.engine,
+                                                   args.jobs))
+
+            return
+
+        if args.stream:
+
+            # Parse, execute moves and print result one mower at a time
+
+            LOGGER.debug(f' Parsed grid size: {grid_size}')
+            LOGGER.debug('')
+
+            i = 1
+            with stats.phase('parse'):
+                mower = parse_mower(f, grid_size)
+
+            while mower:
+                with stats.phase('simulate'):
+                    n_moves, wall_hits = _execute_moves(i, mower, iter_moves_chunks(f), engine,
+                                                        tracer, args.verbose)
+                stats.count(1, n_moves, wall_hits)
+
+                with stats.phase('output'):
+                    writer.write(mower)
+
+                i += 1
+                with stats.phase('parse'):
+                    mower = parse_mower(f, grid_size)
+
+            return
+
+        # Parse input file
 
-    with open(args.path) as f:
-        grid_size = parse_grid_size(f)
+        with stats.phase('parse'):
+            all_mowers, all_moves = _collect(args, grid_size,
+                                             iter_mowers(f, grid_size, args.compressed))
 
-        all_mowers, all_moves = [], []
+    _simulate_and_print(args, grid_size, all_mowers, all_moves, engine, tracer, writer, stats)
 
-        mower = parse_mower(f, grid_size)
-        while mower:
-            moves = parse_moves(f)
-            all_mowers.append(mower)
-            all_moves.append(moves)
-            mower = parse_mower(f, grid_size)
 
+def _run_files(args: Namespace, paths: List[str], stats: Stats) -> int:
+    """
+    Parse many input files, execute moves and write results of each file, either to its own output
+    file or to a combined output tagged with file names. Failing files are reported and skipped.
+
+    Returns:
+        number of failing files.
+    """
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+
+    file_results = simulate_files(paths, args.engine, args.jobs)
+    while True:
+        with stats.phase('simulate'):
+            file_result = next(file_results, None)
+        if file_result is None:
+            break
+
+        if file_result.error is not None:
+            LOGGER.error(f' {file_result.path}: {file_result.error}')
+            failures += 1
+            continue
+
+        stats.count(len(file_result.results), file_result.moves, file_result.wall_hits)
+
+        with stats.phase('output'):
+            if args.output_dir:
+                with open(output_path(args.output_dir, file_result.path), 'w') as f:
+                    f.writelines(f'{result}\n' for result in file_result.results)
+            else:
+                for result in file_result.results:
+                    print(f'{file_result.path}: {result}')
+
+    return failures
+
+
+def _watch(path: str, engine: Engine, poll_interval: float):
+    """
+    Watch input file until interrupted, and on every change, execute moves of changed mowers and
+    print their results, tagged with mower ids. Invalid files are reported and skipped.
+    """
+    watched = WatchedFile(path, engine)
+
+    try:
+        while True:
+            if watched.changed():
+                try:
+                    results = watched.update()
+                except (OSError, ValueError) as e:
+                    LOGGER.error(f' {path}: {e}')
+                else:
+                    LOGGER.info(f' {path}: {len(results)} of {watched.n_mowers} mowers moved')
+                    for i, mower in results:
+                        print(f'{i}: {mower}')
+                    sys.stdout.flush()
+
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _collect(args: Namespace, grid_size: Tuple[int, int],
+             mowers_and_moves: Iterable[Tuple[Mower, Moves]]) \
+        -> Tuple[Sequence[Mower], Sequence[Moves]]:
+    """
+    Collect parsed (mower, moves) pairs into a compact fleet of mowers and its moves, or into a
+    list of mowers and a list of programs for compressed moves.
+    """
+    if not args.compressed:
+        fleet = MowerFleet.from_mowers(grid_size, mowers_and_moves)
+        return fleet, fleet.moves
+
+    all_mowers, all_moves = [], []
+
+    for mower, moves in mowers_and_moves:
+        all_mowers.append(mower)
+        all_moves.append(moves)
+
+    return all_mowers, all_moves
+
+
+def _simulate_and_print(args: Namespace, grid_size: Tuple[int, int],
+                        all_mowers: Sequence[Mower], all_moves: Sequence[Moves], engine: Engine,
+                        tracer: Optional[TraceWriter], writer: ResultWriter, stats: Stats):
+    """
+    Execute moves of all parsed mowers and write results, as configured on command line.
+    """
     LOGGER.debug(f' Parsed grid size: {grid_size}')
-    LOGGER.debug(f' Parsed mowers: {list(map(str, all_mowers))}')
-    LOGGER.debug(f' Parsed moves: {all_moves}')
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        # Don't copy all mowers and moves out of a compact fleet for nothing
+        LOGGER.debug(f' Parsed mowers: {list(map(str, all_mowers))}')
+        LOGGER.debug(f' Parsed moves: {list(all_moves)}')
     LOGGER.debug('')
 
     # Execute moves
 
-    for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
-        LOGGER.debug(f' Mower {i}')
-        LOGGER.debug(f'   {mower}')
+    with stats.phase('simulate'):
+        if args.batch:
+            all_mowers = simulate_batch(all_mowers, all_moves)
+            stats.count(len(all_mowers), sum(map(len, all_moves)))
+        elif args.cache:
+            with ResultCache(args.cache, args.cache_size) as cache:
+                for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
+                    key = cache.key(mower, moves)
+                    if cache.restore(key, mower):
+                        LOGGER.debug(f' Mower {i} found in cache: {mower}')
+                        LOGGER.debug('')
+                        stats.count(1, len(moves), 0)
+                    else:
+                        stats.count(1, *_execute_moves(i, mower, [moves], engine, None,
+                                                       args.verbose))
+                        cache.store(key, mower)
+
+                LOGGER.debug(f' Cache: {cache.hits} hits, {cache.misses} misses')
+                LOGGER.debug('')
+        elif args.checkpoint:
+            with Checkpoint(checkpoint_path(args.paths[0]), grid_size) as checkpoint:
+                for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
+                    initial = str(mower)
+                    offset = checkpoint.resume(i - 1, mower, moves)
+                    if offset:
+                        LOGGER.debug(f' Mower {i} resumed from checkpoint after {offset} moves')
+                    stats.count(1, *_execute_moves(i, mower, [moves[offset:]], engine, None,
+                                                   args.verbose))
+                    checkpoint.update(initial, mower, moves)
+
+                LOGGER.debug(f' Checkpoint: {checkpoint.resumed} mowers resumed, '
+                             f'{checkpoint.invalidated} invalidated')
+                LOGGER.debug('')
+        elif args.collisions:
+            occupancy = OccupancyIndex(grid_size)
+            for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
+                LOGGER.debug(f' Mower {i}')
+                LOGGER.debug(f'   {mower}')
+                stats.count(1, len(moves), occupancy.move(mower, moves))
+                occupancy.park(mower)
+                LOGGER.debug(f'   {mower}')
+                LOGGER.debug('')
+
+            LOGGER.debug(f' Collisions: {occupancy.collisions} moves blocked by parked mowers')
+            LOGGER.debug('')
+        elif args.coverage:
+            if args.coverage_map:
+                # Don't move mowers for nothing
+                check_map_size(grid_size)
+
+            coverage = make_coverage(grid_size)
+            for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
+                LOGGER.debug(f' Mower {i}')
+                LOGGER.debug(f'   {mower}')
+                stats.count(1, len(moves), coverage.move(mower, moves))
+                LOGGER.debug(f'   {mower}')
+                LOGGER.debug('')
+
+            print(coverage, file=sys.stderr)
+            if args.coverage_map:
+                with open(args.coverage_map, 'wb') as f:
+                    coverage.write_pbm(f)
+        elif args.compressed:
+            for i, (mower, program) in enumerate(zip(all_mowers, all_moves), 1):
+                LOGGER.debug(f' Mower {i}')
+                LOGGER.debug(f'   {mower}')
+                wall_hits = execute_program(mower, program, engine)
+                stats.count(1, program_length(program), wall_hits)
+                LOGGER.debug(f'   {mower}')
+                LOGGER.debug('')
+        else:
+            for i, (mower, moves) in enumerate(zip(all_mowers, all_moves), 1):
+                stats.count(1, *_execute_moves(i, mower, [moves], engine, tracer, args.verbose))
+
+    # Write result
+
+    with stats.phase('output'):
+        writer.write_all(all_mowers)
+
+
+def _execute_moves(i: int, mower: Mower, moves_chunks: Iterable[str], engine: Engine,
+                   tracer: Optional[TraceWriter], verbose: bool) -> Tuple[int, Optional[int]]:
+    """
+    Execute moves of i-th mower, chunk after chunk, with a given engine, or one at a time when
+    tracing trajectories or in debug mode.
+
+    Returns:
+        number of moves executed and number of wall hits (None when tracing trajectories).
+    """
+    LOGGER.debug(f' Mower {i}')
+    LOGGER.debug(f'   {mower}')
+
+    n_moves, wall_hits = 0, 0
+
+    step = 0
+    if tracer:
+        tracer.record(i, step, mower)
+
+    for moves in moves_chunks:
+        n_moves += len(moves)
+
+        if tracer:
+            step = tracer.trace(i, mower, moves, step)
+            wall_hits = None
+        elif verbose:
+            for move in moves:
+                wall_hits += mower.step(move)
+                LOGGER.debug(f' {move} {mower}')
+        else:
+            wall_hits += engine(mower, moves)
+
+    LOGGER.debug('')
+
+    return n_moves, wall_hits
+
+
+def _count_mower_lines(all_mower_lines: Iterable[Tuple[str, str]],
+                       stats: Stats) -> Iterator[Tuple[str, str]]:
+    """
+    Count mowers and moves of raw mower lines passing through, wall hits being unknown.
+    """
+    for mower_line, moves_line in all_mower_lines:
+        stats.count(1, len(moves_line))
+        yield mower_line, moves_line
+
+
+def serve(argv: List[str]):
+    """
+    `mower serve`: serve instructions files submitted over a local socket.
+    """
+    parser = ArgumentParser(prog='mower serve',
+                            description='Serve instructions files submitted over a local TCP or '
+                                        'Unix socket (see mower.server for the line protocol)')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP host (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    parser.add_argument('--unix', metavar='PATH', help='serve on a Unix socket instead of TCP')
+    parser.add_argument('--jobs', '-j', type=int,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='rle',
+                        help='moves execution engine (default: rle)')
+    parser.add_argument('--max-request-size', type=int, default=MAX_REQUEST_SIZE,
+                        help=f'maximum size of a request, in bytes (default: {MAX_REQUEST_SIZE})')
+    parser.add_argument('--max-concurrent-requests', type=int, default=MAX_CONCURRENT_REQUESTS,
+                        help=f'maximum number of requests simulated at once '
+                             f'(default: {MAX_CONCURRENT_REQUESTS})')
+    parser.add_argument('--verbose', '-v', action='store_true', help='debug_mode')
+    args = parser.parse_args(argv)
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be >= 1')
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    server = MowerServer(jobs=args.jobs, engine=args.engine,
+                         max_request_size=args.max_request_size,
+                         max_concurrent_requests=args.max_concurrent_requests)
+
+    loop = asyncio.new_event_loop()
+    socket_server = None
+    try:
+        socket_server = loop.run_until_complete(server.start(args.host, args.port, args.unix))
+        LOGGER.info(f' Serving on {socket_server.sockets[0].getsockname()}')
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if socket_server is not None:
+            socket_server.close()
+            loop.run_until_complete(socket_server.wait_closed())
+        server.close()
+        loop.close()
+
+
+def convert(argv: List[str]):
+    """
+    `mower convert`: convert instructions files between text and packed binary formats.
+    """
+    parser = ArgumentParser(prog='mower convert',
+                            description='Convert a text instructions file into a packed binary one '
+                                        '(moves packed 4 per byte), or a packed one back into text')
+    parser.add_argument('input', help='text or packed instructions file (detected automatically)')
+    parser.add_argument('output', help='converted instructions file, overwritten if it exists')
+    args = parser.parse_args(argv)
+
+    convert_instructions(args.input, args.output)
+
+
+def where(argv: List[str]):
+    """
+    `mower where`: print the state of a mower after a given number of moves.
+    """
+    parser = ArgumentParser(prog='mower where',
+                            description='Print the state of a mower after a given number of '
+                                        'moves, through a trajectory index')
+    parser.add_argument('path', help='text or packed instructions file')
+    parser.add_argument('mower', type=int, help='mower id, from 1 (in input order)')
+    parser.add_argument('step', type=int, help='number of moves applied, from 0 (initial state)')
+    parser.add_argument('--interval', '-k', type=int, default=SNAPSHOT_INTERVAL,
+                        help=f'number of steps between two snapshots of mowers states (default: '
+                             f'{SNAPSHOT_INTERVAL}); larger intervals make smaller indexes, and '
+                             f'slower queries')
+    parser.add_argument('--index', metavar='FILE',
+                        help='save trajectory index to FILE, and reuse it as long as it is newer '
+                             'than instructions file')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='rle',
+                        help='moves execution engine building the index (default: rle)')
+    args = parser.parse_args(argv)
+
+    if args.interval < 1:
+        parser.error('--interval must be >= 1')
+
+    index = None
+    if args.index and is_up_to_date(args.index, args.path):
+        index = TrajectoryIndex.load(args.index)
+        if index.interval != args.interval:
+            index = None
 
-        for move in moves:
-            mower.step(move)
-            LOGGER.debug(f' {move} {mower}')
+    if index is None:
+        index = TrajectoryIndex.build(args.path, args.interval, ENGINES[args.engine])
+        if args.index:
+            index.save(args.index)
 
-        LOGGER.debug('')
+    try:
+        print(index.where(args.mower, args.step))
+    except IndexError as e:
+        parser.error(str(e))
 
-    # Print result
 
-    for mower in all_mowers:
-        print(mower)
+COMMANDS = {
+    'serve': serve,
+    'convert': convert,
+    'where': where
+}
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,225 @@
+"""
+Fast-forward execution of compressed moves programs, as parsed by
+:func:`mower.parser.parse_compressed_moves`.
+
+A repeated block is run one iteration at a time, until either:
+  * the mower state (x, y, orientation) at the start of an iteration repeats: the mower is in a
+    cycle (e.g. it settled against a wall, or turns in place), whose remaining laps are skipped
+    at once;
+  * the next k iterations provably repeat the last one identically (same displacement, same
+    wall hits), e.g. a sweep across the lawn, possibly sliding along a wall: they are applied at
+    once, from the precomputed effect of the block.
+
+Final states and wall hits are exactly those of the fully expanded moves.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from mower.engines import ChunkEffect, Engine, compile_runs, run_length_engine
+from mower.parser import Program, Repeat
+from mower.structs import DELTAS, Mower
+
+# Mower state: x, y and orientation index
+State = Tuple[int, int, int]
+
+
+def execute_program(mower: Mower, program: Program, engine: Engine = run_length_engine) -> int:
+    """
+    Apply a compressed moves program to mower.
+
+    Args:
+        mower: mower to move.
+        program: moves program.
+        engine: engine applying plain moves (concatenated L/R/F chars) of program.
+
+    Returns:
+        number of forward moves blocked by the edge of the grid.
+    """
+    wall_hits = 0
+    for item in program:
+        if isinstance(item, Repeat):
+            wall_hits += _execute_repeat(mower, item, engine)
+        else:
+            wall_hits += engine(mower, item)
+    return wall_hits
+
+
+def program_length(program: Program) -> int:
+    """
+    Number of moves of a compressed moves program, once fully expanded.
+    """
+    return sum(item.count * program_length(item.body) if isinstance(item, Repeat) else len(item)
+               for item in program)
+
+
+def _execute_repeat(mower: Mower, repeat: Repeat, engine: Engine) -> int:
+    """
+    Apply a repeated block to mower, skipping cycles and iterations repeating identically.
+    """
+    body, count = repeat
+    wall_hits = 0
+
+    # States and wall hits at the start of consecutive iterations, since the last skip
+    history: List[Tuple[State, int]] = []
+    seen: Dict[State, int] = {}
+
+    i = 0
+    while i < count:
+        state = (mower.x, mower.y, mower.orientation_index)
+
+        if state in seen:
+            # Cycle: skip whole laps, then replay the remaining iterations from history
+            start = seen[state]
+            start_wall_hits = history[start][1]
+            laps, rest = divmod(count - i, len(history) - start)
+
+            (mower.x, mower.y, mower.orientation_index), end_wall_hits = history[start + rest]
+            return wall_hits + laps * (wall_hits - start_wall_hits) + end_wall_hits - \
+                start_wall_hits
+
+        seen[state] = len(history)
+        history.append((state, wall_hits))
+
+        iteration_wall_hits = execute_program(mower, body, engine)
+        wall_hits += iteration_wall_hits
+        i += 1
+
+        skipped = min(_repeatable_iterations(state, mower, body), count - i)
+        if skipped:
+            # Next iterations repeat the last one identically: apply them at once
+            x, y, _ = state
+            mower.x += skipped * (mower.x - x)
+            mower.y += skipped * (mower.y - y)
+            wall_hits += skipped * iteration_wall_hits
+            i += skipped
+
+            history.clear()
+            seen.clear()
+
+    return wall_hits
+
+
+def _repeatable_iterations(state: State, mower: Mower, body: Program) -> int:
+    """
+    Number of next iterations of a block repeating identically the last one, from `state` to
+    mower state: same displacement and same wall hits.
+
+    Notes:
+        Edges of the grid clamp each axis independently, and orientations do not depend on
+        positions. So, without net rotation, the iterations along an axis repeat identically as
+        long as they either stay inside of the grid, or leave the coordinate unchanged.
+    """
+    x, y, o = state
+    if mower.orientation_index != o:
+        return 0
+
+    _, _, _, min_dx, max_dx, min_dy, max_dy = _effect(body, o)
+    max_x, max_y = mower.grid_size
+
+    return min(_repeatable_iterations_along_axis(x, mower.x, min_dx, max_dx, max_x),
+               _repeatable_iterations_along_axis(y, mower.y, min_dy, max_dy, max_y))
+
+
+def _repeatable_iterations_along_axis(start: int, end: int, min_delta: int, max_delta: int,
+                                      max_coordinate: int) -> float:
+    """
+    Number of next iterations along an axis repeating identically the last one, from `start` to
+    `end`, an iteration reaching [min_delta, max_delta] relatively to its starting point when
+    staying inside of [0, max_coordinate].
+    """
+    delta = end - start
+    if not delta:
+        return float('inf')
+    if start + min_delta < 0 or start + max_delta > max_coordinate:
+        return 0
+    if delta > 0:
+        return max(0, (max_coordinate - max_delta - end) // delta + 1)
+    return max(0, (end + min_delta) // -delta + 1)
+
+
+@lru_cache(maxsize=4096)
+def _effect(program: Program, orientation_index: int) -> ChunkEffect:
+    """
+    Effect of a moves program from (0, 0) and a given initial orientation, assuming no edge of the
+    grid is met.
+    """
+    effect = _identity(orientation_index)
+
+    for item in program:
+        if isinstance(item, Repeat):
+            item_effect = _repeat_effect(item, effect[2])
+        else:
+            item_effect = _moves_effect(item, effect[2])
+        effect = _then(effect, item_effect)
+
+    return effect
+
+
+def _repeat_effect(repeat: Repeat, orientation_index: int) -> ChunkEffect:
+    """
+    Effect of a repeated block, assuming no edge of the grid is met.
+    """
+    body, count = repeat
+
+    # Iterations until orientation is back to its initial value (at most 4)
+    period, period_length = _identity(orientation_index), 0
+    while period_length < count:
+        period = _then(period, _effect(body, period[2]))
+        period_length += 1
+        if period[2] == orientation_index:
+            break
+    else:
+        return period
+
+    # Whole periods are translations
+    laps, rest = divmod(count, period_length)
+    effect = _translate(period, laps)
+    for _ in range(rest):
+        effect = _then(effect, _effect(body, effect[2]))
+
+    return effect
+
+
+def _moves_effect(moves: str, orientation_index: int) -> ChunkEffect:
+    """
+    Effect of moves (concatenated L/R/F chars), assuming no edge of the grid is met.
+    """
+    x = y = min_x = max_x = min_y = max_y = 0
+    o = orientation_index
+
+    for quarter_turns, steps in compile_runs(moves):
+        # Orientations are in clockwise order
+        o = (o - quarter_turns) % 4
+        dx, dy = DELTAS[o]
+        x, y = x + steps * dx, y + steps * dy
+        min_x, max_x = min(min_x, x), max(max_x, x)
+        min_y, max_y = min(min_y, y), max(max_y, y)
+
+    return x, y, o, min_x, max_x, min_y, max_y
+
+
+def _identity(orientation_index: int) -> ChunkEffect:
+    return 0, 0, orientation_index, 0, 0, 0, 0
+
+
+def _then(first: ChunkEffect, second: ChunkEffect) -> ChunkEffect:
+    """
+    Effect of two effects in a row, the second one starting from where the first one ends.
+    """
+    dx, dy, _, min_dx, max_dx, min_dy, max_dy = first
+    dx2, dy2, o, min_dx2, max_dx2, min_dy2, max_dy2 = second
+    return (dx + dx2, dy + dy2, o, min(min_dx, dx + min_dx2), max(max_dx, dx + max_dx2),
+            min(min_dy, dy + min_dy2), max(max_dy, dy + max_dy2))
+
+
+def _translate(effect: ChunkEffect, times: int) -> ChunkEffect:
+    """
+    Effect of an effect without net rotation, `times` times in a row.
+    """
+    dx, dy, o, min_dx, max_dx, min_dy, max_dy = effect
+    if not times:
+        return _identity(o)
+    extra_dx, extra_dy = (times - 1) * dx, (times - 1) * dy
+    return (times * dx, times * dy, o, min_dx + min(0, extra_dx), max_dx + max(0, extra_dx),
+            min_dy + min(0, extra_dy), max_dy + max(0, extra_dy))
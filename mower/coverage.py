@@ -0,0 +1,287 @@
+"""
+Coverage maps of the lawn: cells mowed by mowers, i.e. visited at least once.
+
+Mowers are moved one run (net rotation, then k forward steps) at a time, and the cells of each
+forward run are marked at once, as a range. Two representations are available:
+  * :class:`DenseCoverage`: one byte per cell, in a row-major :class:`bytearray`; a horizontal run
+    is marked by a slice assignment, a vertical one by an extended slice assignment.
+  * :class:`SparseCoverage`: for each row and each column holding mowed cells, a sorted list of
+    disjoint intervals of mowed cells; horizontal runs are merged into intervals of their row,
+    vertical ones into intervals of their column. Memory grows with the number of runs, not with
+    the size of the grid.
+
+:func:`make_coverage` picks the dense representation for grids of up to :data:`MAX_DENSE_CELLS`
+cells, and the sparse one for larger grids.
+
+Coverage maps are exported as binary PBM images (1 bit per cell, mowed cells in black, north up),
+for grids of up to :data:`MAX_MAP_CELLS` cells.
+"""
+
+import io
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from mower.engines import Moves, compile_runs
+from mower.structs import Mower
+
+# Largest number of cells of grids covered by a dense map (64 MiB)
+MAX_DENSE_CELLS = 1 << 26
+
+# Largest number of cells of grids exported as PBM images (8 MiB)
+MAX_MAP_CELLS = 1 << 26
+
+# Starts and ends (excluded) of sorted disjoint intervals of mowed cells of a row or column
+Intervals = Tuple[List[int], List[int]]
+
+
+class Coverage(ABC):
+    """
+    Coverage map of a grid, fed with mowers moves.
+
+    Args:
+        grid_size: grid size.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int]):
+        self.grid_size = grid_size
+        self._width, self._height = grid_size[0] + 1, grid_size[1] + 1
+
+    @property
+    def n_cells(self) -> int:
+        return self._width * self._height
+
+    @property
+    @abstractmethod
+    def n_covered(self) -> int:
+        """
+        Number of mowed cells.
+        """
+
+    @property
+    def ratio(self) -> float:
+        """
+        Mowed fraction of the grid.
+        """
+        return self.n_covered / self.n_cells
+
+    def move(self, mower: Mower, moves: Moves) -> int:
+        """
+        Apply moves to mower one run (net rotation, then k forward steps) at a time, marking the
+        cells it visits, initial one included.
+
+        Returns:
+            number of forward moves blocked by the edge of the grid.
+        """
+        self._mark_row(mower.y, mower.x, mower.x + 1)
+
+        wall_hits = 0
+        for quarter_turns, steps in compile_runs(moves):
+            if quarter_turns:
+                mower.rotate(quarter_turns)
+            if steps:
+                x, y = mower.x, mower.y
+                wall_hits += mower.forward(steps)
+                if mower.x != x:
+                    self._mark_row(y, min(x, mower.x), max(x, mower.x) + 1)
+                elif mower.y != y:
+                    self._mark_column(x, min(y, mower.y), max(y, mower.y) + 1)
+        return wall_hits
+
+    @abstractmethod
+    def is_covered(self, x: int, y: int) -> bool:
+        """
+        Whether cell (x, y) was mowed.
+        """
+
+    def write_pbm(self, stream: io.BufferedIOBase):
+        """
+        Write coverage map as a binary PBM image, north up, mowed cells in black.
+
+        Raises:
+            ValueError: if grid is too large for an image; see :func:`check_map_size`.
+        """
+        check_map_size(self.grid_size)
+
+        stream.write(f'P4\n{self._width} {self._height}\n'.encode('ascii'))
+        for y in reversed(range(self._height)):
+            stream.write(_pack_bits(self._row(y)))
+
+    @abstractmethod
+    def _mark_row(self, y: int, start: int, end: int):
+        """
+        Mark cells [start, end) of row y.
+        """
+
+    @abstractmethod
+    def _mark_column(self, x: int, start: int, end: int):
+        """
+        Mark cells [start, end) of column x.
+        """
+
+    @abstractmethod
+    def _row(self, y: int) -> bytes:
+        """
+        Cells of row y, 1 per mowed cell and 0 per other cell.
+        """
+
+    def __str__(self):
+        return f'mowed: {self.n_covered:,} of {self.n_cells:,} cells ({self.ratio:.1%})'
+
+
+class DenseCoverage(Coverage):
+    """
+    Coverage map holding one byte per cell, row after row.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int]):
+        super().__init__(grid_size)
+        self._cells = bytearray(self.n_cells)
+
+    @property
+    def n_covered(self) -> int:
+        return self._cells.count(1)
+
+    def is_covered(self, x: int, y: int) -> bool:
+        return bool(self._cells[y * self._width + x])
+
+    def _mark_row(self, y: int, start: int, end: int):
+        offset = y * self._width
+        self._cells[offset + start:offset + end] = b'\x01' * (end - start)
+
+    def _mark_column(self, x: int, start: int, end: int):
+        width = self._width
+        self._cells[start * width + x:(end - 1) * width + x + 1:width] = b'\x01' * (end - start)
+
+    def _row(self, y: int) -> bytes:
+        offset = y * self._width
+        return self._cells[offset:offset + self._width]
+
+
+class SparseCoverage(Coverage):
+    """
+    Coverage map holding, for each row and each column with mowed cells, sorted disjoint intervals
+    of mowed cells.
+
+    A cell may be held by intervals of both its row and its column: cells already held by crossing
+    columns (resp. rows) are found among the columns (resp. rows) with intervals, so that marking a
+    run costs about the number of those it crosses, rather than its number of cells.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int]):
+        super().__init__(grid_size)
+        self._n_covered = 0
+
+        # Intervals of each row and each column, and sorted rows and columns with intervals
+        self._rows: Dict[int, Intervals] = {}
+        self._columns: Dict[int, Intervals] = {}
+        self._row_keys: List[int] = []
+        self._column_keys: List[int] = []
+
+    @property
+    def n_covered(self) -> int:
+        return self._n_covered
+
+    def is_covered(self, x: int, y: int) -> bool:
+        return _contains(self._rows.get(y), x) or _contains(self._columns.get(x), y)
+
+    def _mark_row(self, y: int, start: int, end: int):
+        self._n_covered += _merge(self._rows, self._row_keys, y, start, end, self._columns,
+                                  self._column_keys)
+
+    def _mark_column(self, x: int, start: int, end: int):
+        self._n_covered += _merge(self._columns, self._column_keys, x, start, end, self._rows,
+                                  self._row_keys)
+
+    def _row(self, y: int) -> bytes:
+        row = bytearray(self._width)
+        for start, end in zip(*self._rows.get(y, ([], []))):
+            row[start:end] = b'\x01' * (end - start)
+        for x in self._column_keys:
+            if _contains(self._columns[x], y):
+                row[x] = 1
+        return row
+
+
+def make_coverage(grid_size: Tuple[int, int], max_dense_cells: int = MAX_DENSE_CELLS) -> Coverage:
+    """
+    Coverage map of a grid: dense for grids of up to `max_dense_cells` cells, sparse otherwise.
+    """
+    max_x, max_y = grid_size
+    if (max_x + 1) * (max_y + 1) <= max_dense_cells:
+        return DenseCoverage(grid_size)
+    return SparseCoverage(grid_size)
+
+
+def check_map_size(grid_size: Tuple[int, int]):
+    """
+    Raise :exception:`ValueError` if a grid is too large for its coverage map to be exported as an
+    image.
+    """
+    max_x, max_y = grid_size
+    if (max_x + 1) * (max_y + 1) > MAX_MAP_CELLS:
+        raise ValueError(f'Grid size {grid_size} too large for a coverage map: must have at most '
+                         f'{MAX_MAP_CELLS:,} cells')
+
+
+def _merge(lines: Dict[int, Intervals], keys: List[int], line: int, start: int, end: int,
+           crossing_lines: Dict[int, Intervals], crossing_keys: List[int]) -> int:
+    """
+    Merge cells [start, end) of a row (resp. column) into its intervals.
+
+    Args:
+        lines, keys: intervals of rows (resp. columns), and sorted rows (resp. columns) with
+            intervals.
+        crossing_lines, crossing_keys: same for columns (resp. rows).
+
+    Returns:
+        number of cells newly mowed, held neither by intervals of the line nor by crossing ones.
+    """
+    if line not in lines:
+        lines[line] = ([], [])
+        insort(keys, line)
+    starts, ends = intervals = lines[line]
+
+    # Cells [start, end) of crossing lines, not held by intervals of the line
+    n_crossed = 0
+    for k in range(bisect_left(crossing_keys, start), bisect_left(crossing_keys, end)):
+        crossing = crossing_keys[k]
+        if _contains(crossing_lines[crossing], line) and not _contains(intervals, crossing):
+            n_crossed += 1
+
+    # Intervals overlapping or touching [start, end), merged into it
+    i = bisect_left(ends, start)
+    j = bisect_right(starts, end)
+    n_merged = 0
+    if i < j:
+        n_merged = sum(ends[i:j]) - sum(starts[i:j])
+        start, end = min(start, starts[i]), max(end, ends[j - 1])
+
+    starts[i:j] = [start]
+    ends[i:j] = [end]
+    return end - start - n_merged - n_crossed
+
+
+def _contains(intervals: Optional[Intervals], i: int) -> bool:
+    """
+    Whether cell i is held by intervals, if any.
+    """
+    if intervals is None:
+        return False
+    starts, ends = intervals
+    k = bisect_right(starts, i)
+    return k > 0 and i < ends[k - 1]
+
+
+def _pack_bits(row: bytes) -> bytes:
+    """
+    Pack a row of 0/1 bytes, 8 per byte, first one in highest bit, padded with 0 bits.
+    """
+    row = bytes(row) + bytes(-len(row) % 8)
+
+    # k-th bits of all bytes, at once
+    packed = 0
+    for k in range(8):
+        packed |= int.from_bytes(row[k::8], 'big') << 7 - k
+
+    return packed.to_bytes(len(row) // 8, 'big')
@@ -0,0 +1,205 @@
+"""
+Engines applying a whole moves specification (concatenated L/R/F chars) to a mower.
+
+All engines produce exactly the same final mower state, and return the number of forward moves
+blocked by the edge of the grid (wall hits). They only differ in speed:
+  * `step`: apply moves one char at a time through :meth:`Mower.step`.
+  * `rle`: compile moves into runs (net rotation, then k forward steps) and apply each run at
+    once, with a single clamp to the grid. Cost scales with the number of turns, not with the
+    number of chars.
+  * `lookup`: apply moves by chunks of :data:`CHUNK_SIZE` moves, through a table of the
+    precomputed effect of every chunk, indexed by an int code of the chunk (2 bits per move),
+    computed for all chunks at once. Chunks that would come close to the edge of the grid are
+    applied one move at a time. Best on random-looking moves, which run-length encoding can't
+    compress.
+"""
+
+import itertools
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from mower.structs import DELTAS, LEFT, RIGHT, Mower
+
+# Moves specification: a string, or a bytes-like object for the `rle` engine
+Moves = Union[str, bytes, memoryview]
+
+# An engine: apply moves to mower and return the number of wall hits
+Engine = Callable[[Mower, str], int]
+
+# A run: net number of 1/4 counter-clockwise rotations (in [0, 3]), then number of forward steps
+Run = Tuple[int, int]
+
+_RUN_PATTERN = re.compile('([LR]*)(F*)')
+_BYTES_RUN_PATTERN = re.compile(b'([LR]*)(F*)')
+
+# Number of moves applied at once by the lookup engine
+CHUNK_SIZE = 8
+
+# Effect of a chunk of moves from (0, 0): final (dx, dy) displacement, final orientation index,
+# and bounding box (min dx, max dx, min dy, max dy) of intermediate positions
+ChunkEffect = Tuple[int, int, int, int, int, int, int]
+
+# 2-bit code of each move
+_MOVE_CODES = bytes.maketrans(b'LRF', bytes([0, 1, 2]))
+
+
+def compile_runs(moves: Moves) -> Iterator[Run]:
+    """
+    Lazily compile moves into runs of (net rotation, forward steps), for memory to stay bounded
+    however long the moves.
+
+    Args:
+        moves: validated moves specification (concatenated L/R/F chars), either as a string or as
+            a bytes-like object (e.g. a memoryview), read without copy.
+    """
+    if isinstance(moves, str):
+        pattern, left, right = _RUN_PATTERN, 'L', 'R'
+    else:
+        pattern, left, right = _BYTES_RUN_PATTERN, b'L', b'R'
+
+    for match in pattern.finditer(moves):
+        start, end = match.span(2)
+        turns = match.group(1)
+        if turns or end > start:
+            quarter_turns = (turns.count(left) - turns.count(right)) % 4
+            yield quarter_turns, end - start
+
+
+def step_engine(mower: Mower, moves: str) -> int:
+    """
+    Apply moves to mower one char at a time.
+    """
+    wall_hits = 0
+    for move in moves:
+        wall_hits += mower.step(move)
+    return wall_hits
+
+
+def run_length_engine(mower: Mower, moves: Moves) -> int:
+    """
+    Apply moves to mower one run (net rotation, then k forward steps) at a time.
+
+    Notes:
+        Moves may also be given as a bytes-like object, read without copy.
+    """
+    wall_hits = 0
+    for quarter_turns, steps in compile_runs(moves):
+        if quarter_turns:
+            mower.rotate(quarter_turns)
+        if steps:
+            wall_hits += mower.forward(steps)
+    return wall_hits
+
+
+@lru_cache(maxsize=None)
+def build_chunk_table(chunk_size: int) -> List[Dict[str, ChunkEffect]]:
+    """
+    Precompute the effect of every chunk of `chunk_size` moves, for every initial orientation.
+
+    Returns:
+        for each initial orientation index, a mapping from chunk (concatenated L/R/F chars) to its
+        effect, assuming no edge of the grid is met.
+    """
+    table = []
+
+    for orientation_index in range(len(DELTAS)):
+        effects = {}
+
+        for chunk in itertools.product('LRF', repeat=chunk_size):
+            x = y = min_x = max_x = min_y = max_y = 0
+            o = orientation_index
+
+            for move in chunk:
+                if move == 'L':
+                    o = LEFT[o]
+                elif move == 'R':
+                    o = RIGHT[o]
+                else:
+                    dx, dy = DELTAS[o]
+                    x, y = x + dx, y + dy
+                    min_x, max_x = min(min_x, x), max(max_x, x)
+                    min_y, max_y = min(min_y, y), max(max_y, y)
+
+            effects[''.join(chunk)] = (x, y, o, min_x, max_x, min_y, max_y)
+
+        table.append(effects)
+
+    return table
+
+
+def chunk_codes(moves: str) -> memoryview:
+    """
+    Int code of each whole chunk of :data:`CHUNK_SIZE` moves (trailing moves left out), indexing
+    :func:`build_chunk_codes_table`.
+
+    Codes are computed for all chunks at once, without Python-level loop over chunks: 2-bit codes
+    of the k-th move of every chunk are gathered by a strided slice and shifted in place within an
+    int, 4 moves per byte.
+    """
+    n_chunks = len(moves) // CHUNK_SIZE
+    codes = moves[:n_chunks * CHUNK_SIZE].encode('ascii').translate(_MOVE_CODES)
+
+    # Bytes of each chunk code, interleaved: first 4 moves, then last 4 ones
+    chunks = bytearray(2 * n_chunks)
+    for half in range(2):
+        packed = 0
+        for k in range(4):
+            packed |= int.from_bytes(codes[4 * half + k::CHUNK_SIZE], 'big') << 6 - 2 * k
+        chunks[half::2] = packed.to_bytes(n_chunks, 'big')
+
+    return memoryview(chunks).cast('H')
+
+
+@lru_cache(maxsize=None)
+def build_chunk_codes_table() -> List[Optional[ChunkEffect]]:
+    """
+    Effect of every chunk of :data:`CHUNK_SIZE` moves, for every initial orientation, as a flat
+    table indexed by `orientation index << 16 | chunk code` (see :func:`chunk_codes`).
+    """
+    table: List[Optional[ChunkEffect]] = [None] * (len(DELTAS) << 16)
+    for orientation_index, effects in enumerate(build_chunk_table(CHUNK_SIZE)):
+        for chunk, effect in effects.items():
+            table[orientation_index << 16 | chunk_codes(chunk)[0]] = effect
+    return table
+
+
+def lookup_engine(mower: Mower, moves: str) -> int:
+    """
+    Apply moves to mower one chunk of :data:`CHUNK_SIZE` moves at a time, through a table of
+    precomputed chunk effects.
+    """
+    table = build_chunk_codes_table()
+    grid_max_x, grid_max_y = mower.grid_size
+
+    x, y, o = mower.x, mower.y, mower.orientation_index
+    wall_hits = 0
+
+    codes = chunk_codes(moves)
+    for start, code in zip(range(0, len(moves), CHUNK_SIZE), codes):
+        dx, dy, final_o, min_dx, max_dx, min_dy, max_dy = table[o << 16 | code]
+
+        if 0 <= x + min_dx and x + max_dx <= grid_max_x and \
+                0 <= y + min_dy and y + max_dy <= grid_max_y:
+            # The whole chunk stays inside of grid
+            x, y, o = x + dx, y + dy, final_o
+        else:
+            # Close to the edge of the grid
+            mower.x, mower.y, mower.orientation_index = x, y, o
+            for move in moves[start:start + CHUNK_SIZE]:
+                wall_hits += mower.step(move)
+            x, y, o = mower.x, mower.y, mower.orientation_index
+
+    mower.x, mower.y, mower.orientation_index = x, y, o
+
+    for move in moves[len(codes) * CHUNK_SIZE:]:
+        wall_hits += mower.step(move)
+
+    return wall_hits
+
+
+ENGINES: Dict[str, Engine] = {
+    'step': step_engine,
+    'rle': run_length_engine,
+    'lookup': lookup_engine
+}
@@ -0,0 +1,127 @@
+"""
+Move mowers of many instructions files at once, on a pool of processes.
+
+Directories and glob patterns are expanded into files, which are sent to worker processes in
+chunks, to amortize inter-process overhead over many small files. Each worker parses and moves its
+files with :mod:`mower.bulkparser`; results are yielded back in input order. A malformed or
+unreadable file is reported in its result, without aborting the other files.
+"""
+
+import glob
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Optional
+
+from mower.bulkparser import parse_instructions
+from mower.engines import ENGINES
+from mower.parallel import BATCHES_PER_JOB
+
+# Number of files sent to a worker process at once
+FILES_PER_CHUNK = 64
+
+
+class FileResult(NamedTuple):
+    path: str
+    results: List[str]
+    moves: int
+    wall_hits: int
+    error: Optional[str]
+
+
+def is_multi_file(paths: List[str]) -> bool:
+    """
+    Whether command line paths designate more than a single instructions file.
+    """
+    return len(paths) > 1 or os.path.isdir(paths[0]) or _is_pattern(paths[0])
+
+
+def expand_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into sorted files; other paths are kept as
+    is, whether they exist or not.
+    """
+    files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(directory, name)
+                            for directory, _, names in os.walk(path) for name in names)
+        elif _is_pattern(path):
+            files += sorted(filter(os.path.isfile, glob.glob(path, recursive=True)))
+        else:
+            files.append(path)
+
+    return files
+
+
+def simulate_file(path: str, engine: str) -> FileResult:
+    """
+    Parse and move mowers of an instructions file, and return their final states as strings, or
+    the reason why the file could not be read or parsed.
+
+    Args:
+        path: instructions file path.
+        engine: name of the moves execution engine.
+    """
+    execute = ENGINES[engine]
+
+    results, n_moves, wall_hits = [], 0, 0
+    try:
+        with open(path, 'rb') as f:
+            grid_size, mowers_and_moves = parse_instructions(f)
+            for mower, moves in mowers_and_moves:
+                wall_hits += execute(mower, moves)
+                n_moves += len(moves)
+                results.append(str(mower))
+    except (OSError, ValueError) as e:
+        return FileResult(path, [], 0, 0, str(e))
+
+    return FileResult(path, results, n_moves, wall_hits, None)
+
+
+def simulate_files_chunk(paths: List[str], engine: str) -> List[FileResult]:
+    """
+    Parse and move mowers of a chunk of instructions files.
+    """
+    return [simulate_file(path, engine) for path in paths]
+
+
+def simulate_files(paths: List[str], engine: str, jobs: int) -> Iterator[FileResult]:
+    """
+    Parse and move mowers of many instructions files on a pool of `jobs` processes (in the
+    current process if 1), and yield results of files in input order.
+
+    Args:
+        paths: instructions files paths.
+        engine: name of the moves execution engine.
+        jobs: number of worker processes.
+    """
+    if jobs == 1:
+        for path in paths:
+            yield simulate_file(path, engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future] = deque()
+
+        for start in range(0, len(paths), FILES_PER_CHUNK):
+            chunk = paths[start:start + FILES_PER_CHUNK]
+            pending.append(executor.submit(simulate_files_chunk, chunk, engine))
+
+            if len(pending) >= jobs * BATCHES_PER_JOB:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def output_path(output_dir: str, path: str) -> str:
+    """
+    Path of the results file of an instructions file, in a given output directory.
+    """
+    return os.path.join(output_dir, os.path.basename(path) + '.out')
+
+
+def _is_pattern(path: str) -> bool:
+    return glob.escape(path) != path
@@ -0,0 +1,195 @@
+"""
+Compact store of many mowers, as a struct of arrays.
+
+A fleet shares a single grid size, and holds the state of its mowers in typed columns (x, y and
+orientation index), with their moves concatenated into a single buffer, indexed by an array of
+offsets. A mower then costs about 25 bytes plus one byte per move, instead of a :class:`Mower`
+object and a moves string. On grids too large for int64 coordinates, x and y columns fall back to
+lists of ints.
+
+Mowers of a fleet are handled through the :class:`Mower` API, either:
+  * by iterating over the fleet: each mower is loaded from columns into a short-lived
+    :class:`Mower`, and written back to columns as soon as iteration moves on to the next one (or
+    ends). This is how moves are applied to a whole fleet at full speed.
+  * by indexing the fleet: a :class:`MowerView` reads and writes columns directly, for random
+    access.
+"""
+
+from array import array
+from operator import index as to_index
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from mower.structs import Mower
+
+# Largest grid size coordinate held in typed x and y columns
+MAX_COORDINATE = (1 << 63) - 1
+
+
+class MowerFleet(Sequence[Mower]):
+    """
+    A fleet of mowers moving on the same grid.
+
+    Args:
+        grid_size: grid size shared by all mowers.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int]):
+        self.grid_size = grid_size
+
+        if max(grid_size) <= MAX_COORDINATE:
+            self.xs = array('q')
+            self.ys = array('q')
+        else:
+            self.xs = []
+            self.ys = []
+        self.orientations = array('B')
+
+        # Moves of mower i are `buffer[offsets[i]:offsets[i + 1]]`
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+
+        self.moves = FleetMoves(self)
+
+    @classmethod
+    def from_mowers(cls, grid_size: Tuple[int, int],
+                    mowers_and_moves: Iterable[Tuple[Mower, str]]) -> 'MowerFleet':
+        """
+        Build a fleet out of (mower, moves) pairs, e.g. as lazily parsed from an instructions file.
+        """
+        fleet = cls(grid_size)
+        for mower, moves in mowers_and_moves:
+            fleet.append(mower, moves)
+        return fleet
+
+    def append(self, mower: Mower, moves: str):
+        """
+        Add a copy of mower, along with its validated moves (concatenated L/R/F chars).
+        """
+        self.xs.append(mower.x)
+        self.ys.append(mower.y)
+        self.orientations.append(mower.orientation_index)
+
+        self.buffer += moves.encode('ascii')
+        self.offsets.append(len(self.buffer))
+
+    def extend(self, other: 'MowerFleet'):
+        """
+        Add copies of the mowers of another fleet, along with their moves.
+        """
+        self.xs.extend(other.xs)
+        self.ys.extend(other.ys)
+        self.orientations.extend(other.orientations)
+
+        shift = len(self.buffer)
+        self.buffer += other.buffer
+        self.offsets.extend(shift + offset for offset in other.offsets[1:])
+
+    def load(self, i: int) -> Mower:
+        """
+        Copy of i-th mower, as a detached :class:`Mower`.
+        """
+        # Columns hold valid states: skip validation and clamping of Mower.__init__
+        mower = Mower.__new__(Mower)
+        mower._max_x, mower._max_y = self.grid_size
+        mower.x, mower.y, mower.orientation_index = \
+            self.xs[i], self.ys[i], self.orientations[i]
+        return mower
+
+    def store(self, i: int, mower: Mower):
+        """
+        Overwrite state of i-th mower.
+        """
+        self.xs[i], self.ys[i], self.orientations[i] = mower.x, mower.y, mower.orientation_index
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, i: int) -> 'MowerView':
+        return MowerView(self, _check_index(i, len(self)))
+
+    def __iter__(self) -> Iterator[Mower]:
+        """
+        Iterate over mowers, loaded one at a time, and written back when moving on to the next one.
+        """
+        for i in range(len(self)):
+            mower = self.load(i)
+            try:
+                yield mower
+            finally:
+                self.store(i, mower)
+
+
+class FleetMoves(Sequence[str]):
+    """
+    Moves of the mowers of a fleet, as a sequence of strings.
+    """
+
+    def __init__(self, fleet: MowerFleet):
+        self._fleet = fleet
+
+    def __len__(self):
+        return len(self._fleet)
+
+    def __getitem__(self, i: int) -> str:
+        i = _check_index(i, len(self))
+        offsets = self._fleet.offsets
+        return self._fleet.buffer[offsets[i]:offsets[i + 1]].decode('ascii')
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+
+class MowerView(Mower):
+    """
+    A mower of a fleet, reading and writing its state straight from and to the fleet columns.
+    """
+
+    __slots__ = ('_fleet', '_i')
+
+    def __init__(self, fleet: MowerFleet, i: int):
+        self._fleet = fleet
+        self._i = i
+
+    @property
+    def x(self) -> int:
+        return self._fleet.xs[self._i]
+
+    @x.setter
+    def x(self, x: int):
+        self._fleet.xs[self._i] = x
+
+    @property
+    def y(self) -> int:
+        return self._fleet.ys[self._i]
+
+    @y.setter
+    def y(self, y: int):
+        self._fleet.ys[self._i] = y
+
+    @property
+    def orientation_index(self) -> int:
+        return self._fleet.orientations[self._i]
+
+    @orientation_index.setter
+    def orientation_index(self, orientation_index: int):
+        self._fleet.orientations[self._i] = orientation_index
+
+    @property
+    def _max_x(self) -> int:
+        return self._fleet.grid_size[0]
+
+    @property
+    def _max_y(self) -> int:
+        return self._fleet.grid_size[1]
+
+
+def _check_index(i: int, length: int) -> int:
+    """
+    Bring back a possibly negative index in [0, length), or raise :exception:`IndexError`.
+    """
+    i = to_index(i)
+    if i < 0:
+        i += length
+    if not 0 <= i < length:
+        raise IndexError('Mower index out of range')
+    return i
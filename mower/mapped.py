@@ -0,0 +1,102 @@
+"""
+Zero-copy input mode, parsing a memory-mapped instructions file.
+
+Line boundaries are found directly in the mapped buffer, and moves lines are validated and handed
+to the simulator as :class:`memoryview` slices, without creating intermediate strings. Resident
+memory stays close to the working set, and the OS page cache serves re-runs.
+"""
+
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Generator, Iterator, Tuple
+
+from mower.parser import parse_grid_size_line, parse_mower_line
+from mower.structs import Mower
+
+_INVALID_MOVE_TOKEN_PATTERN = re.compile(b'[^LRF]')
+
+_WHITESPACE = frozenset(b' \t\r\n\v\f')
+
+MappedMowers = Generator[Tuple[Mower, memoryview], None, None]
+
+
+@contextmanager
+def map_instructions(path: str) -> Iterator[Tuple[Tuple[int, int], MappedMowers]]:
+    """
+    Memory-map an instructions file, parse its grid size, and lazily parse mowers initial states
+    and moves from the rest of it.
+
+    Yields:
+        grid size, and an iterator over (mower, moves) pairs, moves being a memoryview slice of
+        the mapped file. A moves slice is only valid until the next pair is requested.
+    """
+    with open(path, 'rb') as f:
+        # Empty files can't be mapped
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if _size(f) else b''
+
+    mowers_and_moves = None
+    try:
+        lines = _iter_line_bounds(buffer)
+
+        start, end = next(lines, (0, 0))
+        grid_size = parse_grid_size_line(_decode(buffer, start, end))
+
+        mowers_and_moves = _iter_mowers(buffer, lines, grid_size)
+        yield grid_size, mowers_and_moves
+    finally:
+        # Release memoryview slices before unmapping file
+        if mowers_and_moves is not None:
+            mowers_and_moves.close()
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def _iter_mowers(buffer: mmap.mmap, lines: Iterator[Tuple[int, int]],
+                 grid_size: Tuple[int, int]) -> MappedMowers:
+    """
+    Parse mowers initial states and moves from lines bounds, until an empty initial state line.
+    """
+    with memoryview(buffer) as view:
+        for start, end in lines:
+            if start == end:
+                break
+
+            mower = parse_mower_line(_decode(buffer, start, end), grid_size)
+
+            start, end = next(lines, (end, end))
+            if _INVALID_MOVE_TOKEN_PATTERN.search(buffer, start, end):
+                raise ValueError(f'Invalid moves: "{_decode(buffer, start, end)}"')
+
+            with view[start:end] as moves:
+                yield mower, moves
+
+
+def _iter_line_bounds(buffer: mmap.mmap) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) bounds of stripped lines of buffer.
+    """
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b'\n', start)
+        next_start = len(buffer) if end < 0 else end + 1
+        end = len(buffer) if end < 0 else end
+
+        # Strip line
+        while start < end and buffer[start] in _WHITESPACE:
+            start += 1
+        while end > start and buffer[end - 1] in _WHITESPACE:
+            end -= 1
+
+        yield start, end
+
+        start = next_start
+
+
+def _decode(buffer: mmap.mmap, start: int, end: int) -> str:
+    return buffer[start:end].decode('utf8', errors='replace')
+
+
+def _size(f) -> int:
+    f.seek(0, 2)
+    return f.tell()
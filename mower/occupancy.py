@@ -0,0 +1,99 @@
+"""
+Collision-aware moves: mowers may not drive into a cell where an earlier mower is parked.
+
+Mowers are moved one after another, in input order. Once a mower is done moving, it parks on its
+final cell, recorded in an :class:`OccupancyIndex`: a set of cells, each packed into a single int.
+Checking a cell is O(1) whatever the number of parked mowers, and memory only grows with the
+number of parked mowers, not with the size of the grid.
+
+A forward move into an occupied cell is blocked, just like a forward move across the edge of the
+grid: the mower stays where it is, and carries on with its next moves.
+"""
+
+from typing import Set, Tuple
+
+from mower.engines import Moves, compile_runs
+from mower.structs import DELTAS, Mower
+
+
+class OccupancyIndex:
+    """
+    Cells of a grid occupied by parked mowers.
+
+    Args:
+        grid_size: grid size.
+
+    Attributes:
+        collisions: number of forward moves blocked by a parked mower so far.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int]):
+        self.grid_size = grid_size
+        self.collisions = 0
+
+        # Cell (x, y) is packed as x * (max y + 1) + y: a unique int, whatever the grid size
+        self._height = grid_size[1] + 1
+        self._cells: Set[int] = set()
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        """
+        Whether a mower is parked on cell (x, y).
+        """
+        return x * self._height + y in self._cells
+
+    def park(self, mower: Mower):
+        """
+        Park mower on its current cell.
+        """
+        self._cells.add(mower.x * self._height + mower.y)
+
+    def move(self, mower: Mower, moves: Moves) -> int:
+        """
+        Apply moves to mower one run (net rotation, then k forward steps) at a time, stopping at
+        the edge of the grid and before occupied cells. Mower is not parked.
+
+        Returns:
+            number of forward moves blocked by the edge of the grid or by a parked mower.
+        """
+        blocked = 0
+        for quarter_turns, steps in compile_runs(moves):
+            if quarter_turns:
+                mower.rotate(quarter_turns)
+            if steps:
+                blocked += self._forward(mower, steps)
+        return blocked
+
+    def _forward(self, mower: Mower, steps: int) -> int:
+        """
+        Move mower `steps` units forward, stopping at the edge of the grid and before the first
+        occupied cell.
+
+        Returns:
+            number of forward moves blocked by the edge of the grid or by a parked mower.
+        """
+        x, y = mower.x, mower.y
+        dx, dy = DELTAS[mower.orientation_index]
+        max_x, max_y = mower.grid_size
+
+        # Steps left before the edge of the grid
+        if dx:
+            reachable = min(steps, max_x - x if dx > 0 else x)
+        else:
+            reachable = min(steps, max_y - y if dy > 0 else y)
+
+        # Walk cell by cell until reachable cells are exhausted, or an occupied one is met
+        cells = self._cells
+        cell, delta = x * self._height + y, dx * self._height + dy
+        moved = 0
+        if cells:
+            while moved < reachable and cell + delta not in cells:
+                cell += delta
+                moved += 1
+            if moved < reachable:
+                # Remaining moves are all blocked by the same parked mower, before the edge
+                self.collisions += steps - moved
+        else:
+            moved = reachable
+
+        mower.x, mower.y = x + moved * dx, y + moved * dy
+        return steps - moved
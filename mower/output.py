@@ -0,0 +1,164 @@
+"""
+Buffered output of mowers final states.
+
+Results are collected as (mower id, x, y, orientation index) tuples, and formatted and written in
+large batches to a binary stream (e.g. `sys.stdout.buffer` or a file), rather than printed one
+mower at a time. Formats are:
+  * `text`: `x y orientation` lines, as printed by `mower` (no mower id);
+  * `jsonl`: one JSON object per line, e.g. `{"mower": 1, "x": 1, "y": 3, "orientation": "N"}`;
+  * `csv`: `mower,x,y,orientation` header, then one row per mower;
+  * `binary`: :data:`MAGIC`, then one fixed-width little-endian :data:`RECORD` per mower, for
+    coordinates of up to :data:`MAX_COORDINATE`.
+
+Mower ids start from 1, in output order, unless given explicitly.
+"""
+
+import io
+import struct
+from itertools import islice, starmap
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mower.fleet import MowerFleet
+from mower.structs import ORIENTATIONS, Mower
+
+MAGIC = b'MOWRESLT'
+
+# Mower id (uint64), x and y (int64), orientation index (uint8)
+RECORD = struct.Struct('<QqqB')
+
+# Largest coordinate held in binary records
+MAX_COORDINATE = (1 << 63) - 1
+
+# Default number of mowers formatted and written at once
+BATCH_SIZE = 1 << 16
+
+# Mower id, x, y and orientation index
+Result = Tuple[int, int, int, int]
+
+
+def _format_text(batch: List[Result]) -> bytes:
+    return ''.join([f'{x} {y} {ORIENTATIONS[o]}\n' for _, x, y, o in batch]).encode('ascii')
+
+
+def _format_jsonl(batch: List[Result]) -> bytes:
+    return ''.join([f'{{"mower": {i}, "x": {x}, "y": {y}, "orientation": "{ORIENTATIONS[o]}"}}\n'
+                    for i, x, y, o in batch]).encode('ascii')
+
+
+def _format_csv(batch: List[Result]) -> bytes:
+    return ''.join([f'{i},{x},{y},{ORIENTATIONS[o]}\n' for i, x, y, o in batch]).encode('ascii')
+
+
+def _format_binary(batch: List[Result]) -> bytes:
+    try:
+        return b''.join(starmap(RECORD.pack, batch))
+    except struct.error:
+        raise ValueError(f'Coordinates too large for binary output: must be <= {MAX_COORDINATE}')
+
+
+# Header and batch formatter of each output format
+FORMATS: Dict[str, Tuple[bytes, Callable[[List[Result]], bytes]]] = {
+    'text': (b'', _format_text),
+    'jsonl': (b'', _format_jsonl),
+    'csv': (b'mower,x,y,orientation\n', _format_csv),
+    'binary': (MAGIC, _format_binary)
+}
+
+
+class ResultWriter:
+    """
+    A buffered writer of mowers final states, in a given format.
+
+    Args:
+        stream: binary output stream. On a terminal, results are written as soon as they come.
+        output_format: output format, one of :data:`FORMATS`.
+        batch_size: number of mowers formatted and written at once.
+    """
+
+    def __init__(self, stream: io.BufferedIOBase, output_format: str = 'text',
+                 batch_size: int = BATCH_SIZE):
+        try:
+            header, self._format = FORMATS[output_format]
+        except KeyError:
+            raise ValueError(f'Invalid output format: "{output_format}"; not one of '
+                             f'{list(FORMATS)}')
+
+        self._stream = stream
+        self._interactive = stream.isatty()
+        self._batch_size = 1 if self._interactive else batch_size
+        self._batch: List[Result] = []
+        self._next_id = 1
+
+        stream.write(header)
+
+    def write(self, mower: Mower, mower_id: Optional[int] = None):
+        """
+        Write final state of mower, with a given id (by default, the one after the last mower).
+        """
+        if mower_id is None:
+            mower_id = self._next_id
+        self._next_id = mower_id + 1
+
+        self._batch.append((mower_id, mower.x, mower.y, mower.orientation_index))
+        if len(self._batch) >= self._batch_size:
+            self._write_batch()
+
+    def write_all(self, mowers: Iterable[Mower]):
+        """
+        Write final states of mowers, with consecutive ids, one batch at a time. States of a
+        :class:`MowerFleet` are read straight from its columns.
+        """
+        if isinstance(mowers, MowerFleet):
+            states = zip(mowers.xs, mowers.ys, mowers.orientations)
+        else:
+            states = ((mower.x, mower.y, mower.orientation_index) for mower in mowers)
+        results = ((i, *state) for i, state in enumerate(states, self._next_id))
+
+        while True:
+            self._batch.extend(islice(results, self._batch_size - len(self._batch)))
+            if self._batch:
+                self._next_id = self._batch[-1][0] + 1
+            if len(self._batch) < self._batch_size:
+                break
+            self._write_batch()
+
+    def flush(self):
+        """
+        Write buffered results through to the stream.
+        """
+        self._write_batch()
+        self._stream.flush()
+
+    def _write_batch(self):
+        if self._batch:
+            self._stream.write(self._format(self._batch))
+            self._batch.clear()
+            if self._interactive:
+                self._stream.flush()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+def read_binary(stream: io.BufferedIOBase) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Read mowers final states back from a binary output stream.
+
+    Returns:
+        an iterator over (mower id, x, y, orientation) tuples.
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f'Invalid binary output: missing "{MAGIC.decode()}" header')
+
+    while True:
+        record = stream.read(RECORD.size)
+        if not record:
+            break
+        if len(record) < RECORD.size:
+            raise ValueError('Invalid binary output: truncated record')
+
+        mower_id, x, y, orientation_index = RECORD.unpack(record)
+        yield mower_id, x, y, ORIENTATIONS[orientation_index]
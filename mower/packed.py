@@ -0,0 +1,251 @@
+"""
+Packed binary instructions files.
+
+A packed file starts with :data:`MAGIC` and the grid size (:data:`HEADER`), followed by one record
+per mower: a fixed-width initial state and number of moves (:data:`RECORD`), then moves packed 4
+per byte, 2 bits each (F=0, L=1, R=2), first move in lowest bits.
+
+Packed files are about 4 times smaller than text ones, and their moves need no validation: mowers
+are moved straight from packed moves by :func:`packed_engine`, through a table of the effect of
+every byte.
+"""
+
+import io
+import struct
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from mower.bulkparser import parse_instructions
+from mower.engines import ChunkEffect, build_chunk_table
+from mower.structs import ORIENTATIONS, Mower, Orientation, Position
+
+MAGIC = b'MOWPACK1'
+
+# Grid size: max x and max y (uint64)
+HEADER = struct.Struct('<QQ')
+
+# Mower initial state: x and y (uint64), orientation index (uint8), then number of moves (uint64)
+RECORD = struct.Struct('<QQBQ')
+
+# Largest coordinate of a grid size or position, as held by uint64 fields
+MAX_COORDINATE = (1 << 64) - 1
+
+# Moves, by 2-bit code
+MOVE_CODES = 'FLR'
+
+# Number of moves per byte
+MOVES_PER_BYTE = 4
+
+_ENCODE = bytes.maketrans(MOVE_CODES.encode(), bytes(range(len(MOVE_CODES))))
+
+# Decoding of each 2-bit move of a byte, invalid codes being decoded as '?'
+_DECODE = [bytes((MOVE_CODES + '?')[(byte >> 2 * k) & 3].encode()[0] for byte in range(256))
+           for k in range(MOVES_PER_BYTE)]
+
+
+class PackedMoves(NamedTuple):
+    data: bytes
+    length: int
+
+
+def pack_moves(moves: str) -> bytes:
+    """
+    Pack validated moves (concatenated L/R/F chars), 4 moves per byte.
+    """
+    codes = moves.encode('ascii').translate(_ENCODE)
+    codes += bytes(-len(codes) % MOVES_PER_BYTE)
+
+    # Codes of the k-th moves of all bytes, at once
+    packed = 0
+    for k in range(MOVES_PER_BYTE):
+        packed |= int.from_bytes(codes[k::MOVES_PER_BYTE], 'little') << 2 * k
+
+    return packed.to_bytes(len(codes) // MOVES_PER_BYTE, 'little')
+
+
+def unpack_moves(packed: PackedMoves) -> str:
+    """
+    Unpack moves into concatenated L/R/F chars.
+    """
+    data, length = packed
+
+    moves = bytearray(MOVES_PER_BYTE * len(data))
+    for k in range(MOVES_PER_BYTE):
+        moves[k::MOVES_PER_BYTE] = data.translate(_DECODE[k])
+    del moves[length:]
+
+    if b'?' in moves:
+        raise ValueError('Invalid packed moves: invalid move code')
+
+    return moves.decode('ascii')
+
+
+@lru_cache(maxsize=None)
+def build_packed_table() -> List[List[Optional[ChunkEffect]]]:
+    """
+    Precompute the effect of every byte of 4 packed moves, for every initial orientation.
+
+    Returns:
+        for each initial orientation index, a list of the effect of each byte, assuming no edge of
+        the grid is met, or None for bytes holding invalid move codes.
+    """
+    chunks = [''.join(chr(_DECODE[k][byte]) for k in range(MOVES_PER_BYTE)) for byte in range(256)]
+    return [[effects.get(chunk) for chunk in chunks]
+            for effects in build_chunk_table(MOVES_PER_BYTE)]
+
+
+def packed_engine(mower: Mower, packed: PackedMoves) -> int:
+    """
+    Apply packed moves to mower one byte (4 moves) at a time, through a table of precomputed byte
+    effects.
+
+    Returns:
+        number of forward moves blocked by the edge of the grid.
+    """
+    data, length = packed
+    table = build_packed_table()
+    grid_max_x, grid_max_y = mower.grid_size
+
+    x, y, o = mower.x, mower.y, mower.orientation_index
+    wall_hits = 0
+
+    n_full_bytes = length // MOVES_PER_BYTE
+    for byte in memoryview(data)[:n_full_bytes]:
+        effect = table[o][byte]
+        if effect is None:
+            raise ValueError('Invalid packed moves: invalid move code')
+        dx, dy, final_o, min_dx, max_dx, min_dy, max_dy = effect
+
+        if 0 <= x + min_dx and x + max_dx <= grid_max_x and \
+                0 <= y + min_dy and y + max_dy <= grid_max_y:
+            # The whole byte stays inside of grid
+            x, y, o = x + dx, y + dy, final_o
+        else:
+            # Close to the edge of the grid
+            mower.x, mower.y, mower.orientation_index = x, y, o
+            for move in unpack_moves(PackedMoves(bytes((byte,)), MOVES_PER_BYTE)):
+                wall_hits += mower.step(move)
+            x, y, o = mower.x, mower.y, mower.orientation_index
+
+    mower.x, mower.y, mower.orientation_index = x, y, o
+
+    trailing = PackedMoves(data[n_full_bytes:], length - n_full_bytes * MOVES_PER_BYTE)
+    for move in unpack_moves(trailing):
+        wall_hits += mower.step(move)
+
+    return wall_hits
+
+
+def is_packed_file(path: str) -> bool:
+    """
+    Whether a file is a packed instructions file (False if it can't be read).
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_packed(stream: io.BufferedIOBase) \
+        -> Tuple[Tuple[int, int], Iterator[Tuple[Mower, PackedMoves]]]:
+    """
+    Parse grid size from a packed instructions file stream, and lazily parse mowers initial states
+    and packed moves from the rest of it.
+
+    Returns:
+        grid size and an iterator over (mower, packed moves) pairs.
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f'Invalid packed file: missing "{MAGIC.decode()}" header')
+
+    grid_size = HEADER.unpack(_read_exactly(stream, HEADER.size))
+
+    return grid_size, _iter_mowers(stream, grid_size)
+
+
+def write_packed(stream: io.BufferedIOBase, grid_size: Tuple[int, int],
+                 mowers_and_moves: Iterable[Tuple[Mower, str]]):
+    """
+    Write a packed instructions file from grid size and (mower, moves) pairs.
+
+    Notes:
+        Initial positions are written as brought back inside of grid.
+
+    Raises:
+        ValueError: if grid size doesn't fit in packed files, before anything is written.
+    """
+    check_grid_size(grid_size)
+
+    stream.write(MAGIC + HEADER.pack(*grid_size))
+
+    for mower, moves in mowers_and_moves:
+        stream.write(RECORD.pack(mower.x, mower.y, mower.orientation_index, len(moves)))
+        stream.write(pack_moves(moves))
+
+
+def write_text(stream: io.TextIOBase, grid_size: Tuple[int, int],
+               mowers_and_moves: Iterable[Tuple[Mower, PackedMoves]]):
+    """
+    Write a text instructions file from grid size and (mower, packed moves) pairs.
+    """
+    stream.write('{} {}\n'.format(*grid_size))
+
+    for mower, packed in mowers_and_moves:
+        stream.write(f'{mower}\n{unpack_moves(packed)}\n')
+
+
+def convert(input_path: str, output_path: str):
+    """
+    Convert a text instructions file into a packed one, or a packed one back into text.
+    """
+    if is_packed_file(input_path):
+        with open(input_path, 'rb') as f, open(output_path, 'w') as output:
+            grid_size, mowers_and_moves = read_packed(f)
+            write_text(output, grid_size, mowers_and_moves)
+    else:
+        with open(input_path, 'rb') as f:
+            grid_size, mowers_and_moves = parse_instructions(f)
+            # Fail before creating output file
+            check_grid_size(grid_size)
+            with open(output_path, 'wb') as output:
+                write_packed(output, grid_size, mowers_and_moves)
+
+
+def check_grid_size(grid_size: Tuple[int, int]):
+    """
+    Raise :exception:`ValueError` if grid size doesn't fit in packed files (positions of mowers,
+    brought back inside of grid, then fit as well).
+    """
+    if max(grid_size) > MAX_COORDINATE:
+        raise ValueError(f'Grid size {grid_size} too large for packed files: coordinates must be '
+                         f'<= {MAX_COORDINATE}')
+
+
+def _iter_mowers(stream: io.BufferedIOBase,
+                 grid_size: Tuple[int, int]) -> Iterator[Tuple[Mower, PackedMoves]]:
+    """
+    Parse mowers initial states and packed moves from records, until the end of stream.
+    """
+    while True:
+        record = stream.read(RECORD.size)
+        if not record:
+            break
+        if len(record) < RECORD.size:
+            raise ValueError('Invalid packed file: truncated record')
+
+        x, y, orientation_index, length = RECORD.unpack(record)
+        if orientation_index >= len(ORIENTATIONS):
+            raise ValueError(f'Invalid packed file: invalid orientation index {orientation_index}')
+
+        mower = Mower(Position(x, y), Orientation(ORIENTATIONS[orientation_index]), grid_size)
+        data = _read_exactly(stream, -(-length // MOVES_PER_BYTE))
+
+        yield mower, PackedMoves(data, length)
+
+
+def _read_exactly(stream: io.BufferedIOBase, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) < size:
+        raise ValueError('Invalid packed file: truncated record')
+    return data
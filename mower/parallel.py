@@ -0,0 +1,114 @@
+"""
+Move mowers in parallel on a pool of processes.
+
+Mowers never interact, so they are split into batches of raw (not validated) initial state and
+moves lines, which are cheap to send to worker processes. Each worker parses and moves its batch of
+mowers, and sends their final states back as a compact :class:`MowerFleet`; mowers are yielded back
+in input order.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Tuple
+
+from mower.engines import ENGINES
+from mower.fleet import MowerFleet
+from mower.parser import parse_mower_lines
+from mower.structs import Mower
+
+# Batches are cut when reaching either bound, to balance pickling overhead and load balancing
+BATCH_MAX_MOWERS = 10000
+BATCH_MAX_MOVES = 1 << 22
+
+# Number of batches in flight per worker process, to bound memory
+BATCHES_PER_JOB = 2
+
+MowerLines = Tuple[str, str]
+
+
+def iter_batches(all_mower_lines: Iterable[MowerLines], max_mowers: int = BATCH_MAX_MOWERS,
+                 max_moves: int = BATCH_MAX_MOVES) -> Iterator[List[MowerLines]]:
+    """
+    Group raw mower lines into batches of at most `max_mowers` mowers or about `max_moves` moves.
+    """
+    batch, n_moves = [], 0
+
+    for mower_lines in all_mower_lines:
+        batch.append(mower_lines)
+        n_moves += len(mower_lines[1])
+
+        if len(batch) >= max_mowers or n_moves >= max_moves:
+            yield batch
+            batch, n_moves = [], 0
+
+    if batch:
+        yield batch
+
+
+def simulate_batch_lines(batch: List[MowerLines], grid_size: Tuple[int, int],
+                         engine: str) -> List[str]:
+    """
+    Parse and move a batch of mowers, and return their final states as strings.
+
+    Args:
+        batch: raw mower initial state and moves lines.
+        grid_size: grid size.
+        engine: name of the moves execution engine.
+    """
+    execute = ENGINES[engine]
+
+    results = []
+    for mower_line, moves_line in batch:
+        mower, moves = parse_mower_lines(mower_line, moves_line, grid_size)
+        execute(mower, moves)
+        results.append(str(mower))
+
+    return results
+
+
+def simulate_batch_fleet(batch: List[MowerLines], grid_size: Tuple[int, int],
+                         engine: str) -> MowerFleet:
+    """
+    Parse and move a batch of mowers, and return them in their final states, as a fleet (without
+    moves).
+
+    Args:
+        batch: raw mower initial state and moves lines.
+        grid_size: grid size.
+        engine: name of the moves execution engine.
+    """
+    execute = ENGINES[engine]
+
+    fleet = MowerFleet(grid_size)
+    for mower_line, moves_line in batch:
+        mower, moves = parse_mower_lines(mower_line, moves_line, grid_size)
+        execute(mower, moves)
+        fleet.append(mower, '')
+
+    return fleet
+
+
+def simulate_parallel(all_mower_lines: Iterable[MowerLines], grid_size: Tuple[int, int],
+                      engine: str, jobs: int) -> Iterator[Mower]:
+    """
+    Parse and move mowers on a pool of `jobs` processes, and yield them in their final states, in
+    input order.
+
+    Args:
+        all_mower_lines: raw mower initial state and moves lines, as consumed by
+            :func:`mower.parser.iter_mower_lines`.
+        grid_size: grid size.
+        engine: name of the moves execution engine.
+        jobs: number of worker processes.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future] = deque()
+
+        for batch in iter_batches(all_mower_lines, BATCH_MAX_MOWERS, BATCH_MAX_MOVES):
+            pending.append(executor.submit(simulate_batch_fleet, batch, grid_size, engine))
+
+            if len(pending) >= jobs * BATCHES_PER_JOB:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
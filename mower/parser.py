@@ -6,14 +6,40 @@ Parse mower moves specification file:
       line
     * mower moves (L/R/F chars) line
 
+Moves lines may optionally be given in a compressed syntax, where a parenthesized block of moves
+followed by `*N` is repeated N times, e.g. `F(FFRFFL)*1000000` (blocks may be nested). See
+:func:`parse_compressed_moves`.
+
 Handle parsing errors by raising :exception:`ValueError` with relevant error messages.
 """
 
 import io
-from typing import Tuple
+import re
+from typing import Iterator, NamedTuple, Tuple, Union
 
 from mower.structs import Mower, Orientation, Position
 
+# Default maximum number of chars read at once from a moves line by :func:`iter_moves_chunks`
+MOVES_CHUNK_SIZE = 1 << 16
+
+_VALID_MOVE_TOKENS = 'LRF'
+_INVALID_MOVE_TOKEN_PATTERN = re.compile(f'[^{_VALID_MOVE_TOKENS}]')
+
+# Compressed moves tokens: moves, block opening, block closing with repeat count, or invalid
+_COMPRESSED_TOKEN_PATTERN = re.compile(r'([LRF]+)|(\()|\)\*(\d+)|(.)')
+
+
+class Repeat(NamedTuple):
+    """
+    A block of moves repeated `count` times, in a compressed moves program.
+    """
+    body: tuple
+    count: int
+
+
+# A compressed moves program: a sequence of moves (concatenated L/R/F chars) and repeated blocks
+Program = Tuple[Union[str, Repeat], ...]
+
 
 def parse_grid_size(stream: io.TextIOBase) -> Tuple[int, int]:
     """
@@ -23,7 +49,7 @@ def parse_grid_size(stream: io.TextIOBase) -> Tuple[int, int]:
         stream: input specification file stream.
     """
     line = _readline(stream)
-    grid_size = _parse_grid_size_line(line)
+    grid_size = parse_grid_size_line(line)
     return grid_size
 
 
@@ -38,7 +64,7 @@ def parse_mower(stream: io.TextIOBase, grid_size: Tuple[int, int]) -> Mower:
 
     line = _readline(stream)
     if line:
-        mower = _parse_mower_line(line, grid_size)
+        mower = parse_mower_line(line, grid_size)
         return mower
 
 
@@ -56,20 +82,130 @@ def parse_moves(stream: io.TextIOBase) -> str:
     return moves
 
 
-def _readline(stream) -> str:
+def parse_compressed_moves(stream: io.TextIOBase) -> Program:
     """
-    Read new line from the stream.
+    Consume mower moves in compressed syntax from stream: L/R/F chars, and parenthesized blocks of
+    moves followed by `*N`, repeated N times (e.g. `F(FFRFFL)*1000000`). Blocks may be nested.
 
     Args:
         stream: input specification file stream.
+
+    Returns:
+        moves program, as a tuple of moves (concatenated L/R/F chars) and :class:`Repeat` blocks.
     """
-    line = stream.readline().strip()
-    return line
+    line = _readline(stream)
+    program = _parse_compressed_moves_line(line)
+
+    return program
+
+
+def iter_moves_chunks(stream: io.TextIOBase,
+                      chunk_size: int = MOVES_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily consume mower moves (L/R/F chars) from stream, as validated chunks of at most
+    `chunk_size` chars.
+
+    Memory stays bounded by `chunk_size` however long the moves line is. Concatenated chunks are
+    equal to the value that :func:`parse_moves` would return.
+
+    Args:
+        stream: input specification file stream.
+        chunk_size: maximum number of chars read from stream at once.
+
+    Notes:
+        Invalid move tokens are reported along with their offset in the moves line (leading
+        whitespace excluded).
+    """
+    offset = 0
+    leading = True
+
+    # Whitespace met after the last moves: only valid if nothing but whitespace follows
+    blanks, first_blank = 0, ''
+
+    while True:
+        chunk = stream.readline(chunk_size)
+        if not chunk:
+            break
+        end_of_line = chunk.endswith('\n')
+
+        if leading:
+            chunk = chunk.lstrip()
+            leading = not chunk
+
+        moves = chunk.rstrip()
+        if moves:
+            if blanks:
+                _raise_invalid_move_token(first_blank, offset)
+
+            match = _INVALID_MOVE_TOKEN_PATTERN.search(moves)
+            if match:
+                _raise_invalid_move_token(match.group(), offset + match.start())
+
+            yield moves
+            offset += len(moves)
+
+            blanks, first_blank = 0, ''
+
+        if len(moves) < len(chunk):
+            blanks += len(chunk) - len(moves)
+            first_blank = first_blank or chunk[len(moves)]
+
+        if end_of_line:
+            break
+
+
+def iter_mowers(stream: io.TextIOBase, grid_size: Tuple[int, int],
+                compressed: bool = False) -> Iterator[Tuple[Mower, Union[str, Program]]]:
+    """
+    Lazily consume mowers initial states and moves from stream, one mower at a time.
 
+    Args:
+        stream: input specification file stream, with grid size already consumed.
+        grid_size: grid size, as returned by :func:`parse_grid_size`.
+        compressed: whether moves are given in compressed syntax, in which case they are parsed by
+            :func:`parse_compressed_moves` into programs.
+    """
+    consume_moves = parse_compressed_moves if compressed else parse_moves
+
+    mower = parse_mower(stream, grid_size)
+    while mower:
+        moves = consume_moves(stream)
+        yield mower, moves
+        mower = parse_mower(stream, grid_size)
+
+
+def iter_mower_lines(stream: io.TextIOBase) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily consume raw (not validated) mowers initial state and moves lines from stream, one mower
+    at a time.
+
+    Args:
+        stream: input specification file stream, with grid size already consumed.
+
+    Notes:
+        Lines are meant to be validated later on by :func:`parse_mower_lines`.
+    """
+    mower_line = _readline(stream)
+    while mower_line:
+        moves_line = _readline(stream)
+        yield mower_line, moves_line
+        mower_line = _readline(stream)
+
+
+def parse_mower_lines(mower_line: str, moves_line: str,
+                      grid_size: Tuple[int, int]) -> Tuple[Mower, str]:
+    """
+    Parse and validate raw mower initial state and moves lines, as consumed by
+    :func:`iter_mower_lines`.
+    """
+    mower = parse_mower_line(mower_line, grid_size)
+    moves = _parse_moves_line(moves_line)
+    return mower, moves
 
-def _parse_grid_size_line(line) -> Tuple[int, int]:
+
+def parse_grid_size_line(line: str) -> Tuple[int, int]:
     """
-    Parse and validate a grid size specification (2 space-separated ints).
+    Parse and validate a grid size line (2 space-separated ints), as read by any parser.
 
     Notes:
         Both coordinates must be >= 0.
@@ -83,10 +219,10 @@ def _parse_grid_size_line(line) -> Tuple[int, int]:
     return grid_size
 
 
-def _parse_mower_line(line: str, grid_size: Tuple[int, int]) -> Mower:
+def parse_mower_line(line: str, grid_size: Tuple[int, int]) -> Mower:
     """
-    Parse and validate initial position (2 space-separated ints) and orientation (N/S/W/E char)
-    of mower.
+    Parse and validate a mower initial state line, as read by any parser: initial position (2
+    space-separated ints) and orientation (N/S/W/E char) of mower.
     """
     try:
         x, y, orientation = line.split(' ')
@@ -100,6 +236,17 @@ def _parse_mower_line(line: str, grid_size: Tuple[int, int]) -> Mower:
         return mower
 
 
+def _readline(stream) -> str:
+    """
+    Read new line from the stream.
+
+    Args:
+        stream: input specification file stream.
+    """
+    line = stream.readline().strip()
+    return line
+
+
 def _parse_point(x: str, y: str) -> Tuple[int, int]:
     """
     Parse and validate a position (two strings interpretable as ints).
@@ -130,15 +277,47 @@ def _parse_moves_line(line: str) -> str:
     return moves
 
 
+def _parse_compressed_moves_line(line: str) -> Program:
+    """
+    Validate and return compressed moves specification, as a moves program.
+    """
+    # Blocks being parsed, innermost last
+    blocks = [[]]
+
+    for match in _COMPRESSED_TOKEN_PATTERN.finditer(line):
+        moves, opening, count, invalid = match.groups()
+        if moves:
+            blocks[-1].append(moves)
+        elif opening:
+            blocks.append([])
+        elif count is not None and len(blocks) > 1:
+            body = tuple(blocks.pop())
+            blocks[-1].append(Repeat(body, int(count)))
+        else:
+            raise ValueError(f'Invalid moves: "{line}"')
+
+    if len(blocks) > 1:
+        raise ValueError(f'Invalid moves: "{line}"; unclosed block')
+
+    return tuple(blocks[0])
+
+
 def _parse_move(token: str) -> str:
     """
     Validate and return a move (L/R/F char).
     """
 
-    valid_move_tokens = 'LRF'
-
-    if token not in valid_move_tokens:
-        msg = f'Invalid move token: "{token}"; not one of {list(valid_move_tokens)}'
+    if token not in _VALID_MOVE_TOKENS:
+        msg = f'Invalid move token: "{token}"; not one of {list(_VALID_MOVE_TOKENS)}'
         raise ValueError(msg)
 
     return token
+
+
+def _raise_invalid_move_token(token: str, offset: int):
+    """
+    Report an invalid move token found at a given offset of a moves line.
+    """
+    msg = (f'Invalid moves: invalid move token "{token}" at offset {offset}; '
+           f'not one of {list(_VALID_MOVE_TOKENS)}')
+    raise ValueError(msg)
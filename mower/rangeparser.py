@@ -0,0 +1,170 @@
+"""
+Parse large instructions files in parallel, by byte ranges.
+
+The mowers part of the file (after the grid size line) is split into byte ranges, each parsed and
+validated on a pool of processes into a compact :class:`MowerFleet`. A mower block (initial state
+line, then moves line) belongs to the range holding the start of its initial state line. Each
+range is realigned to its first block: the first line starting in the range, unless it is a moves
+line (no space in it), in which case the next one.
+
+Fleets are merged back in input order. A range is only trusted if it starts exactly where parsing
+of the previous one stopped; otherwise (e.g. the line realigned on is an invalid moves line
+holding a space), it is parsed again in the main process, from there. Parsing errors carry the
+line number in the whole file, and parsing stops at the first empty initial state line, as with
+:mod:`mower.bulkparser`.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from mower.bulkparser import decode_line, parse_moves_line
+from mower.fleet import MowerFleet
+from mower.parser import parse_grid_size_line, parse_mower_line
+
+# Smallest and largest sizes of a byte range, to balance pickling overhead, load balancing and
+# memory used by workers
+MIN_RANGE_SIZE = 1 << 20
+MAX_RANGE_SIZE = 1 << 26
+
+# Number of byte ranges per worker process, for load balancing
+RANGES_PER_JOB = 4
+
+
+class RangeResult(NamedTuple):
+    # Offsets of the first block of the range, and of the first block after it
+    start: int
+    stop: int
+    fleet: MowerFleet
+    # Whether parsing stopped on an empty initial state line
+    ended: bool
+    # Line number in the range (from 0 at `start`) and message of the first parsing error
+    error: Optional[Tuple[int, str]]
+
+
+def parse_instructions_parallel(path: str, jobs: int,
+                                min_range_size: int = MIN_RANGE_SIZE) -> MowerFleet:
+    """
+    Parse an instructions file by byte ranges, on a pool of `jobs` processes (in process if 1).
+
+    Returns:
+        fleet of all mowers, in input order.
+
+    Raises:
+        ValueError: on the first parsing error of the file, with its line number.
+    """
+    with open(path, 'rb') as f:
+        grid_line = f.readline()
+        header_size = f.tell()
+    try:
+        grid_size = parse_grid_size_line(decode_line(grid_line.strip()))
+    except ValueError as e:
+        raise ValueError(f'Line 1: {e}')
+
+    size = os.path.getsize(path)
+    n_ranges = max(jobs * RANGES_PER_JOB, -(-(size - header_size) // MAX_RANGE_SIZE))
+    ranges = split_ranges(header_size, size, n_ranges, min_range_size)
+
+    if jobs == 1:
+        results = (_parse_range(path, grid_size, start, end, start == header_size)
+                   for start, end in ranges)
+        return _merge(path, grid_size, header_size, ranges, results)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_parse_range, path, grid_size, start, end, start == header_size)
+                   for start, end in ranges]
+        try:
+            results = (future.result() for future in futures)
+            return _merge(path, grid_size, header_size, ranges, results)
+        finally:
+            # Don't parse the rest of the file on error
+            for future in futures:
+                future.cancel()
+
+
+def split_ranges(start: int, end: int, n_ranges: int,
+                 min_range_size: int = MIN_RANGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) into at most `n_ranges` contiguous byte ranges of about the same size, and of
+    at least `min_range_size` bytes (but for a single range).
+    """
+    n_ranges = max(1, min(n_ranges, (end - start) // max(1, min_range_size)))
+    bounds = [start + (end - start) * i // n_ranges for i in range(n_ranges + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _merge(path: str, grid_size: Tuple[int, int], header_size: int,
+           ranges: List[Tuple[int, int]], results: Iterable[RangeResult]) -> MowerFleet:
+    """
+    Merge range results in order, parsing again misaligned ranges, and raising the first error.
+    """
+    fleet = MowerFleet(grid_size)
+    position = header_size
+
+    for (_, end), result in zip(ranges, results):
+        if result.start != position:
+            result = _parse_range(path, grid_size, position, end, True)
+
+        if result.error:
+            line, message = result.error
+            # Grid size line, then 2 lines per block before the range
+            raise ValueError(f'Line {2 + 2 * len(fleet) + line}: {message}')
+
+        fleet.extend(result.fleet)
+        if result.ended:
+            break
+        position = result.stop
+
+    return fleet
+
+
+def _parse_range(path: str, grid_size: Tuple[int, int], start: int, end: int,
+                 aligned: bool) -> RangeResult:
+    """
+    Parse mower blocks starting in byte range [start, end) of an instructions file.
+
+    Args:
+        aligned: whether `start` is known to be the offset of a block; otherwise, realign on the
+            first block starting in the range.
+    """
+    with open(path, 'rb') as f:
+        # Previous byte tells whether `start` is the start of a line
+        offset = start if aligned else start - 1
+        f.seek(offset)
+        # Blocks starting in the range may end after it: complete the last line, plus one
+        data = f.read(max(0, end - offset)) + f.readline() + f.readline()
+
+    lines = data.split(b'\n')
+    if not aligned:
+        # Skip the end of the line holding the previous byte, then a moves line, if any
+        offset += len(lines[0]) + 1
+        del lines[0]
+        if lines and b' ' not in lines[0] and offset < end:
+            offset += len(lines[0]) + 1
+            del lines[0]
+
+    fleet = MowerFleet(grid_size)
+    first = offset
+    n_lines = len(lines)
+
+    i = 0
+    while offset < end and i < n_lines:
+        mower_line = lines[i].strip()
+        if not mower_line:
+            return RangeResult(first, offset, fleet, True, None)
+
+        moves_line = lines[i + 1] if i + 1 < n_lines else b''
+        try:
+            mower = parse_mower_line(decode_line(mower_line), grid_size)
+        except ValueError as e:
+            return RangeResult(first, offset, fleet, False, (i, str(e)))
+        try:
+            moves = parse_moves_line(moves_line.strip())
+        except ValueError as e:
+            return RangeResult(first, offset, fleet, False, (i + 1, str(e)))
+
+        fleet.append(mower, moves)
+        offset += len(lines[i]) + len(moves_line) + 2
+        i += 2
+
+    return RangeResult(first, offset, fleet, False, None)
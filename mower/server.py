@@ -0,0 +1,200 @@
+"""
+Asyncio network service moving mowers of submitted instructions files, on a worker pool.
+
+Line protocol, over a TCP or Unix socket. A client submits an instructions file as:
+
+    SUBMIT <payload size in bytes>\\n
+    <payload>
+
+and the server streams back one final mower state per line, followed by `OK`, or by
+`ERROR <message>` if the request is invalid. Several requests may be submitted in turn over the
+same connection.
+
+Requests are bounded in size, and in number of requests simulated at once. Results are written
+back with flow control, so that slow clients hold back their own simulations.
+"""
+
+import asyncio
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from mower.parallel import (BATCH_MAX_MOVES, BATCH_MAX_MOWERS, BATCHES_PER_JOB, MowerLines,
+                            iter_batches, simulate_batch_lines)
+from mower.parser import iter_mower_lines, parse_grid_size
+
+# Default maximum size of a request payload, in bytes
+MAX_REQUEST_SIZE = 1 << 26
+
+# Default maximum number of requests simulated at once
+MAX_CONCURRENT_REQUESTS = 16
+
+
+class MowerServer:
+    """
+    A server moving mowers of submitted instructions files.
+
+    Args:
+        executor: worker pool moving batches of mowers (by default, a pool of processes).
+        jobs: number of worker processes of default worker pool (by default, number of CPUs).
+        engine: name of the moves execution engine.
+        max_request_size: maximum size of a request payload, in bytes.
+        max_concurrent_requests: maximum number of requests simulated at once; further requests
+            wait for a slot.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, jobs: Optional[int] = None,
+                 engine: str = 'rle', max_request_size: int = MAX_REQUEST_SIZE,
+                 max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS):
+        self._own_executor = executor is None
+        self._executor = ProcessPoolExecutor(jobs) if executor is None else executor
+        self._max_in_flight = (jobs or os.cpu_count() or 1) * BATCHES_PER_JOB
+        self._engine = engine
+        self._max_request_size = max_request_size
+        self._max_concurrent_requests = max_concurrent_requests
+
+        # Created along with the event loop, in :meth:`start`
+        self._slots = None
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """
+        Start serving on a TCP socket (host and port) or on a Unix socket (path).
+        """
+        self._slots = asyncio.Semaphore(self._max_concurrent_requests)
+
+        if path:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve requests of a client connection, in turn, until it closes.
+        """
+        try:
+            while True:
+                try:
+                    header = await reader.readline()
+                except ValueError:
+                    # Longer than the stream reader limit
+                    await _write_line(writer, 'ERROR Request header too long')
+                    break
+                if not header:
+                    break
+
+                try:
+                    size = _parse_header(header, self._max_request_size)
+                except ValueError as e:
+                    # Payload can't be skipped: drop connection
+                    await _write_line(writer, f'ERROR {e}')
+                    break
+
+                payload = await reader.readexactly(size)
+
+                async with self._slots:
+                    await self._simulate(payload, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        """
+        Shut down the default worker pool.
+        """
+        if self._own_executor:
+            self._executor.shutdown()
+
+    async def _simulate(self, payload: bytes, writer: asyncio.StreamWriter):
+        """
+        Move mowers of an instructions file on the worker pool, and stream results back in order.
+        """
+        # Running loop (asyncio.get_running_loop is Python >= 3.7)
+        loop = asyncio.get_event_loop()
+        pending = []
+
+        try:
+            # Parse on the default thread pool, not to hold back other clients meanwhile
+            grid_size, batches = await loop.run_in_executor(None, _parse_request, payload)
+
+            while True:
+                batch = await loop.run_in_executor(None, next, batches, None)
+                if batch is None:
+                    break
+
+                pending.append(loop.run_in_executor(self._executor, simulate_batch_lines, batch,
+                                                    grid_size, self._engine))
+                if len(pending) >= self._max_in_flight:
+                    await _write_lines(writer, await pending.pop(0))
+
+            while pending:
+                await _write_lines(writer, await pending.pop(0))
+        except ValueError as e:
+            for future in pending:
+                future.cancel()
+            await _write_line(writer, f'ERROR {e}')
+        else:
+            await _write_line(writer, 'OK')
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  payload: bytes) -> List[str]:
+    """
+    Submit an instructions file to a server, and return final mower states.
+
+    Raises:
+        ValueError: if the server reports an error.
+    """
+    writer.write(b'SUBMIT %d\n' % len(payload) + payload)
+    await writer.drain()
+
+    results = []
+    while True:
+        line = (await reader.readline()).decode().rstrip('\n')
+        if line == 'OK':
+            return results
+        if line.startswith('ERROR ') or not line:
+            raise ValueError(line[len('ERROR '):] if line else 'Connection closed by server')
+        results.append(line)
+
+
+def _parse_request(payload: bytes) -> Tuple[Tuple[int, int], Iterator[List[MowerLines]]]:
+    """
+    Parse grid size of a request payload, and lazily group the rest of it into batches of raw
+    mower lines.
+    """
+    stream = io.StringIO(payload.decode())
+    grid_size = parse_grid_size(stream)
+    return grid_size, iter_batches(iter_mower_lines(stream), BATCH_MAX_MOWERS, BATCH_MAX_MOVES)
+
+
+def _parse_header(header: bytes, max_request_size: int) -> int:
+    """
+    Parse and validate a request header, and return its payload size.
+    """
+    try:
+        command, size = header.decode().split(' ')
+        size = int(size)
+        if command != 'SUBMIT' or size < 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f'Invalid request header: "{header.decode(errors="replace").strip()}"')
+
+    if size > max_request_size:
+        raise ValueError(f'Request too large: {size} bytes, must be <= {max_request_size}')
+
+    return size
+
+
+async def _write_lines(writer: asyncio.StreamWriter, lines: List[str]):
+    """
+    Write lines, waiting for the client to catch up if needed.
+    """
+    if lines:
+        writer.write(('\n'.join(lines) + '\n').encode())
+        await writer.drain()
+
+
+async def _write_line(writer: asyncio.StreamWriter, line: str):
+    await _write_lines(writer, [line])
@@ -0,0 +1,136 @@
+"""
+Lightweight run instrumentation: wall time of parse, simulate and output phases, numbers of mowers
+and moves processed, moves/sec, wall hits and peak memory.
+
+Counters are updated once per mower, never once per move. When disabled (:class:`NoStats`),
+instrumentation is a no-op.
+"""
+
+import json
+import resource
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PHASES = ('parse', 'simulate', 'output')
+
+
+class Stats:
+    """
+    Phase timings and counters of a run.
+
+    Attributes:
+        mowers: number of mowers processed.
+        moves: number of moves processed.
+        wall_hits: number of forward moves blocked by the edge of the grid, or None if the
+            execution mode at hand does not report them.
+    """
+
+    def __init__(self):
+        self.phase_seconds = OrderedDict((phase, 0.) for phase in PHASES)
+        self.mowers = 0
+        self.moves = 0
+        self.wall_hits = 0
+
+    def phase(self, name: str) -> '_PhaseTimer':
+        """
+        Context manager adding the wall time of its body to a given phase.
+        """
+        return _PhaseTimer(self, name)
+
+    def count(self, mowers: int, moves: int, wall_hits: Optional[int] = None):
+        """
+        Count processed mowers and moves, along with wall hits, if known.
+        """
+        self.mowers += mowers
+        self.moves += moves
+        if wall_hits is None:
+            self.wall_hits = None
+        elif self.wall_hits is not None:
+            self.wall_hits += wall_hits
+
+    @property
+    def moves_per_second(self) -> Optional[float]:
+        simulate_seconds = self.phase_seconds['simulate']
+        if simulate_seconds:
+            return self.moves / simulate_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'phase_seconds': dict(self.phase_seconds),
+            'mowers': self.mowers,
+            'moves': self.moves,
+            'moves_per_second': self.moves_per_second,
+            'wall_hits': self.wall_hits,
+            'peak_rss_bytes': peak_rss_bytes()
+        }
+
+    def dump(self, path: str):
+        """
+        Dump stats as JSON to a file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def __str__(self):
+        lines = [f'{phase:>8}: {seconds:.3f}s' for phase, seconds in self.phase_seconds.items()]
+
+        moves_per_second = self.moves_per_second
+        wall_hits = 'n/a' if self.wall_hits is None else self.wall_hits
+
+        lines += [
+            f'  mowers: {self.mowers}',
+            f'   moves: {self.moves}',
+            f' moves/s: {"n/a" if moves_per_second is None else f"{moves_per_second:,.0f}"}',
+            f'    hits: {wall_hits}',
+            f'peak RSS: {peak_rss_bytes() / 2 ** 20:.1f} MiB'
+        ]
+
+        return '\n'.join(lines)
+
+
+class NoStats(Stats):
+    """
+    Disabled stats: instrumentation is a no-op.
+    """
+
+    def phase(self, name: str) -> '_NoOpTimer':
+        return _NO_OP_TIMER
+
+    def count(self, mowers: int, moves: int, wall_hits: Optional[int] = None):
+        pass
+
+
+class _PhaseTimer:
+
+    def __init__(self, stats: Stats, name: str):
+        self._stats = stats
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self._stats.phase_seconds[self._name] += time.perf_counter() - self._start
+
+
+class _NoOpTimer:
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_OP_TIMER = _NoOpTimer()
+
+
+def peak_rss_bytes() -> int:
+    """
+    Peak resident set size of current process, in bytes.
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
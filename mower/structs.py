@@ -1,49 +1,64 @@
 """
 A set of helper structs.
+
+States are stored as exact ints in `__slots__`: positions as (x, y) coordinates, orientations as an
+index in :data:`ORIENTATIONS` (N/E/S/W, in clockwise order), rotated through lookup tables.
 """
 from typing import Tuple
 
+# Orientations in clockwise order
+ORIENTATIONS = 'NESW'
+
+# Unit (dx, dy) displacement along each orientation index
+DELTAS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# Orientation index after a 1/4 counter-clockwise (left) or clockwise (right) rotation
+LEFT = (3, 0, 1, 2)
+RIGHT = (1, 2, 3, 0)
+
 
 class Orientation:
     """
     A pretty-printable structure that encapsulates a N/S/W/E orientation and operates upon it.
     """
 
-    orientation_to_complex = {
-        'W': complex(-1, 0),
-        'E': complex(1, 0),
-        'N': complex(0, 1),
-        'S': complex(0, -1)
-    }
+    __slots__ = ('index',)
 
-    complex_to_orientation = {c: orientation for orientation, c
-                              in orientation_to_complex.items()}
+    orientation_to_index = {orientation: index for index, orientation in enumerate(ORIENTATIONS)}
 
     def __init__(self, orientation: str):
         try:
-            self.cplx_orientation = self.orientation_to_complex[orientation]
+            self.index = self.orientation_to_index[orientation]
         except KeyError:
-            valid_orientations = list(self.orientation_to_complex.keys())
+            valid_orientations = list(self.orientation_to_index.keys())
             msg = f'Invalid orientation: "{orientation}"; not one of {valid_orientations}'
             raise ValueError(msg)
 
     @property
     def orientation(self) -> str:
-        return self.complex_to_orientation[self.cplx_orientation]
+        return ORIENTATIONS[self.index]
 
     def rotate_left(self):
         """
         Perform 1/4 counter-clockwise rotation of orientation.
         """
-        # Multiply the orientation by j = exp(j * pi / 2) in the complex plane
-        self.cplx_orientation *= complex(0, 1)
+        self.index = LEFT[self.index]
 
     def rotate_right(self):
         """
         Perform 1/4 clockwise rotation of orientation.
         """
-        # Multiply the orientation by -j = exp(-j * pi / 2) in the complex plane
-        self.cplx_orientation *= complex(0, -1)
+        self.index = RIGHT[self.index]
+
+    def rotate(self, quarter_turns: int):
+        """
+        Perform several 1/4 counter-clockwise rotations of orientation at once.
+
+        Args:
+            quarter_turns: number of 1/4 counter-clockwise rotations (negative for clockwise).
+        """
+        # Orientations are in clockwise order
+        self.index = (self.index - quarter_turns) % 4
 
     def __str__(self):
         return self.orientation
@@ -55,22 +70,23 @@ class Position:
     upon it.
     """
 
-    def __init__(self, x: int, y: int):
-        self.cplx_position = complex(x, y)
-
-    @property
-    def x(self) -> int:
-        return int(self.cplx_position.real)
+    __slots__ = ('x', 'y')
 
-    @property
-    def y(self) -> int:
-        return int(self.cplx_position.imag)
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
 
-    def forward(self, orientation: Orientation, grid_size: Tuple[int, int]):
+    def forward(self, orientation: Orientation, grid_size: Tuple[int, int], steps: int = 1):
         """
-        Move position 1 unit along a given orientation.
+        Move position `steps` units (1 by default) along a given orientation.
+
+        Notes:
+            Position is brought back inside of grid only once, at the end. Starting from inside of
+            grid, this is equivalent to moving 1 unit at a time, since moves are along one axis.
         """
-        self.cplx_position += orientation.cplx_orientation
+        dx, dy = DELTAS[orientation.index]
+        self.x += steps * dx
+        self.y += steps * dy
         self.restrict_to_grid(grid_size)
 
     def restrict_to_grid(self, grid_size: Tuple[int, int]):
@@ -78,9 +94,8 @@ class Position:
         Bring back position inside of grid, if needed.
         """
         max_x, max_y = grid_size
-        x = max(0, min(self.x, max_x))
-        y = max(0, min(self.y, max_y))
-        self.cplx_position = complex(x, y)
+        self.x = max(0, min(self.x, max_x))
+        self.y = max(0, min(self.y, max_y))
 
     def __str__(self):
         return f'{self.x} {self.y}'
@@ -89,40 +104,78 @@ class Position:
 class Mower:
     """
     A structure that encapsulates a mower's position and orientation.
+
+    Notes:
+        State is held flat in the mower itself (x, y, orientation index and grid bounds), rather
+        than in :class:`Position` and :class:`Orientation` objects.
     """
 
+    __slots__ = ('x', 'y', 'orientation_index', '_max_x', '_max_y')
+
     def __init__(self, position: Position, orientation: Orientation, grid_size: Tuple[int, int]):
-        self._position = position
-        self._orientation = orientation
-        self._grid_size = grid_size
+        self._max_x, self._max_y = grid_size
 
         # Force initial position inside grid
-        self._position.restrict_to_grid(self._grid_size)
+        self.x = max(0, min(position.x, self._max_x))
+        self.y = max(0, min(position.y, self._max_y))
 
-    @property
-    def x(self):
-        return self._position.x
+        self.orientation_index = orientation.index
 
     @property
-    def y(self):
-        return self._position.y
+    def orientation(self) -> str:
+        return ORIENTATIONS[self.orientation_index]
 
     @property
-    def orientation(self):
-        return self._orientation.orientation
+    def grid_size(self) -> Tuple[int, int]:
+        return self._max_x, self._max_y
 
-    def step(self, move: str):
+    def step(self, move: str) -> int:
         """
         Apply move (L/R/F char) to mower.
+
+        Returns:
+            number of forward moves blocked by the edge of the grid (0 or 1).
         """
-        if move == 'L':
-            self._orientation.rotate_left()
+        if move == 'F':
+            dx, dy = DELTAS[self.orientation_index]
+            x, y = self.x + dx, self.y + dy
+            # Mower is inside grid: a single unit move may only bring it 1 unit outside of it
+            if 0 <= x <= self._max_x and 0 <= y <= self._max_y:
+                self.x, self.y = x, y
+                return 0
+            return 1
+        elif move == 'L':
+            self.orientation_index = LEFT[self.orientation_index]
         elif move == 'R':
-            self._orientation.rotate_right()
-        elif move == 'F':
-            self._position.forward(self._orientation, self._grid_size)
+            self.orientation_index = RIGHT[self.orientation_index]
         else:
             raise NotImplementedError(f'Invalid move: "{move}"')
+        return 0
+
+    def rotate(self, quarter_turns: int):
+        """
+        Rotate mower by several 1/4 counter-clockwise rotations (negative for clockwise) at once.
+        """
+        # Orientations are in clockwise order
+        self.orientation_index = (self.orientation_index - quarter_turns) % 4
+
+    def forward(self, steps: int) -> int:
+        """
+        Move mower `steps` units forward at once, stopping at the edge of the grid.
+
+        Returns:
+            number of forward moves blocked by the edge of the grid.
+        """
+        dx, dy = DELTAS[self.orientation_index]
+        if dx:
+            x = max(0, min(self.x + steps * dx, self._max_x))
+            blocked = steps - abs(x - self.x)
+            self.x = x
+        else:
+            y = max(0, min(self.y + steps * dy, self._max_y))
+            blocked = steps - abs(y - self.y)
+            self.y = y
+        return blocked
 
     def __str__(self):
-        return f'{self._position} {self._orientation}'
+        return f'{self.x} {self.y} {ORIENTATIONS[self.orientation_index]}'
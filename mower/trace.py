@@ -0,0 +1,164 @@
+"""
+Binary trajectory traces of mowers.
+
+A trace file starts with :data:`MAGIC`, followed by a stream of fixed-width little-endian records
+(mower id, step, x, y, orientation index), one per mower state: step 0 is the initial state, step
+n the state after n moves.
+
+Traces are written through a buffered writer, and read back either sequentially or through a
+memory map.
+"""
+
+import mmap
+import struct
+from typing import Iterator, NamedTuple, Tuple
+
+from mower.structs import ORIENTATIONS, Mower
+
+MAGIC = b'MOWTRACE'
+
+# Mower id (uint32), step (uint64), x and y (int64), orientation index (uint8)
+RECORD = struct.Struct('<IQqqB')
+
+# Largest grid size coordinate fitting in records
+MAX_COORDINATE = (1 << 63) - 1
+
+# Default buffer size of trace writer
+BUFFER_SIZE = 1 << 20
+
+
+class TraceRecord(NamedTuple):
+    mower_id: int
+    step: int
+    x: int
+    y: int
+    orientation: str
+
+
+class TraceWriter:
+    """
+    A buffered writer of mowers trajectories to a binary trace file.
+
+    Args:
+        path: trace file path, overwritten if it exists.
+        buffer_size: size of the write buffer, in bytes.
+    """
+
+    def __init__(self, path: str, buffer_size: int = BUFFER_SIZE):
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._file.write(MAGIC)
+
+    def record(self, mower_id: int, step: int, mower: Mower):
+        """
+        Record state of mower at a given step.
+        """
+        self._file.write(RECORD.pack(mower_id, step, mower.x, mower.y, mower.orientation_index))
+
+    def trace(self, mower_id: int, mower: Mower, moves: str, step: int = 0) -> int:
+        """
+        Apply moves to mower one at a time, recording its state after each of them.
+
+        Args:
+            mower_id: mower id.
+            mower: mower to move.
+            moves: validated moves specification (concatenated L/R/F chars).
+            step: number of moves already applied to mower.
+
+        Notes:
+            Initial state of mower is not recorded; see :meth:`record`.
+
+        Returns:
+            number of moves applied to mower so far, to trace further moves from.
+        """
+        write, pack = self._file.write, RECORD.pack
+
+        for step, move in enumerate(moves, step + 1):
+            mower.step(move)
+            write(pack(mower_id, step, mower.x, mower.y, mower.orientation_index))
+
+        return step
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def check_grid_size(grid_size: Tuple[int, int]):
+    """
+    Raise :exception:`ValueError` if states of mowers on a grid don't fit in trace records.
+    """
+    if max(grid_size) > MAX_COORDINATE:
+        raise ValueError(f'Grid size {grid_size} too large for trace files: coordinates must be '
+                         f'<= {MAX_COORDINATE}')
+
+
+def iter_trace(path: str) -> Iterator[TraceRecord]:
+    """
+    Sequentially read records back from a trace file.
+    """
+    with open(path, 'rb') as f:
+        _check_magic(f.read(len(MAGIC)), path)
+
+        n_records_per_read = 1 << 14
+        while True:
+            data = f.read(RECORD.size * n_records_per_read)
+            if len(data) % RECORD.size:
+                raise ValueError(f'Invalid trace file: "{path}"; truncated record')
+
+            for mower_id, step, x, y, orientation_index in RECORD.iter_unpack(data):
+                yield TraceRecord(mower_id, step, x, y, ORIENTATIONS[orientation_index])
+
+            if len(data) < RECORD.size * n_records_per_read:
+                break
+
+
+class MappedTrace:
+    """
+    A memory-mapped, read-only, random-access view of records of a trace file.
+
+    Args:
+        path: trace file path.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _check_magic(self._mmap[:len(MAGIC)], path)
+        if (len(self._mmap) - len(MAGIC)) % RECORD.size:
+            raise ValueError(f'Invalid trace file: "{path}"; truncated record')
+
+    def __len__(self) -> int:
+        return (len(self._mmap) - len(MAGIC)) // RECORD.size
+
+    def __getitem__(self, i: int) -> TraceRecord:
+        if not -len(self) <= i < len(self):
+            raise IndexError('trace record index out of range')
+        i %= len(self)
+
+        mower_id, step, x, y, orientation_index = RECORD.unpack_from(
+            self._mmap, len(MAGIC) + i * RECORD.size)
+        return TraceRecord(mower_id, step, x, y, ORIENTATIONS[orientation_index])
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self) -> 'MappedTrace':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _check_magic(magic: bytes, path: str):
+    if magic != MAGIC:
+        raise ValueError(f'Invalid trace file: "{path}"; missing "{MAGIC.decode()}" header')
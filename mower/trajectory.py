@@ -0,0 +1,211 @@
+"""
+Trajectory index of mowers, answering "where was mower i at step t" without replaying all moves.
+
+While mowers move, a snapshot of their state (x, y, orientation index) is recorded every
+`interval` steps, in compact arrays, along with their moves, packed 4 per byte. A query restores
+the nearest snapshot before the requested step, and replays at most `interval - 1` moves from
+there. The larger the interval, the smaller the index, and the slower the queries.
+
+Indexes are saved to and loaded from binary files: :data:`MAGIC`, :data:`HEADER`, then the
+number of moves of each mower, snapshots x, y and orientation indexes, and packed moves, as
+little-endian arrays.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from typing import Tuple
+
+from mower.bulkparser import parse_instructions
+from mower.engines import Engine, run_length_engine
+from mower.packed import (MOVES_PER_BYTE, PackedMoves, is_packed_file, pack_moves, read_packed,
+                          unpack_moves)
+from mower.structs import ORIENTATIONS, Mower, Orientation, Position
+
+MAGIC = b'MOWINDEX'
+
+# Grid size (max x and max y), snapshots interval and number of mowers (uint64)
+HEADER = struct.Struct('<QQQQ')
+
+# Default number of steps between two snapshots
+SNAPSHOT_INTERVAL = 1024
+
+# Largest coordinate of a grid size or snapshot, as held by int64 arrays
+MAX_COORDINATE = (1 << 63) - 1
+
+
+class TrajectoryIndex:
+    """
+    Trajectory index of the mowers of an instructions file.
+
+    Args:
+        grid_size: grid size, whose coordinates must be <= :data:`MAX_COORDINATE`.
+        interval: number of steps between two snapshots of a mower state.
+    """
+
+    def __init__(self, grid_size: Tuple[int, int], interval: int = SNAPSHOT_INTERVAL):
+        if interval < 1:
+            raise ValueError(f'Invalid snapshot interval: {interval}, must be an integer >= 1')
+        # Snapshots are brought back inside of grid: they fit in arrays if grid size does
+        if max(grid_size) > MAX_COORDINATE:
+            raise ValueError(f'Grid size {grid_size} too large for trajectory indexes: coordinates '
+                             f'must be <= {MAX_COORDINATE}')
+
+        self.grid_size = grid_size
+        self.interval = interval
+
+        # Number of moves of each mower
+        self._lengths = array('Q')
+
+        # Snapshots of all mowers, one every `interval` steps from step 0
+        self._xs = array('q')
+        self._ys = array('q')
+        self._orientations = array('B')
+
+        # Packed moves of all mowers, each one starting on a new byte
+        self._moves = bytearray()
+
+        # Index of the first snapshot and packed moves byte of each mower
+        self._snapshots_offsets = array('Q')
+        self._moves_offsets = array('Q')
+
+    @classmethod
+    def build(cls, path: str, interval: int = SNAPSHOT_INTERVAL,
+              engine: Engine = run_length_engine) -> 'TrajectoryIndex':
+        """
+        Move mowers of a text or packed instructions file with a given engine, and index their
+        trajectories.
+        """
+        with open(path, 'rb') as f:
+            if is_packed_file(path):
+                grid_size, mowers_and_moves = read_packed(f)
+                mowers_and_moves = ((mower, unpack_moves(packed))
+                                    for mower, packed in mowers_and_moves)
+            else:
+                grid_size, mowers_and_moves = parse_instructions(f)
+
+            index = cls(grid_size, interval)
+            for mower, moves in mowers_and_moves:
+                index.add(mower, moves, engine)
+
+        return index
+
+    def add(self, mower: Mower, moves: str, engine: Engine = run_length_engine):
+        """
+        Apply moves to the next mower with a given engine, and index its trajectory.
+        """
+        self._snapshots_offsets.append(len(self._xs))
+        self._moves_offsets.append(len(self._moves))
+        self._lengths.append(len(moves))
+
+        self._moves += pack_moves(moves)
+
+        for start in range(0, len(moves) + 1, self.interval):
+            self._xs.append(mower.x)
+            self._ys.append(mower.y)
+            self._orientations.append(mower.orientation_index)
+            engine(mower, moves[start:start + self.interval])
+
+    def where(self, mower_id: int, step: int) -> Mower:
+        """
+        State of a mower after a given number of moves.
+
+        Args:
+            mower_id: mower id, from 1 (in input order).
+            step: number of moves applied, from 0 (initial state).
+
+        Raises:
+            IndexError: if the mower or step are out of range.
+        """
+        i = mower_id - 1
+        if not 0 <= i < len(self._lengths):
+            raise IndexError(f'Invalid mower id: {mower_id}, must be in [1, {len(self._lengths)}]')
+
+        length = self._lengths[i]
+        if not 0 <= step <= length:
+            raise IndexError(f'Invalid step: {step}, must be in [0, {length}] for mower '
+                             f'{mower_id}')
+
+        # Restore nearest snapshot
+        snapshot, n_replayed = divmod(step, self.interval)
+        snapshot += self._snapshots_offsets[i]
+        start = step - n_replayed
+        orientation = Orientation(ORIENTATIONS[self._orientations[snapshot]])
+        mower = Mower(Position(self._xs[snapshot], self._ys[snapshot]), orientation,
+                      self.grid_size)
+
+        # Replay moves since then, unpacking only the bytes that hold them
+        first_byte = self._moves_offsets[i] + start // MOVES_PER_BYTE
+        last_byte = self._moves_offsets[i] + -(-step // MOVES_PER_BYTE)
+        skipped = start % MOVES_PER_BYTE
+        packed = PackedMoves(bytes(self._moves[first_byte:last_byte]), step - start + skipped)
+        run_length_engine(mower, unpack_moves(packed)[skipped:])
+
+        return mower
+
+    def save(self, path: str):
+        """
+        Save index to a binary file.
+        """
+        with open(path, 'wb') as f:
+            f.write(MAGIC + HEADER.pack(*self.grid_size, self.interval, len(self._lengths)))
+            for values in [self._lengths, self._xs, self._ys, self._orientations]:
+                _little_endian(values).tofile(f)
+            f.write(self._moves)
+
+    @classmethod
+    def load(cls, path: str) -> 'TrajectoryIndex':
+        """
+        Load index from a binary file.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'Invalid index file: "{path}"; missing "{MAGIC.decode()}" header')
+
+            try:
+                max_x, max_y, interval, n_mowers = HEADER.unpack(f.read(HEADER.size))
+
+                index = cls((max_x, max_y), interval)
+                index._lengths.fromfile(f, n_mowers)
+                index._lengths = _little_endian(index._lengths)
+
+                n_snapshots = n_bytes = 0
+                for length in index._lengths:
+                    index._snapshots_offsets.append(n_snapshots)
+                    index._moves_offsets.append(n_bytes)
+                    n_snapshots += length // interval + 1
+                    n_bytes += -(-length // MOVES_PER_BYTE)
+
+                for name in ['_xs', '_ys', '_orientations']:
+                    values = getattr(index, name)
+                    values.fromfile(f, n_snapshots)
+                    setattr(index, name, _little_endian(values))
+
+                index._moves = bytearray(f.read(n_bytes))
+                if len(index._moves) < n_bytes:
+                    raise EOFError
+            except (struct.error, EOFError):
+                raise ValueError(f'Invalid index file: "{path}"; truncated file')
+
+        return index
+
+    def __len__(self):
+        return len(self._lengths)
+
+
+def is_up_to_date(index_path: str, path: str) -> bool:
+    """
+    Whether an index file exists and is newer than the instructions file it indexes.
+    """
+    return os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(path)
+
+
+def _little_endian(values: array) -> array:
+    """
+    Convert a native array from or to little-endian: a byte-swapped copy on big-endian platforms.
+    """
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
@@ -0,0 +1,108 @@
+"""
+Watch mode: move mowers of an instructions file again on every change of the file, moving only
+those whose instructions changed.
+
+The file is polled for changes of its modification time or size. On change, it is read whole and
+split into mower blocks (initial state line and moves line). Only blocks differing from those of
+the previous update (or new blocks) are parsed and moved again; a change of grid size moves all
+mowers again.
+"""
+
+import os
+from itertools import compress
+from operator import ne
+from typing import List, Optional, Tuple
+
+from mower.bulkparser import decode_line, parse_moves_line
+from mower.engines import Engine, run_length_engine
+from mower.parser import parse_grid_size_line, parse_mower_line
+from mower.structs import Mower
+
+# Default number of seconds between two polls of the watched file
+POLL_INTERVAL = 0.5
+
+
+class WatchedFile:
+    """
+    Instructions file watched for changes.
+
+    Args:
+        path: path of instructions file.
+        engine: engine moving mowers.
+
+    Attributes:
+        grid_size: grid size, as of the last update (None before the first one).
+        n_mowers: number of mowers, as of the last update.
+    """
+
+    def __init__(self, path: str, engine: Engine = run_length_engine):
+        self.path = path
+        self.engine = engine
+        self.grid_size: Optional[Tuple[int, int]] = None
+
+        # Modification time and size of file, as of the last poll
+        self._signature: Optional[Tuple[int, int]] = None
+
+        # Block (initial state and moves lines) of each mower, as of the last update
+        self._blocks: List[Tuple[bytes, bytes]] = []
+
+    @property
+    def n_mowers(self) -> int:
+        return len(self._blocks)
+
+    def changed(self) -> bool:
+        """
+        Whether modification time or size of file changed since the last call (True on the first
+        call, if file exists).
+        """
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        changed = signature != self._signature
+        self._signature = signature
+        return changed
+
+    def update(self) -> List[Tuple[int, Mower]]:
+        """
+        Read file, and move again mowers whose block changed since the last update (all of them on
+        first update).
+
+        Returns:
+            (mower id, mower in its final state) pairs of mowers moved again, in input order, ids
+            starting from 1.
+
+        Raises:
+            OSError: if file can't be read.
+            ValueError: if a changed block is invalid; the state of the last update is kept.
+        """
+        with open(self.path, 'rb') as f:
+            lines = list(map(bytes.strip, f.read().split(b'\n')))
+
+        grid_size = parse_grid_size_line(decode_line(lines[0]))
+
+        # Mower blocks end at the first empty initial state line
+        state_lines, moves_lines = lines[1::2], lines[2::2]
+        try:
+            n_mowers = state_lines.index(b'')
+        except ValueError:
+            n_mowers = len(state_lines)
+        moves_lines += [b''] * (n_mowers - len(moves_lines))
+
+        # Lines pairs, compared without Python-level loops
+        blocks = list(zip(state_lines[:n_mowers], moves_lines))
+        previous_blocks = self._blocks if grid_size == self.grid_size else []
+        changed = list(compress(range(n_mowers), map(ne, blocks, previous_blocks)))
+        changed += range(len(previous_blocks), n_mowers)
+
+        results = []
+        for i in changed:
+            mower = parse_mower_line(decode_line(state_lines[i]), grid_size)
+            self.engine(mower, parse_moves_line(moves_lines[i]))
+            results.append((i + 1, mower))
+
+        self.grid_size, self._blocks = grid_size, blocks
+
+        return results
@@ -8,7 +8,7 @@ setup(name='mower',
       author='Quentin Augé',
       author_email='quentin.auge@gmail.com',
       license='closed',
-      packages=find_packages(),
+      packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
 
       python_requires='>=3.6',
 
@@ -17,7 +17,8 @@ setup(name='mower',
                    'Operating System :: Unix'],
 
       extras_require={
-          'testing': ['coverage', 'mock', 'pytest', 'pytest-cov']
+          'batch': ['numpy'],
+          'testing': ['coverage', 'mock', 'numpy', 'pytest', 'pytest-cov']
       },
 
       entry_points={
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from mower.structs import Mower, Orientation, Position
+
+batch = pytest.importorskip('mower.batch')
+pytest.importorskip('numpy')
+
+
+def make_mowers(rng, n_mowers, grid_size, max_moves):
+    mowers, all_moves = [], []
+    for _ in range(n_mowers):
+        x, y = rng.randint(0, grid_size[0]), rng.randint(0, grid_size[1])
+        mowers.append(Mower(Position(x, y), Orientation(rng.choice('NSWE')), grid_size))
+        all_moves.append(''.join(rng.choices('LRF', weights=(1, 1, 4),
+                                             k=rng.randint(0, max_moves))))
+    return mowers, all_moves
+
+
+def simulate_step_by_step(mowers, all_moves):
+    results = []
+    for mower, moves in zip(mowers, all_moves):
+        mower = Mower(Position(mower.x, mower.y), Orientation(mower.orientation),
+                      mower.grid_size)
+        for move in moves:
+            mower.step(move)
+        results.append(str(mower))
+    return results
+
+
+@pytest.mark.parametrize('grid_size', [(0, 0), (1, 3), (5, 5), (40, 20)])
+def test_simulate_batch_matches_step_by_step(grid_size, monkeypatch):
+    # Use small blocks, so that mowers get masked out in the middle of blocks and between them
+    monkeypatch.setattr(batch, 'BLOCK_SIZE', 7)
+
+    rng = random.Random(str(grid_size))
+    mowers, all_moves = make_mowers(rng, 50, grid_size, max_moves=60)
+    initial_states = list(map(str, mowers))
+
+    final_mowers = batch.simulate_batch(mowers, all_moves)
+
+    assert list(map(str, final_mowers)) == simulate_step_by_step(mowers, all_moves)
+    assert [mower.grid_size for mower in final_mowers] == [grid_size] * len(mowers)
+
+    # Check initial mowers are left untouched
+    assert list(map(str, mowers)) == initial_states
+
+
+def test_simulate_batch_sample_input():
+    mowers = [Mower(Position(1, 2), Orientation('N'), grid_size=(5, 5)),
+              Mower(Position(3, 3), Orientation('E'), grid_size=(5, 5))]
+    final_mowers = batch.simulate_batch(mowers, ['LFLFLFLFF', 'FFRFFRFRRF'])
+    assert list(map(str, final_mowers)) == ['1 3 N', '5 1 E']
+
+
+def test_simulate_batch_no_mower():
+    assert batch.simulate_batch([], []) == []
+
+
+def test_simulate_batch_mismatching_moves():
+    mowers = [Mower(Position(1, 2), Orientation('N'), grid_size=(5, 5))]
+    with pytest.raises(ValueError, match='Got 2 moves specifications for 1 mowers'):
+        batch.simulate_batch(mowers, ['F', 'L'])
+
+
+def test_simulate_batch_grid_too_large():
+    mowers = [Mower(Position(1, 2), Orientation('N'), grid_size=(5, 1 << 63))]
+    with pytest.raises(ValueError, match=r'Grid size \(5, 9223372036854775808\) too large for the '
+                                         r'batch engine'):
+        batch.simulate_batch(mowers, ['F'])
+
+
+def test_simulate_batch_largest_grid():
+    grid_size = (batch.MAX_COORDINATE, batch.MAX_COORDINATE)
+    mowers = [Mower(Position(*grid_size), Orientation('N'), grid_size=grid_size)]
+    final_mowers = batch.simulate_batch(mowers, ['FRF'])
+    assert str(final_mowers[0]) == f'{batch.MAX_COORDINATE} {batch.MAX_COORDINATE} E'
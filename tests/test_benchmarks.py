@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.skipif(not os.path.isdir(os.path.join(ROOT_DIR, 'benchmarks')),
+                    reason='benchmarks are not shipped')
+def test_benchmarks(tmpdir):
+    input_path = str(tmpdir.join('bench_input.txt'))
+    output_path = str(tmpdir.join('bench_results.json'))
+
+    subprocess.run([sys.executable, '-m', 'benchmarks.generate', input_path,
+                    '--grid-size', '5', '5', '--mowers', '3', '--moves', '20'],
+                   cwd=ROOT_DIR, check=True)
+    subprocess.run([sys.executable, '-m', 'benchmarks.run', input_path, '--output', output_path],
+                   cwd=ROOT_DIR, check=True)
+
+    with open(output_path) as f:
+        report = json.load(f)
+
+    assert report['modes']['rle'] == ['--engine', 'rle']
+    results = report['results'][input_path]
+    assert set(results) == set(report['modes'])
+    assert {'step', 'rle', 'lookup', 'stream', 'bulk', 'ranges', 'mmap'} <= set(results)
+
+    for stats in results.values():
+        assert stats['mowers'] == 3
+        assert stats['moves'] == 60
+        assert set(stats['phase_seconds']) == {'parse', 'simulate', 'output'}
+        assert stats['peak_rss_bytes'] > 0
+
+    # Every mode moves mowers the same way
+    assert len({stats['wall_hits'] for stats in results.values()} - {None}) == 1
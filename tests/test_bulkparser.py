@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from mower import bulkparser, parser
+
+
+def parse_with_text_parser(content):
+    stream = io.StringIO(content)
+    grid_size = parser.parse_grid_size(stream)
+    mowers_and_moves = parser.iter_mowers(stream, grid_size)
+    return grid_size, [(str(mower), moves) for mower, moves in mowers_and_moves]
+
+
+def parse_with_bulk_parser(content, block_size):
+    stream = io.BytesIO(content.encode())
+    grid_size, mowers_and_moves = bulkparser.parse_instructions(stream, block_size)
+    return grid_size, [(str(mower), moves) for mower, moves in mowers_and_moves]
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 7, 1 << 20])
+@pytest.mark.parametrize('content', [
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n', id='sample'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF', id='no_final_newline'),
+    pytest.param('  5 6 \r\n  1 2 N\r\n  LFLF  \r\n', id='surrounding_whitespace'),
+    pytest.param('5 6\n1 2 N\n', id='mower_without_moves'),
+    pytest.param('5 6\n1 2 N\n\n3 3 E\nFF\n', id='mower_with_empty_moves'),
+    pytest.param('5 6\n1 2 N\nFF\n\n3 3 E\nFF\n', id='stop_at_empty_mower_line'),
+    pytest.param('5 6\n1 2 N\nFF\n\n3 3 E\nFX\n', id='ignore_moves_after_empty_mower_line'),
+    pytest.param('5 6\n', id='no_mower'),
+    pytest.param('5 6\n7 2 N\nFF\n1 9 E\nFF\n', id='force_positions_inside_grid'),
+    pytest.param('5 6\n01 002 W\nFF\n', id='leading_zeros'),
+    pytest.param('5 6\n1 2 N\nFF\n+3 4 S\nLL\n', id='signed_position'),
+    pytest.param('5 6\n1 2 N\nFF\n3  4 S\nLL\n', id='invalid_mower_line_inner_spaces'),
+    pytest.param('5 5\n1 2 N\nFF\n1 2 X\nFF\n1 2 N\nFX\n', id='first_error_in_input_order'),
+    pytest.param('', id='invalid_empty_file'),
+    pytest.param('5\n', id='invalid_grid_size'),
+    pytest.param('5 5\n1 2 X\nFF\n', id='invalid_orientation'),
+    pytest.param('5 5\n1 -2 N\nFF\n', id='invalid_position'),
+    pytest.param('5 5\n1 2 N\nFFLXR\n', id='invalid_moves'),
+    pytest.param('5 5\n1 2 N\nFF LR\n', id='invalid_moves_inner_space')
+])
+def test_parse_instructions_matches_text_parser(content, block_size):
+    try:
+        expected = parse_with_text_parser(content)
+    except ValueError as e:
+        with pytest.raises(ValueError) as excinfo:
+            parse_with_bulk_parser(content, block_size)
+        assert str(excinfo.value) == str(e)
+    else:
+        assert parse_with_bulk_parser(content, block_size) == expected
+
+
+def test_parse_instructions_is_lazy():
+    stream = io.BytesIO(b'5 5\n1 2 N\nFF\n3 3 E\nFX\n')
+    grid_size, mowers_and_moves = bulkparser.parse_instructions(stream, block_size=4)
+    assert grid_size == (5, 5)
+
+    mower, moves = next(mowers_and_moves)
+    assert (str(mower), moves) == ('1 2 N', 'FF')
+
+    with pytest.raises(ValueError, match='Invalid moves: "FX"'):
+        next(mowers_and_moves)
@@ -0,0 +1,63 @@
+import pytest
+
+from mower.cache import ResultCache
+from mower.structs import Mower, Orientation, Position
+
+
+def make_mower(x=1, y=2, orientation='N', grid_size=(5, 5)):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+@pytest.mark.parametrize('other_mower, other_moves', [
+    pytest.param(make_mower(grid_size=(5, 6)), 'LFF', id='grid_size'),
+    pytest.param(make_mower(x=2), 'LFF', id='position'),
+    pytest.param(make_mower(orientation='S'), 'LFF', id='orientation'),
+    pytest.param(make_mower(), 'LFFF', id='moves')
+])
+def test_key(other_mower, other_moves):
+    key = ResultCache.key(make_mower(), 'LFF')
+    assert key == ResultCache.key(make_mower(), 'LFF')
+    assert key != ResultCache.key(other_mower, other_moves)
+
+
+def test_restore_and_store(tmp_path):
+    path = str(tmp_path / 'cache.db')
+
+    with ResultCache(path) as cache:
+        mower = make_mower()
+        key = cache.key(mower, 'LFF')
+
+        assert not cache.restore(key, mower)
+        mower.x, mower.y, mower.orientation_index = 2 ** 60, 3, 1
+        cache.store(key, mower)
+
+    # Reopen cache
+    with ResultCache(path) as cache:
+        mower = make_mower()
+        assert cache.restore(key, mower)
+        assert (mower.x, mower.y, mower.orientation) == (2 ** 60, 3, 'E')
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_lru_eviction(tmp_path):
+    mowers = [make_mower(x=x) for x in range(4)]
+    keys = [ResultCache.key(mower, '') for mower in mowers]
+
+    with ResultCache(str(tmp_path / 'cache.db'), max_entries=2) as cache:
+        cache.store(keys[0], mowers[0])
+        cache.store(keys[1], mowers[1])
+
+        # Use first entry: second one becomes the least recently used
+        assert cache.restore(keys[0], make_mower())
+
+        cache.store(keys[2], mowers[2])
+
+        assert cache.restore(keys[0], make_mower())
+        assert not cache.restore(keys[1], make_mower())
+        assert cache.restore(keys[2], make_mower())
+        assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_invalid_size(tmp_path):
+    with pytest.raises(ValueError, match='Invalid cache size'):
+        ResultCache(str(tmp_path / 'cache.db'), max_entries=0)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+
+import pytest
+
+from mower.checkpoint import Checkpoint, checkpoint_path
+from mower.engines import step_engine
+from mower.structs import Mower, Orientation, Position
+
+
+def make_mower(x=1, y=2, orientation='N', grid_size=(5, 5)):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+def run(path, moves, mower_factory=make_mower, grid_size=(5, 5)):
+    """
+    Move a mower with checkpointing, and return its final state, along with the number of skipped
+    moves.
+    """
+    with Checkpoint(path, grid_size) as checkpoint:
+        mower = mower_factory()
+        initial = str(mower)
+        offset = checkpoint.resume(0, mower, moves)
+        step_engine(mower, moves[offset:])
+        checkpoint.update(initial, mower, moves)
+    return str(mower), offset
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    assert run(path, 'LFLF') == ('0 1 S', 0)
+    return path
+
+
+def test_resume_appended_moves(path):
+    assert run(path, 'LFLFLFLFF') == ('1 3 N', 4)
+    assert run(path, 'LFLFLFLFFRF') == ('2 3 E', 9)
+
+
+def test_resume_same_moves(path):
+    assert run(path, 'LFLF') == ('0 1 S', 4)
+
+
+@pytest.mark.parametrize('moves, mower_factory, grid_size', [
+    pytest.param('FFLFLFLFF', make_mower, (5, 5), id='changed_prefix'),
+    pytest.param('LFL', make_mower, (5, 5), id='truncated_moves'),
+    pytest.param('LFLFLFLFF', lambda: make_mower(x=2), (5, 5), id='changed_initial_state'),
+    pytest.param('LFLFLFLFF', lambda: make_mower(grid_size=(5, 6)), (5, 6),
+                 id='changed_grid_size')
+])
+def test_invalidate(path, moves, mower_factory, grid_size):
+    mower = mower_factory()
+    expected = make_mower(mower.x, mower.y, mower.orientation, mower.grid_size)
+    step_engine(expected, moves)
+
+    assert run(path, moves, mower_factory, grid_size) == (str(expected), 0)
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param('{"version": 1, "grid', id='corrupted'),
+    pytest.param('[]', id='not_an_object'),
+    pytest.param('{"version": 0, "grid_size": [5, 5], "mowers": []}', id='other_version'),
+    pytest.param('{"version": 1, "grid_size": [5, 5]}', id='missing_mowers'),
+    pytest.param('{"version": 1, "grid_size": [5, 5], "mowers": {}}', id='mowers_not_a_list')
+])
+def test_invalid_checkpoint_file(tmp_path, content):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text(content)
+    assert run(str(path), 'LFLF') == ('0 1 S', 0)
+
+
+VALID_ENTRY = {'initial': '1 2 N', 'offset': 4, 'hash': hashlib.sha256(b'LFLF').hexdigest(),
+               'state': [0, 1, 2]}
+
+
+@pytest.mark.parametrize('entry', [
+    pytest.param([], id='not_an_object'),
+    pytest.param({**VALID_ENTRY, 'state': None}, id='missing_state'),
+    pytest.param({**VALID_ENTRY, 'offset': '4'}, id='offset_not_an_int'),
+    pytest.param({**VALID_ENTRY, 'offset': -1}, id='negative_offset'),
+    pytest.param({**VALID_ENTRY, 'hash': 4}, id='hash_not_a_string'),
+    pytest.param({**VALID_ENTRY, 'state': [0, 1]}, id='state_too_short'),
+    pytest.param({**VALID_ENTRY, 'state': [0, 1, True]}, id='state_not_ints'),
+    pytest.param({**VALID_ENTRY, 'state': [0, 6, 2]}, id='state_outside_grid'),
+    pytest.param({**VALID_ENTRY, 'state': [0, 1, 4]}, id='invalid_orientation')
+])
+def test_invalid_checkpoint_entry(tmp_path, entry):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text(json.dumps({'version': 1, 'grid_size': [5, 5], 'mowers': [VALID_ENTRY, entry]}))
+
+    with Checkpoint(str(path), (5, 5)) as checkpoint:
+        assert checkpoint.resume(0, make_mower(), 'LFLF') == 4
+        assert checkpoint.resume(1, make_mower(), 'LFLF') == 0
+        assert (checkpoint.resumed, checkpoint.invalidated) == (1, 1)
+
+
+def test_keep_checkpoint_on_failure(path):
+    with pytest.raises(RuntimeError):
+        with Checkpoint(path, (5, 5)) as checkpoint:
+            checkpoint.update('1 2 N', make_mower(), '')
+            raise RuntimeError
+
+    assert run(path, 'LFLF') == ('0 1 S', 4)
+
+
+def test_counters(path):
+    with Checkpoint(path, (5, 5)) as checkpoint:
+        assert checkpoint.resume(0, make_mower(), 'LFLFF') == 4
+        assert checkpoint.resume(0, make_mower(), 'FFFFF') == 0
+        assert checkpoint.resume(1, make_mower(), 'LFLFF') == 0
+        assert (checkpoint.resumed, checkpoint.invalidated) == (1, 1)
+
+
+def test_checkpoint_path():
+    assert checkpoint_path('lawn/input.txt') == 'lawn/input.txt.checkpoint'
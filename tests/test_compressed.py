@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from mower.compressed import execute_program, program_length
+from mower.engines import step_engine
+from mower.parser import Repeat, _parse_compressed_moves_line
+from mower.structs import Mower, Orientation, Position
+
+
+def expand(program):
+    return ''.join(expand(item.body) * item.count if isinstance(item, Repeat) else item
+                   for item in program)
+
+
+def make_mower(x, y, orientation, grid_size):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+def random_compressed_moves(rng, depth):
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        if depth and rng.random() < 0.5:
+            parts.append(f'({random_compressed_moves(rng, depth - 1)})*{rng.randint(0, 12)}')
+        else:
+            parts.append(''.join(rng.choice('FFFLR') for _ in range(rng.randint(0, 6))))
+    return ''.join(parts)
+
+
+@pytest.mark.parametrize('line, expected', [
+    pytest.param('', 0, id='empty'),
+    pytest.param('FFL', 3, id='plain_moves'),
+    pytest.param('F(FFRFFL)*3R', 20, id='block'),
+    pytest.param('((F)*2L)*10', 30, id='nested_blocks'),
+    pytest.param('(F)*1000000000000', 10 ** 12, id='huge_count')
+])
+def test_program_length(line, expected):
+    assert program_length(_parse_compressed_moves_line(line)) == expected
+
+
+@pytest.mark.parametrize('x, y, orientation, grid_size, line', [
+    pytest.param(1, 2, 'N', (5, 5), '(LF)*4F', id='sample'),
+    pytest.param(0, 0, 'N', (5, 5), '(FFRFFL)*100', id='settle_in_corner'),
+    pytest.param(0, 0, 'N', (100, 2), '(FFRFFL)*100', id='slide_along_wall'),
+    pytest.param(0, 0, 'N', (100, 100), '(FFRFFL)*10', id='translation_inside_grid'),
+    pytest.param(2, 2, 'E', (5, 5), '(FFR)*103', id='rotation_cycle'),
+    pytest.param(1, 1, 'N', (3, 3), '(FR)*7', id='rotation_cycle_inside_grid'),
+    pytest.param(0, 0, 'N', (30, 30), '((FFRFFL)*3RFFFL)*50', id='nested_blocks'),
+    pytest.param(0, 0, 'S', (3, 3), '(F)*10', id='against_wall')
+])
+def test_execute_program_matches_expansion(x, y, orientation, grid_size, line):
+    program = _parse_compressed_moves_line(line)
+
+    mower = make_mower(x, y, orientation, grid_size)
+    wall_hits = execute_program(mower, program)
+
+    expected_mower = make_mower(x, y, orientation, grid_size)
+    expected_wall_hits = step_engine(expected_mower, expand(program))
+
+    assert (str(mower), wall_hits) == (str(expected_mower), expected_wall_hits)
+
+
+def test_execute_program_matches_expansion_random():
+    rng = random.Random(0)
+
+    for _ in range(300):
+        program = _parse_compressed_moves_line(random_compressed_moves(rng, depth=3))
+        grid_size = rng.randint(0, rng.choice([3, 30])), rng.randint(0, rng.choice([3, 30]))
+        x, y = rng.randint(0, grid_size[0]), rng.randint(0, grid_size[1])
+        orientation = rng.choice('NESW')
+
+        mower = make_mower(x, y, orientation, grid_size)
+        expected_mower = make_mower(x, y, orientation, grid_size)
+
+        wall_hits = execute_program(mower, program)
+        expected_wall_hits = step_engine(expected_mower, expand(program))
+
+        assert (str(mower), wall_hits) == (str(expected_mower), expected_wall_hits)
+
+
+@pytest.mark.parametrize('x, y, grid_size, line, expected', [
+    pytest.param(0, 0, (5, 5), '(FFRFFL)*1000000000000', ('5 5 N', 4 * 10 ** 12 - 10), id='corner'),
+    pytest.param(0, 0, (10 ** 12, 10 ** 12), '(FFRFFL)*100000000000',
+                 ('200000000000 200000000000 N', 0), id='translation'),
+    pytest.param(0, 0, (10 ** 12, 3), '(FFRFFL)*100000000000',
+                 ('200000000000 3 N', 2 * 10 ** 11 - 3), id='slide_along_wall')
+])
+def test_execute_program_fast_forward(x, y, grid_size, line, expected):
+    mower = make_mower(x, y, 'N', grid_size)
+    wall_hits = execute_program(mower, _parse_compressed_moves_line(line))
+    assert (str(mower), wall_hits) == expected
@@ -0,0 +1,186 @@
+import io
+import random
+
+import pytest
+
+from mower.coverage import (MAX_MAP_CELLS, Coverage, DenseCoverage, SparseCoverage,
+                            check_map_size, make_coverage)
+from mower.structs import Mower, Orientation, Position
+
+GRID_SIZE = (6, 9)
+
+COVERAGES = [
+    pytest.param(DenseCoverage, id='dense'),
+    pytest.param(SparseCoverage, id='sparse')
+]
+
+
+def make_mower(x, y, orientation, grid_size=GRID_SIZE):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+def visited_cells(mower, moves):
+    """
+    Cells visited by mower, applying moves one at a time.
+    """
+    cells = {(mower.x, mower.y)}
+    for move in moves:
+        mower.step(move)
+        cells.add((mower.x, mower.y))
+    return cells
+
+
+def write_pbm(coverage):
+    stream = io.BytesIO()
+    coverage.write_pbm(stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('coverage_class', COVERAGES)
+@pytest.mark.parametrize('grid_size', [
+    pytest.param((6, 9), id='small_grid'),
+    pytest.param((16, 2), id='wide_grid'),
+    pytest.param((0, 3), id='single_column'),
+])
+def test_move_random(coverage_class, grid_size):
+    rng = random.Random(0)
+    max_x, max_y = grid_size
+
+    coverage = coverage_class(grid_size)
+    expected_cells = set()
+
+    for _ in range(50):
+        initial = (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'))
+        moves = ''.join(rng.choice('LRFFF') for _ in range(rng.randint(0, 30)))
+
+        mower = make_mower(*initial, grid_size=grid_size)
+        expected = make_mower(*initial, grid_size=grid_size)
+        expected_wall_hits = sum(expected.step(move) for move in moves)
+        assert coverage.move(mower, moves) == expected_wall_hits
+        assert str(mower) == str(expected)
+
+        expected_cells |= visited_cells(make_mower(*initial, grid_size=grid_size), moves)
+
+        assert coverage.n_covered == len(expected_cells)
+        assert {(x, y) for x in range(max_x + 1) for y in range(max_y + 1)
+                if coverage.is_covered(x, y)} == expected_cells
+
+
+@pytest.mark.parametrize('coverage_class', COVERAGES)
+def test_sample(coverage_class):
+    coverage = coverage_class((5, 5))
+    coverage.move(make_mower(1, 2, 'N', (5, 5)), 'LFLFLFLFF')
+    coverage.move(make_mower(3, 3, 'E', (5, 5)), 'FFRFFRFRRF')
+
+    assert coverage.n_cells == 36
+    assert coverage.n_covered == 11
+    assert coverage.ratio == pytest.approx(11 / 36)
+    assert str(coverage) == 'mowed: 11 of 36 cells (30.6%)'
+
+    # Rows from north to south: x = 1 and 3 to 5 mowed at y = 3, 8 bits per row
+    assert write_pbm(coverage) == b'P4\n6 6\n' + bytes([0b00000000, 0b00000000, 0b01011100,
+                                                        0b11000100, 0b11001100, 0b00000000])
+
+
+@pytest.mark.parametrize('coverage_class', COVERAGES)
+def test_empty(coverage_class):
+    coverage = coverage_class(GRID_SIZE)
+    assert coverage.n_covered == 0
+    assert str(coverage) == 'mowed: 0 of 70 cells (0.0%)'
+    assert write_pbm(coverage) == b'P4\n7 10\n' + bytes(10)
+
+
+
+def test_coverage_is_abstract():
+    with pytest.raises(TypeError):
+        Coverage(GRID_SIZE)
+
+
+def test_write_pbm_matches():
+    rng = random.Random(0)
+    grid_size = (20, 5)
+    dense, sparse = DenseCoverage(grid_size), SparseCoverage(grid_size)
+
+    for _ in range(10):
+        initial = (rng.randint(0, 20), rng.randint(0, 5), rng.choice('NESW'))
+        moves = ''.join(rng.choice('LRFFF') for _ in range(rng.randint(0, 30)))
+        dense.move(make_mower(*initial, grid_size=grid_size), moves)
+        sparse.move(make_mower(*initial, grid_size=grid_size), moves)
+
+    assert write_pbm(dense) == write_pbm(sparse)
+
+
+@pytest.mark.parametrize('runs, expected_n_covered', [
+    pytest.param([(0, 3), (5, 8)], 6, id='disjoint'),
+    pytest.param([(0, 3), (3, 8)], 8, id='touching'),
+    pytest.param([(0, 5), (3, 8)], 8, id='overlapping'),
+    pytest.param([(2, 4), (0, 8)], 8, id='covering'),
+    pytest.param([(0, 2), (4, 6), (8, 10), (1, 9)], 10, id='merging_many'),
+    pytest.param([(4, 6), (0, 2), (2, 4)], 6, id='filling_gap'),
+])
+def test_sparse_intervals(runs, expected_n_covered):
+    coverage = SparseCoverage((20, 0))
+    for start, end in runs:
+        mower = make_mower(start, 0, 'E', (20, 0))
+        coverage.move(mower, 'F' * (end - start - 1))
+
+    assert coverage.n_covered == expected_n_covered
+    assert coverage.n_covered == sum(coverage.is_covered(x, 0) for x in range(21))
+
+
+def test_sparse_huge_grid():
+    grid_size = (10 ** 9, 10 ** 9)
+    coverage = SparseCoverage(grid_size)
+    coverage.move(make_mower(0, 0, 'E', grid_size), 'F' * 1000 + 'L' + 'F' * 10)
+
+    assert coverage.n_covered == 1011
+    assert coverage.is_covered(1000, 10)
+    assert not coverage.is_covered(1001, 0)
+
+
+def test_sparse_crossing_runs():
+    grid_size = (10 ** 9, 10 ** 9)
+    coverage = SparseCoverage(grid_size)
+    coverage.move(make_mower(0, 5, 'E', grid_size), 'F' * 10)
+    coverage.move(make_mower(5, 0, 'N', grid_size), 'F' * 10)
+    coverage.move(make_mower(5, 10, 'S', grid_size), 'F' * 10)
+    coverage.move(make_mower(0, 5, 'E', grid_size), 'F' * 12)
+
+    assert coverage.n_covered == 11 + 10 + 2
+    assert coverage.is_covered(5, 5) and coverage.is_covered(5, 10) and coverage.is_covered(12, 5)
+    assert not coverage.is_covered(6, 6)
+
+
+def test_write_pbm_too_large():
+    coverage = SparseCoverage((10 ** 6, 10 ** 6))
+
+    stream = io.BytesIO()
+    with pytest.raises(ValueError, match='too large for a coverage map'):
+        coverage.write_pbm(stream)
+    assert stream.getvalue() == b''
+
+
+@pytest.mark.parametrize('grid_size, too_large', [
+    pytest.param((MAX_MAP_CELLS - 1, 0), False, id='largest'),
+    pytest.param((MAX_MAP_CELLS, 0), True, id='too_large'),
+    pytest.param((10 ** 6, 10 ** 6), True, id='huge_grid'),
+])
+def test_check_map_size(grid_size, too_large):
+    if too_large:
+        with pytest.raises(ValueError, match=r'Grid size .* too large for a coverage map'):
+            check_map_size(grid_size)
+    else:
+        check_map_size(grid_size)
+
+
+@pytest.mark.parametrize('grid_size, max_dense_cells, expected', [
+    pytest.param((6, 9), 70, DenseCoverage, id='dense'),
+    pytest.param((6, 9), 69, SparseCoverage, id='sparse'),
+    pytest.param((10 ** 6, 10 ** 6), None, SparseCoverage, id='huge_grid'),
+])
+def test_make_coverage(grid_size, max_dense_cells, expected):
+    if max_dense_cells is None:
+        coverage = make_coverage(grid_size)
+    else:
+        coverage = make_coverage(grid_size, max_dense_cells)
+    assert type(coverage) is expected
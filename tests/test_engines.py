@@ -0,0 +1,88 @@
+import itertools
+import random
+
+import pytest
+
+from mower import engines
+from mower.structs import Mower, Orientation, Position
+
+
+@pytest.mark.parametrize('moves, expected', [
+    pytest.param('', [], id='empty'),
+    pytest.param('FFF', [(0, 3)], id='forward_only'),
+    pytest.param('L', [(1, 0)], id='left_only'),
+    pytest.param('RRR', [(1, 0)], id='three_rights'),
+    pytest.param('LR', [(0, 0)], id='cancelling_turns'),
+    pytest.param('FFLFRRFFF', [(0, 2), (1, 1), (2, 3)], id='mixed'),
+    pytest.param('FFLL', [(0, 2), (2, 0)], id='trailing_turns')
+])
+def test_compile_runs(moves, expected):
+    assert list(engines.compile_runs(moves)) == expected
+    assert list(engines.compile_runs(moves.encode())) == expected
+    assert list(engines.compile_runs(memoryview(moves.encode()))) == expected
+
+
+def random_moves(rng, length, weights=(1, 1, 8)):
+    return ''.join(rng.choices('LRF', weights=weights, k=length))
+
+
+@pytest.mark.parametrize('engine', sorted(engines.ENGINES))
+@pytest.mark.parametrize('grid_size', [(0, 0), (1, 3), (5, 5), (40, 20)])
+def test_engine_matches_step_by_step(engine, grid_size):
+    rng = random.Random(f'{engine}{grid_size}')
+
+    for _ in range(20):
+        x, y = rng.randint(0, grid_size[0]), rng.randint(0, grid_size[1])
+        orientation = rng.choice('NSWE')
+        moves = random_moves(rng, rng.randint(0, 300))
+
+        expected = Mower(Position(x, y), Orientation(orientation), grid_size)
+        expected_wall_hits = 0
+        for move in moves:
+            expected_wall_hits += expected.step(move)
+
+        mower = Mower(Position(x, y), Orientation(orientation), grid_size)
+        wall_hits = engines.ENGINES[engine](mower, moves)
+
+        assert str(mower) == str(expected)
+        assert wall_hits == expected_wall_hits
+
+
+def test_sample_input():
+    mower = Mower(Position(1, 2), Orientation('N'), grid_size=(5, 5))
+    engines.run_length_engine(mower, 'LFLFLFLFF')
+    assert str(mower) == '1 3 N'
+
+    mower = Mower(Position(3, 3), Orientation('E'), grid_size=(5, 5))
+    engines.run_length_engine(mower, 'FFRFFRFRRF')
+    assert str(mower) == '5 1 E'
+
+
+@pytest.mark.parametrize('orientation_index, chunk, expected', [
+    pytest.param(0, 'FFFFFF', (0, 6, 0, 0, 0, 0, 6), id='N_straight'),
+    pytest.param(1, 'FRFFLL', (1, -2, 0, 0, 1, -2, 0), id='E_turning'),
+    pytest.param(3, 'FLFLFF', (1, -1, 1, -1, 1, -1, 0), id='W_u_turn'),
+    pytest.param(2, 'LRLRLR', (0, 0, 2, 0, 0, 0, 0), id='S_no_move')
+])
+def test_build_chunk_table(orientation_index, chunk, expected):
+    table = engines.build_chunk_table(6)
+    assert len(table) == 4
+    assert all(len(effects) == 3 ** 6 for effects in table)
+    assert table[orientation_index][chunk] == expected
+
+
+def test_chunk_codes():
+    chunks = [''.join(chunk) for chunk in itertools.product('LRF', repeat=engines.CHUNK_SIZE)]
+    codes = [engines.chunk_codes(chunk)[0] for chunk in chunks]
+    assert len(set(codes)) == len(chunks)
+
+    # Codes of all chunks at once match codes of each chunk, trailing moves left out
+    assert list(engines.chunk_codes(''.join(chunks[:100]) + 'LRF')) == codes[:100]
+    assert list(engines.chunk_codes('LRF')) == []
+
+
+def test_build_chunk_codes_table():
+    table = engines.build_chunk_codes_table()
+    chunk = 'FRFFLLFF'
+    assert table[1 << 16 | engines.chunk_codes(chunk)[0]] == \
+        engines.build_chunk_table(engines.CHUNK_SIZE)[1][chunk]
@@ -0,0 +1,79 @@
+import pytest
+
+from mower import files
+
+SAMPLE = '5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n'
+
+
+@pytest.fixture
+def instructions_dir(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.txt').write_text(SAMPLE)
+    (tmp_path / 'b.txt').write_text('5 5\n1 2 X\nFF\n')
+    (tmp_path / 'sub' / 'c.txt').write_text('3 3\n0 0 N\nFFFF\n')
+    return tmp_path
+
+
+@pytest.mark.parametrize('paths, expected', [
+    pytest.param(['a.txt'], False, id='single_file'),
+    pytest.param(['missing.txt'], False, id='single_missing_file'),
+    pytest.param(['a.txt', 'b.txt'], True, id='many_files'),
+    pytest.param(['.'], True, id='directory'),
+    pytest.param(['*.txt'], True, id='glob_pattern')
+])
+def test_is_multi_file(instructions_dir, monkeypatch, paths, expected):
+    monkeypatch.chdir(instructions_dir)
+    assert files.is_multi_file(paths) == expected
+
+
+@pytest.mark.parametrize('paths, expected', [
+    pytest.param(['b.txt', 'a.txt'], ['b.txt', 'a.txt'], id='files'),
+    pytest.param(['missing.txt'], ['missing.txt'], id='missing_file'),
+    pytest.param(['.'], ['./a.txt', './b.txt', './sub/c.txt'], id='directory'),
+    pytest.param(['*.txt'], ['a.txt', 'b.txt'], id='glob_pattern'),
+    pytest.param(['**/*.txt'], ['a.txt', 'b.txt', 'sub/c.txt'], id='recursive_glob_pattern'),
+    pytest.param(['*.csv'], [], id='glob_pattern_without_match'),
+    pytest.param(['sub', 'a.txt'], ['sub/c.txt', 'a.txt'], id='mixed')
+])
+def test_expand_paths(instructions_dir, monkeypatch, paths, expected):
+    monkeypatch.chdir(instructions_dir)
+    assert files.expand_paths(paths) == expected
+
+
+def test_simulate_file(instructions_dir):
+    path = str(instructions_dir / 'a.txt')
+    assert files.simulate_file(path, 'rle') == (path, ['1 3 N', '5 1 E'], 19, 0, None)
+
+
+def test_simulate_file_wall_hits(instructions_dir):
+    path = str(instructions_dir / 'sub' / 'c.txt')
+    assert files.simulate_file(path, 'step') == (path, ['0 3 N'], 4, 1, None)
+
+
+@pytest.mark.parametrize('name, expected_error', [
+    pytest.param('b.txt', 'Invalid initial position and orientation', id='malformed_file'),
+    pytest.param('missing.txt', 'No such file or directory', id='missing_file')
+])
+def test_simulate_file_error(instructions_dir, name, expected_error):
+    result = files.simulate_file(str(instructions_dir / name), 'rle')
+    assert result.results == []
+    assert expected_error in result.error
+
+
+@pytest.mark.parametrize('jobs', [
+    pytest.param(1, id='in_process'),
+    pytest.param(2, id='process_pool')
+])
+def test_simulate_files(instructions_dir, monkeypatch, jobs):
+    monkeypatch.setattr(files, 'FILES_PER_CHUNK', 2)
+
+    paths = [str(instructions_dir / name) for name in ['a.txt', 'b.txt', 'sub/c.txt']] * 3
+    results = list(files.simulate_files(paths, 'rle', jobs))
+
+    assert [result.path for result in results] == paths
+    assert [result.results for result in results] == [['1 3 N', '5 1 E'], [], ['0 3 N']] * 3
+    assert [result.error is None for result in results] == [True, False, True] * 3
+
+
+def test_output_path():
+    assert files.output_path('out', 'in/sub/a.txt') == 'out/a.txt.out'
@@ -0,0 +1,154 @@
+import random
+
+import pytest
+
+from mower.engines import ENGINES
+from mower.fleet import MowerFleet, MowerView
+from mower.structs import Mower, Orientation, Position
+
+GRID_SIZE = (6, 9)
+
+
+def make_mower(x, y, orientation):
+    return Mower(Position(x, y), Orientation(orientation), GRID_SIZE)
+
+
+def random_mowers(n_mowers, seed=0):
+    rng = random.Random(seed)
+    return [(make_mower(rng.randint(0, GRID_SIZE[0]), rng.randint(0, GRID_SIZE[1]),
+                        rng.choice('NESW')),
+             ''.join(rng.choice('LRF') for _ in range(rng.randint(0, 40))))
+            for _ in range(n_mowers)]
+
+
+@pytest.fixture
+def fleet():
+    return MowerFleet.from_mowers(GRID_SIZE, [(make_mower(1, 2, 'N'), 'LFLFLFLFF'),
+                                              (make_mower(3, 3, 'E'), ''),
+                                              (make_mower(6, 9, 'W'), 'FFRFFRFRRF')])
+
+
+def test_from_mowers(fleet):
+    assert len(fleet) == 3
+    assert list(map(str, fleet)) == ['1 2 N', '3 3 E', '6 9 W']
+    assert list(fleet.moves) == ['LFLFLFLFF', '', 'FFRFFRFRRF']
+    assert len(fleet.moves) == 3
+
+
+def test_empty():
+    fleet = MowerFleet(GRID_SIZE)
+    assert len(fleet) == 0
+    assert list(fleet) == []
+    assert list(fleet.moves) == []
+
+
+def test_append_copies_mower(fleet):
+    mower = make_mower(0, 0, 'S')
+    fleet.append(mower, 'RF')
+    mower.step('F')
+
+    assert str(fleet[-1]) == '0 0 S'
+    assert fleet.moves[-1] == 'RF'
+
+
+def test_extend(fleet):
+    other = MowerFleet.from_mowers(GRID_SIZE, [(make_mower(0, 0, 'S'), 'RF'),
+                                               (make_mower(2, 2, 'E'), '')])
+    fleet.extend(other)
+    fleet.extend(MowerFleet(GRID_SIZE))
+
+    assert list(map(str, fleet)) == ['1 2 N', '3 3 E', '6 9 W', '0 0 S', '2 2 E']
+    assert list(fleet.moves) == ['LFLFLFLFF', '', 'FFRFFRFRRF', 'RF', '']
+
+
+def test_iteration_writes_back(fleet):
+    for mower in fleet:
+        mower.step('L')
+    assert list(map(str, fleet)) == ['1 2 W', '3 3 N', '6 9 S']
+
+
+def test_interrupted_iteration_writes_back(fleet):
+    for mower in fleet:
+        mower.step('R')
+        break
+    assert list(map(str, fleet)) == ['1 2 E', '3 3 E', '6 9 W']
+
+
+@pytest.mark.parametrize('engine_name', sorted(ENGINES))
+def test_engines(engine_name):
+    mowers_and_moves = random_mowers(50)
+    fleet = MowerFleet.from_mowers(GRID_SIZE, mowers_and_moves)
+
+    for mower, moves in zip(fleet, fleet.moves):
+        ENGINES[engine_name](mower, moves)
+
+    for mower, moves in mowers_and_moves:
+        ENGINES['step'](mower, moves)
+    assert list(map(str, fleet)) == [str(mower) for mower, _ in mowers_and_moves]
+
+
+def test_view(fleet):
+    view = fleet[0]
+    assert isinstance(view, MowerView)
+    assert view.grid_size == GRID_SIZE
+
+    view.step('L')
+    view.step('F')
+    assert str(view) == '0 2 W'
+    assert str(fleet.load(0)) == '0 2 W'
+
+    # Moves of view are blocked by the edge of the grid
+    assert view.step('F') == 1
+    assert str(fleet[0]) == '0 2 W'
+
+
+def test_store(fleet):
+    fleet.store(1, make_mower(5, 4, 'S'))
+    assert str(fleet[1]) == '5 4 S'
+
+
+@pytest.mark.parametrize('i, expected', [
+    pytest.param(0, '1 2 N', id='first'),
+    pytest.param(2, '6 9 W', id='last'),
+    pytest.param(-1, '6 9 W', id='negative'),
+    pytest.param(-3, '1 2 N', id='negative_first')
+])
+def test_getitem(fleet, i, expected):
+    assert str(fleet[i]) == expected
+
+
+@pytest.mark.parametrize('i', [
+    pytest.param(3, id='too_large'),
+    pytest.param(-4, id='too_small')
+])
+def test_getitem_out_of_range(fleet, i):
+    with pytest.raises(IndexError, match='Mower index out of range'):
+        fleet[i]
+    with pytest.raises(IndexError, match='Mower index out of range'):
+        fleet.moves[i]
+
+
+def test_getitem_invalid_type(fleet):
+    with pytest.raises(TypeError):
+        fleet['0']
+
+
+def test_batch(fleet):
+    pytest.importorskip('numpy')
+    from mower.batch import simulate_batch
+
+    mowers = simulate_batch(fleet, fleet.moves)
+    assert list(map(str, mowers)) == ['1 3 N', '3 3 E', '4 9 W']
+    assert list(map(str, fleet)) == ['1 2 N', '3 3 E', '6 9 W']
+
+
+def test_big_grid():
+    grid_size = (99999999999999999999, 5)
+    mower = Mower(Position(99999999999999999998, 0), Orientation('N'), grid_size)
+    fleet = MowerFleet.from_mowers(grid_size, [(mower, 'RF')])
+    fleet.extend(MowerFleet.from_mowers(grid_size, [(mower, 'FF')]))
+
+    for mower, moves in zip(fleet, fleet.moves):
+        ENGINES['rle'](mower, moves)
+
+    assert list(map(str, fleet)) == ['99999999999999999999 0 E', '99999999999999999998 2 N']
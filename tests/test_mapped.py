@@ -0,0 +1,76 @@
+import io
+
+import pytest
+
+from mower import parser
+from mower.engines import run_length_engine
+from mower.mapped import map_instructions
+
+
+def parse_with_text_parser(content):
+    stream = io.StringIO(content)
+    grid_size = parser.parse_grid_size(stream)
+    mowers_and_moves = parser.iter_mowers(stream, grid_size)
+    return grid_size, [(str(mower), moves) for mower, moves in mowers_and_moves]
+
+
+def parse_with_mapped_parser(path):
+    with map_instructions(path) as (grid_size, mowers_and_moves):
+        results = []
+        for mower, moves in mowers_and_moves:
+            assert isinstance(moves, memoryview)
+            results.append((str(mower), moves.tobytes().decode()))
+        return grid_size, results
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n', id='sample'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF', id='no_final_newline'),
+    pytest.param('  5 6 \r\n  1 2 N\r\n  LFLF  \r\n', id='surrounding_whitespace'),
+    pytest.param('5 6\n1 2 N\n', id='mower_without_moves'),
+    pytest.param('5 6\n1 2 N\n\n3 3 E\nFF\n', id='mower_with_empty_moves'),
+    pytest.param('5 6\n1 2 N\nFF\n\n3 3 E\nFF\n', id='stop_at_empty_mower_line'),
+    pytest.param('5 6\n', id='no_mower'),
+    pytest.param('', id='invalid_empty_file'),
+    pytest.param('5\n', id='invalid_grid_size'),
+    pytest.param('5 5\n1 2 X\nFF\n', id='invalid_orientation'),
+    pytest.param('5 5\n1 2 N\nFFLXR\n', id='invalid_moves')
+])
+def test_map_instructions_matches_text_parser(tmp_path, content):
+    path = tmp_path / 'input.txt'
+    path.write_text(content)
+
+    try:
+        expected = parse_with_text_parser(content)
+    except ValueError as e:
+        with pytest.raises(ValueError) as excinfo:
+            parse_with_mapped_parser(str(path))
+        assert str(excinfo.value) == str(e)
+    else:
+        assert parse_with_mapped_parser(str(path)) == expected
+
+
+def test_map_instructions_simulate(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n')
+
+    with map_instructions(str(path)) as (grid_size, mowers_and_moves):
+        results = []
+        for mower, moves in mowers_and_moves:
+            run_length_engine(mower, moves)
+            results.append(str(mower))
+
+    assert results == ['1 3 N', '5 1 E']
+
+
+def test_map_instructions_early_exit(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n')
+
+    with map_instructions(str(path)) as (grid_size, mowers_and_moves):
+        for mower, moves in mowers_and_moves:
+            break
+
+    # Moves slice was released along with the mapped file
+    with pytest.raises(ValueError):
+        moves.tobytes()
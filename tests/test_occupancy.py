@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from mower.occupancy import OccupancyIndex
+from mower.structs import DELTAS, Mower, Orientation, Position
+
+GRID_SIZE = (6, 9)
+
+
+def make_mower(x, y, orientation, grid_size=GRID_SIZE):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+def reference_move(mower, moves, occupied):
+    """
+    Apply moves one at a time, blocking forward moves across the edge or into occupied cells.
+    """
+    blocked = 0
+    for move in moves:
+        if move == 'F':
+            dx, dy = DELTAS[mower.orientation_index]
+            if (mower.x + dx, mower.y + dy) in occupied:
+                blocked += 1
+                continue
+        blocked += mower.step(move)
+    return blocked
+
+
+def test_park():
+    occupancy = OccupancyIndex(GRID_SIZE)
+    occupancy.park(make_mower(2, 3, 'N'))
+    occupancy.park(make_mower(6, 9, 'N'))
+
+    assert occupancy.is_occupied(2, 3)
+    assert occupancy.is_occupied(6, 9)
+    assert not occupancy.is_occupied(3, 2)
+    assert not occupancy.is_occupied(2, 4)
+
+
+@pytest.mark.parametrize('parked, mower, moves, expected, expected_blocked, expected_collisions', [
+    pytest.param([], (1, 0, 'N'), 'FFFFFFFFFFF', '1 9 N', 2, 0, id='no_parked_mower'),
+    pytest.param([(1, 3)], (1, 0, 'N'), 'FFFFFF', '1 2 N', 4, 4, id='blocked'),
+    pytest.param([(1, 3)], (1, 0, 'N'), 'FFFFRFF', '3 2 E', 2, 2, id='blocked_then_turn'),
+    pytest.param([(1, 9)], (1, 0, 'N'), 'FFFFFFFFFFFF', '1 8 N', 4, 4, id='blocked_before_edge'),
+    pytest.param([(4, 0)], (1, 0, 'E'), 'FFFFFF', '3 0 E', 4, 4, id='blocked_east'),
+    pytest.param([(0, 0)], (3, 0, 'W'), 'FFFFFF', '1 0 W', 4, 4, id='blocked_west'),
+    pytest.param([(1, 1)], (1, 4, 'S'), 'FFFFF', '1 2 S', 3, 3, id='blocked_south'),
+    pytest.param([(0, 1)], (1, 0, 'N'), 'FFFF', '1 4 N', 0, 0, id='parked_elsewhere'),
+    pytest.param([(1, 0)], (1, 0, 'N'), 'FF', '1 2 N', 0, 0, id='starting_on_parked_mower'),
+])
+def test_move(parked, mower, moves, expected, expected_blocked, expected_collisions):
+    occupancy = OccupancyIndex(GRID_SIZE)
+    for x, y in parked:
+        occupancy.park(make_mower(x, y, 'N'))
+
+    mower = make_mower(*mower)
+    assert occupancy.move(mower, moves) == expected_blocked
+    assert str(mower) == expected
+    assert occupancy.collisions == expected_collisions
+
+
+@pytest.mark.parametrize('grid_size', [
+    pytest.param((6, 9), id='small_grid'),
+    pytest.param((3, 0), id='single_row'),
+    pytest.param((0, 3), id='single_column'),
+])
+def test_move_random(grid_size):
+    rng = random.Random(0)
+    max_x, max_y = grid_size
+
+    occupancy = OccupancyIndex(grid_size)
+    occupied = set()
+
+    for _ in range(200):
+        initial = (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'))
+        moves = ''.join(rng.choice('LRFFF') for _ in range(rng.randint(0, 30)))
+
+        mower = make_mower(*initial, grid_size=grid_size)
+        expected = make_mower(*initial, grid_size=grid_size)
+        assert occupancy.move(mower, moves) == reference_move(expected, moves, occupied)
+        assert str(mower) == str(expected)
+
+        occupancy.park(mower)
+        occupied.add((mower.x, mower.y))
+
+
+def test_huge_grid():
+    grid_size = (10 ** 12, 10 ** 12)
+    occupancy = OccupancyIndex(grid_size)
+    occupancy.park(make_mower(10 ** 12, 5, 'N', grid_size))
+
+    mower = make_mower(10 ** 12, 0, 'N', grid_size)
+    assert occupancy.move(mower, 'FFFFFFFF') == 4
+    assert str(mower) == f'{10 ** 12} 4 N'
@@ -0,0 +1,117 @@
+import io
+
+import pytest
+
+from mower.fleet import MowerFleet
+from mower.output import MAGIC, RECORD, ResultWriter, read_binary
+from mower.structs import Mower, Orientation, Position
+
+GRID_SIZE = (5, 5)
+
+
+def make_mowers():
+    return [Mower(Position(1, 3), Orientation('N'), GRID_SIZE),
+            Mower(Position(5, 1), Orientation('E'), GRID_SIZE)]
+
+
+def write(mowers, output_format, **kwargs):
+    stream = io.BytesIO()
+    with ResultWriter(stream, output_format, **kwargs) as writer:
+        writer.write_all(mowers)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('output_format, expected', [
+    pytest.param('text', b'1 3 N\n5 1 E\n', id='text'),
+    pytest.param('jsonl', b'{"mower": 1, "x": 1, "y": 3, "orientation": "N"}\n'
+                          b'{"mower": 2, "x": 5, "y": 1, "orientation": "E"}\n', id='jsonl'),
+    pytest.param('csv', b'mower,x,y,orientation\n1,1,3,N\n2,5,1,E\n', id='csv'),
+    pytest.param('binary', MAGIC + RECORD.pack(1, 1, 3, 0) + RECORD.pack(2, 5, 1, 1), id='binary')
+])
+def test_formats(output_format, expected):
+    assert write(make_mowers(), output_format) == expected
+
+
+@pytest.mark.parametrize('output_format, expected', [
+    pytest.param('text', b'', id='text'),
+    pytest.param('csv', b'mower,x,y,orientation\n', id='csv'),
+    pytest.param('binary', MAGIC, id='binary')
+])
+def test_no_mower(output_format, expected):
+    assert write([], output_format) == expected
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize('fleet', [False, True], ids=['mowers', 'fleet'])
+def test_batches(batch_size, fleet):
+    mowers = [Mower(Position(i % 6, i // 6), Orientation('NESW'[i % 4]), GRID_SIZE)
+              for i in range(20)]
+    if fleet:
+        mowers = MowerFleet.from_mowers(GRID_SIZE, [(mower, '') for mower in mowers])
+
+    expected = ''.join(f'{i},{mower}\n'.replace(' ', ',') for i, mower in enumerate(mowers, 1))
+    assert write(mowers, 'csv', batch_size=batch_size).decode() == \
+        'mower,x,y,orientation\n' + expected
+
+
+def test_write_ids():
+    mowers = make_mowers()
+    stream = io.BytesIO()
+    with ResultWriter(stream, 'csv') as writer:
+        writer.write(mowers[0])
+        writer.write(mowers[1], 7)
+        writer.write(mowers[0])
+        writer.write_all(mowers)
+
+    assert stream.getvalue() == b'mower,x,y,orientation\n' \
+                                b'1,1,3,N\n7,5,1,E\n8,1,3,N\n9,1,3,N\n10,5,1,E\n'
+
+
+def test_buffered():
+    stream = io.BytesIO()
+    writer = ResultWriter(stream, 'text', batch_size=2)
+    mower, _ = make_mowers()
+
+    writer.write(mower)
+    assert stream.getvalue() == b''
+    writer.write(mower)
+    assert stream.getvalue() == b'1 3 N\n1 3 N\n'
+    writer.write(mower)
+    writer.flush()
+    assert stream.getvalue() == b'1 3 N\n1 3 N\n1 3 N\n'
+
+
+def test_interactive():
+    class Terminal(io.BytesIO):
+        def isatty(self):
+            return True
+
+    stream = Terminal()
+    writer = ResultWriter(stream, 'text')
+    writer.write(make_mowers()[0])
+    assert stream.getvalue() == b'1 3 N\n'
+
+
+def test_invalid_format():
+    with pytest.raises(ValueError, match='Invalid output format: "xml"; not one of'):
+        ResultWriter(io.BytesIO(), 'xml')
+
+
+def test_binary_too_large():
+    mower = Mower(Position(1 << 63, 1), Orientation('N'), (1 << 64, 5))
+    with pytest.raises(ValueError, match='Coordinates too large for binary output'):
+        write([mower], 'binary')
+
+
+def test_read_binary():
+    stream = io.BytesIO(write(make_mowers(), 'binary'))
+    assert list(read_binary(stream)) == [(1, 1, 3, 'N'), (2, 5, 1, 'E')]
+
+
+@pytest.mark.parametrize('content, expected', [
+    pytest.param(b'MOWTRACE', 'missing "MOWRESLT" header', id='missing_header'),
+    pytest.param(MAGIC + RECORD.pack(1, 1, 3, 0)[:-1], 'truncated record', id='truncated_record')
+])
+def test_read_binary_invalid(content, expected):
+    with pytest.raises(ValueError, match=expected):
+        list(read_binary(io.BytesIO(content)))
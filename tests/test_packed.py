@@ -0,0 +1,136 @@
+import io
+import random
+
+import pytest
+
+from mower import packed
+from mower.engines import step_engine
+from mower.packed import HEADER, MAGIC, RECORD, PackedMoves
+from mower.structs import Mower, Orientation, Position
+
+SAMPLE = '5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n'
+
+
+def make_mower(x, y, orientation, grid_size):
+    return Mower(Position(x, y), Orientation(orientation), grid_size)
+
+
+@pytest.mark.parametrize('moves, expected', [
+    pytest.param('', b'', id='empty'),
+    pytest.param('F', b'\x00', id='one_move'),
+    pytest.param('LRFL', bytes([0b01001001]), id='one_byte'),
+    pytest.param('RRRRL', bytes([0b10101010, 0b01]), id='partial_last_byte')
+])
+def test_pack_moves(moves, expected):
+    assert packed.pack_moves(moves) == expected
+    assert packed.unpack_moves(PackedMoves(expected, len(moves))) == moves
+
+
+def test_pack_moves_random():
+    rng = random.Random(0)
+    for length in range(50):
+        moves = ''.join(rng.choice('LRF') for _ in range(length))
+        data = packed.pack_moves(moves)
+        assert len(data) == -(-length // 4)
+        assert packed.unpack_moves(PackedMoves(data, length)) == moves
+
+
+def test_unpack_invalid_moves():
+    with pytest.raises(ValueError, match='Invalid packed moves'):
+        packed.unpack_moves(PackedMoves(b'\x03', 1))
+
+
+@pytest.mark.parametrize('grid_size', [(0, 0), (3, 3), (20, 20)])
+def test_packed_engine_matches_step_engine(grid_size):
+    rng = random.Random(0)
+
+    for _ in range(200):
+        moves = ''.join(rng.choice('LRF') for _ in range(rng.randint(0, 40)))
+        x, y = rng.randint(0, grid_size[0]), rng.randint(0, grid_size[1])
+        orientation = rng.choice('NESW')
+
+        mower = make_mower(x, y, orientation, grid_size)
+        wall_hits = packed.packed_engine(mower, PackedMoves(packed.pack_moves(moves), len(moves)))
+
+        expected_mower = make_mower(x, y, orientation, grid_size)
+        expected_wall_hits = step_engine(expected_mower, moves)
+
+        assert (str(mower), wall_hits) == (str(expected_mower), expected_wall_hits)
+
+
+def test_packed_engine_invalid_moves():
+    mower = make_mower(1, 2, 'N', (5, 5))
+    with pytest.raises(ValueError, match='Invalid packed moves'):
+        packed.packed_engine(mower, PackedMoves(b'\x00\xff', 8))
+
+
+def test_convert_round_trip(tmp_path):
+    text_path, packed_path, back_path = (str(tmp_path / name) for name in
+                                         ['input.txt', 'input.bin', 'back.txt'])
+    with open(text_path, 'w') as f:
+        f.write(SAMPLE)
+
+    packed.convert(text_path, packed_path)
+    assert packed.is_packed_file(packed_path)
+    assert not packed.is_packed_file(text_path)
+
+    with open(packed_path, 'rb') as f:
+        grid_size, mowers_and_moves = packed.read_packed(f)
+        results = []
+        for mower, packed_moves in mowers_and_moves:
+            packed.packed_engine(mower, packed_moves)
+            results.append(str(mower))
+
+    assert grid_size == (5, 5)
+    assert results == ['1 3 N', '5 1 E']
+
+    packed.convert(packed_path, back_path)
+    with open(back_path) as f:
+        assert f.read() == SAMPLE
+
+
+@pytest.mark.parametrize('grid_size', [
+    pytest.param((1 << 64, 5), id='x'),
+    pytest.param((5, 99999999999999999999), id='y')
+])
+def test_convert_grid_too_large(tmp_path, grid_size):
+    text_path, packed_path = str(tmp_path / 'input.txt'), str(tmp_path / 'input.bin')
+    with open(text_path, 'w') as f:
+        f.write('{} {}\n1 2 N\nLF\n'.format(*grid_size))
+
+    with pytest.raises(ValueError, match='too large for packed files'):
+        packed.convert(text_path, packed_path)
+    assert not (tmp_path / 'input.bin').exists()
+
+    with pytest.raises(ValueError, match='too large for packed files'):
+        packed.write_packed(io.BytesIO(), grid_size, [])
+
+
+def test_convert_largest_grid(tmp_path):
+    text_path, packed_path = str(tmp_path / 'input.txt'), str(tmp_path / 'input.bin')
+    with open(text_path, 'w') as f:
+        f.write(f'{packed.MAX_COORDINATE} 5\n{packed.MAX_COORDINATE} 2 N\nLF\n')
+
+    packed.convert(text_path, packed_path)
+    with open(packed_path, 'rb') as f:
+        grid_size, mowers_and_moves = packed.read_packed(f)
+        assert grid_size == (packed.MAX_COORDINATE, 5)
+        assert [str(mower) for mower, _ in mowers_and_moves] == [f'{packed.MAX_COORDINATE} 2 N']
+
+
+def test_is_packed_file_missing(tmp_path):
+    assert not packed.is_packed_file(str(tmp_path / 'missing.bin'))
+
+
+@pytest.mark.parametrize('content, expected', [
+    pytest.param(b'MOWPACK', ValueError('missing "MOWPACK1" header'), id='invalid_magic'),
+    pytest.param(MAGIC + b'\0' * 7, ValueError('truncated record'), id='truncated_header'),
+    pytest.param(MAGIC + HEADER.pack(5, 5) + RECORD.pack(1, 2, 0, 9) + b'\0',
+                 ValueError('truncated record'), id='truncated_moves'),
+    pytest.param(MAGIC + HEADER.pack(5, 5) + RECORD.pack(1, 2, 4, 0),
+                 ValueError('invalid orientation index 4'), id='invalid_orientation')
+])
+def test_read_invalid_packed(content, expected):
+    with pytest.raises(type(expected), match=str(expected)):
+        grid_size, mowers_and_moves = packed.read_packed(io.BytesIO(content))
+        list(mowers_and_moves)
@@ -0,0 +1,53 @@
+import pytest
+
+from mower import parallel
+
+SAMPLE_MOWER_LINES = [('1 2 N', 'LFLFLFLFF'), ('3 3 E', 'FFRFFRFRRF')]
+
+
+@pytest.mark.parametrize('max_mowers, max_moves, expected_sizes', [
+    pytest.param(100, 1000, [5], id='single_batch'),
+    pytest.param(2, 1000, [2, 2, 1], id='max_mowers'),
+    pytest.param(100, 4, [2, 2, 1], id='max_moves'),
+    pytest.param(1, 1, [1, 1, 1, 1, 1], id='one_mower_per_batch')
+])
+def test_iter_batches(max_mowers, max_moves, expected_sizes):
+    all_mower_lines = [('0 0 N', 'FF')] * 5
+    batches = list(parallel.iter_batches(all_mower_lines, max_mowers, max_moves))
+    assert list(map(len, batches)) == expected_sizes
+    assert sum(batches, []) == all_mower_lines
+
+
+def test_iter_batches_empty():
+    assert list(parallel.iter_batches([])) == []
+
+
+def test_simulate_batch_lines():
+    results = parallel.simulate_batch_lines(SAMPLE_MOWER_LINES, (5, 5), 'rle')
+    assert results == ['1 3 N', '5 1 E']
+
+
+def test_simulate_batch_lines_invalid():
+    with pytest.raises(ValueError, match='Invalid moves'):
+        parallel.simulate_batch_lines([('1 2 N', 'LFX')], (5, 5), 'rle')
+
+
+def test_simulate_batch_fleet():
+    fleet = parallel.simulate_batch_fleet(SAMPLE_MOWER_LINES, (5, 5), 'rle')
+    assert list(map(str, fleet)) == ['1 3 N', '5 1 E']
+    assert fleet.grid_size == (5, 5)
+
+
+def test_simulate_parallel(monkeypatch):
+    monkeypatch.setattr(parallel, 'BATCH_MAX_MOWERS', 3)
+
+    all_mower_lines = SAMPLE_MOWER_LINES * 10
+    results = parallel.simulate_parallel(all_mower_lines, (5, 5), 'step', jobs=2)
+    assert list(map(str, results)) == ['1 3 N', '5 1 E'] * 10
+
+
+def test_simulate_parallel_big_grid():
+    grid_size = (99999999999999999999, 5)
+    all_mower_lines = [('99999999999999999998 0 N', 'RF')]
+    results = parallel.simulate_parallel(all_mower_lines, grid_size, 'rle', jobs=2)
+    assert list(map(str, results)) == ['99999999999999999999 0 E']
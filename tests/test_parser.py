@@ -52,7 +52,7 @@ def test_parse_move(token, expected):
     pytest.param('1 2 3', ValueError('Invalid grid size'), id='invalid_three_values')
 ])
 def test_parse_grid_size_line(line, expected):
-    expect_value_or_exception('_parse_grid_size_line', line, expected=expected)
+    expect_value_or_exception('parse_grid_size_line', line, expected=expected)
 
 
 def assert_mower_position_and_orientation(mower, expected_attributes):
@@ -70,10 +70,10 @@ def test_parse_mower_line(line, expected):
     if isinstance(expected, Exception):
         # Expect an exception
         with pytest.raises(type(expected), match=str(expected)):
-            print(parser._parse_mower_line(line, grid_size=(100, 100)))
+            print(parser.parse_mower_line(line, grid_size=(100, 100)))
     else:
         # Expect a value
-        mower = parser._parse_mower_line(line, grid_size=(100, 100))
+        mower = parser.parse_mower_line(line, grid_size=(100, 100))
         assert_mower_position_and_orientation(mower, expected)
 
 
@@ -87,6 +87,25 @@ def test_parse_moves_line(line, expected):
     expect_value_or_exception('_parse_moves_line', line, expected=expected)
 
 
+@pytest.mark.parametrize('line, expected', [
+    pytest.param('', (), id='valid_empty_string'),
+    pytest.param('RFLLRF', ('RFLLRF',), id='valid_plain_moves'),
+    pytest.param('F(FFRFFL)*3R', ('F', parser.Repeat(('FFRFFL',), 3), 'R'), id='valid_block'),
+    pytest.param('(F)*0', (parser.Repeat(('F',), 0),), id='valid_zero_count'),
+    pytest.param('()*5', (parser.Repeat((), 5),), id='valid_empty_block'),
+    pytest.param('((F)*2L)*10', (parser.Repeat((parser.Repeat(('F',), 2), 'L'), 10),),
+                 id='valid_nested_blocks'),
+    pytest.param('FX', ValueError('Invalid moves'), id='invalid_move'),
+    pytest.param('(FF', ValueError('Invalid moves: .*; unclosed block'), id='invalid_unclosed'),
+    pytest.param('FF)*2', ValueError('Invalid moves'), id='invalid_unopened'),
+    pytest.param('(FF)', ValueError('Invalid moves'), id='invalid_missing_count'),
+    pytest.param('(FF)*-2', ValueError('Invalid moves'), id='invalid_negative_count'),
+    pytest.param('(FF) * 2', ValueError('Invalid moves'), id='invalid_inner_whitespace')
+])
+def test_parse_compressed_moves_line(line, expected):
+    expect_value_or_exception('_parse_compressed_moves_line', line, expected=expected)
+
+
 @pytest.mark.parametrize('under_test', ['grid_size', 'mower', 'moves'])
 def test_parse_two_mowers(under_test):
     sample_input = '''5 6
@@ -218,3 +237,84 @@ def test_parse_on_mower_without_moves(under_test):
     else:
         # Skip line
         stream.readline()
+
+
+def test_iter_mowers_compressed():
+    stream = io.StringIO('5 6\n1 2 N\n(LF)*4F\n3 3 E\nFF\n')
+    grid_size = parser.parse_grid_size(stream)
+
+    mowers_and_moves = parser.iter_mowers(stream, grid_size, compressed=True)
+    results = [(str(mower), moves) for mower, moves in mowers_and_moves]
+    assert results == [('1 2 N', (parser.Repeat(('LF',), 4), 'F')), ('3 3 E', ('FF',))]
+
+
+def test_iter_mowers():
+    sample_input = '''5 6
+    1 2 N
+    LFLFLFLFF
+    3 3 E
+
+    '''
+
+    stream = io.StringIO(sample_input)
+    grid_size = parser.parse_grid_size(stream)
+
+    mowers_and_moves = parser.iter_mowers(stream, grid_size)
+
+    mower, moves = next(mowers_and_moves)
+    assert str(mower) == '1 2 N'
+    assert moves == 'LFLFLFLFF'
+
+    mower, moves = next(mowers_and_moves)
+    assert str(mower) == '3 3 E'
+    assert moves == ''
+
+    with pytest.raises(StopIteration):
+        next(mowers_and_moves)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+@pytest.mark.parametrize('line, expected', [
+    pytest.param('\n', '', id='valid_empty_line'),
+    pytest.param('', '', id='valid_end_of_stream'),
+    pytest.param('RFLLRF\n', 'RFLLRF', id='valid_multiple_chars'),
+    pytest.param('    RFLLRF  \n', 'RFLLRF', id='valid_surrounding_whitespace'),
+    pytest.param('RFLLRF', 'RFLLRF', id='valid_no_newline'),
+    pytest.param('RFLXLRF\n', ValueError('Invalid moves: .* "X" at offset 3'), id='invalid_move'),
+    pytest.param('  RFL LRF\n', ValueError('Invalid moves: .* " " at offset 3'),
+                 id='invalid_inner_whitespace')
+])
+def test_iter_moves_chunks(chunk_size, line, expected):
+    next_line = '1 2 N\n' if line.endswith('\n') else ''
+    stream = io.StringIO(line + next_line)
+    chunks = parser.iter_moves_chunks(stream, chunk_size)
+
+    if isinstance(expected, Exception):
+        with pytest.raises(type(expected), match=str(expected)):
+            list(chunks)
+    else:
+        chunks = list(chunks)
+        assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+        assert ''.join(chunks) == expected
+
+        # Check the moves line, and only it, was consumed
+        assert stream.read() == next_line
+
+
+def test_iter_mower_lines():
+    stream = io.StringIO('  1 2 N\nLFX\n3 3 E\n')
+    assert list(parser.iter_mower_lines(stream)) == [('1 2 N', 'LFX'), ('3 3 E', '')]
+
+
+@pytest.mark.parametrize('mower_line, moves_line, expected', [
+    pytest.param('1 2 N', 'LFF', ('1 2 N', 'LFF'), id='valid'),
+    pytest.param('1 2', 'LFF', ValueError('Invalid initial position'), id='invalid_mower'),
+    pytest.param('1 2 N', 'LFX', ValueError('Invalid moves'), id='invalid_moves')
+])
+def test_parse_mower_lines(mower_line, moves_line, expected):
+    if isinstance(expected, Exception):
+        with pytest.raises(type(expected), match=str(expected)):
+            parser.parse_mower_lines(mower_line, moves_line, grid_size=(5, 5))
+    else:
+        mower, moves = parser.parse_mower_lines(mower_line, moves_line, grid_size=(5, 5))
+        assert (str(mower), moves) == expected
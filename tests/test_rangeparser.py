@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from mower.bulkparser import parse_instructions
+from mower.rangeparser import parse_instructions_parallel, split_ranges
+
+
+def random_instructions(n_mowers, seed=0):
+    rng = random.Random(seed)
+    lines = ['5 5']
+    for _ in range(n_mowers):
+        lines.append(f'{rng.randint(0, 5)} {rng.randint(0, 5)} {rng.choice("NESW")}')
+        lines.append(''.join(rng.choice('LRF') for _ in range(rng.randint(0, 12))))
+    return '\n'.join(lines) + '\n'
+
+
+def parse(tmp_path, content, jobs=1, min_range_size=1):
+    path = tmp_path / 'instructions.txt'
+    path.write_bytes(content.encode())
+    fleet = parse_instructions_parallel(str(path), jobs, min_range_size)
+    return fleet.grid_size, [(str(mower), moves) for mower, moves in zip(fleet, fleet.moves)]
+
+
+def parse_bulk(tmp_path, content):
+    path = tmp_path / 'bulk.txt'
+    path.write_bytes(content.encode())
+    with open(path, 'rb') as f:
+        grid_size, mowers_and_moves = parse_instructions(f)
+        return grid_size, [(str(mower), moves) for mower, moves in mowers_and_moves]
+
+
+@pytest.mark.parametrize('start, end, n_ranges, min_range_size, expected', [
+    pytest.param(4, 14, 2, 1, [(4, 9), (9, 14)], id='even'),
+    pytest.param(0, 10, 3, 1, [(0, 3), (3, 6), (6, 10)], id='uneven'),
+    pytest.param(0, 10, 3, 4, [(0, 5), (5, 10)], id='min_range_size'),
+    pytest.param(0, 10, 3, 100, [(0, 10)], id='single_range'),
+    pytest.param(5, 5, 3, 1, [(5, 5)], id='empty'),
+])
+def test_split_ranges(start, end, n_ranges, min_range_size, expected):
+    assert split_ranges(start, end, n_ranges, min_range_size) == expected
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param(random_instructions(50), id='random'),
+    pytest.param(random_instructions(50).replace('\n', '\r\n'), id='crlf'),
+    pytest.param(random_instructions(50).rstrip('\n'), id='no_trailing_newline'),
+    pytest.param('5 5\n', id='no_mower'),
+    pytest.param('5 5\n1 2 N', id='missing_moves_line'),
+    pytest.param('5 5\n1 2 N\n\n3 3 E\n\n0 0 S\nFF\n', id='empty_moves_lines'),
+    pytest.param('5 5\n1 2 N\nLF\n\n3 3 E\nFF\n', id='empty_initial_state_line'),
+    pytest.param('5 5\n1 2 N\nLF\n\nanything\n1 2 3 4\n', id='garbage_after_mowers'),
+])
+@pytest.mark.parametrize('min_range_size', [1, 3, 7, 1 << 20])
+def test_matches_bulk_parser(tmp_path, content, min_range_size):
+    assert parse(tmp_path, content, min_range_size=min_range_size) == parse_bulk(tmp_path, content)
+
+
+def test_jobs(tmp_path):
+    content = random_instructions(200)
+    assert parse(tmp_path, content, jobs=2, min_range_size=50) == parse_bulk(tmp_path, content)
+
+
+@pytest.mark.parametrize('content, expected', [
+    pytest.param('5\n1 2 N\nLF\n', 'Line 1: Invalid grid size: "5"', id='grid_size'),
+    pytest.param('5 5\n1 2 N\nLF\n3 3 X\nFF\n', 'Line 4: Invalid initial position and orientation: '
+                                                '"3 3 X"', id='initial_state'),
+    pytest.param('5 5\n1 2 N\nLF\n3 3 E\nFF\n0 0 N\nF F\n', 'Line 7: Invalid moves: "F F"',
+                 id='moves_with_space'),
+    pytest.param('5 5\n1 2 N\nLF\n33E\nFF\n', 'Line 4: Invalid initial position and '
+                                              'orientation: "33E"',
+                 id='initial_state_without_space'),
+    pytest.param(random_instructions(100) + '1 1 N\nFFX\n', 'Line 203: Invalid moves: "FFX"',
+                 id='last_mower'),
+])
+@pytest.mark.parametrize('min_range_size', [1, 3, 7, 1 << 20])
+def test_errors(tmp_path, content, expected, min_range_size):
+    with pytest.raises(ValueError, match=f'^{expected}$'):
+        parse(tmp_path, content, min_range_size=min_range_size)
+
+
+def test_first_error(tmp_path):
+    content = '5 5\n1 2 N\nLX\n' + random_instructions(100)[4:] + '1 1 N\nFFX\n'
+    with pytest.raises(ValueError, match='^Line 3: Invalid moves: "LX"$'):
+        parse(tmp_path, content, jobs=2, min_range_size=50)
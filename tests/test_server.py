@@ -0,0 +1,119 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from mower import parallel
+from mower.server import MowerServer, request
+
+SAMPLE_INPUT = b'5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n'
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        # Let connection handlers of server notice clients are gone
+        # asyncio.all_tasks is Python >= 3.7, Task.all_tasks was removed in Python 3.9
+        all_tasks = getattr(asyncio, 'all_tasks', None) or asyncio.Task.all_tasks
+        handlers = {task for task in all_tasks(loop) if not task.done()}
+        if handlers:
+            loop.run_until_complete(asyncio.wait(handlers))
+        loop.close()
+
+
+async def serve_and_request(payloads, tmp_path=None, process_pool=False, **kwargs):
+    """
+    Start a server, submit payloads in turn over a single connection, and return results or
+    errors.
+    """
+    executor = None if process_pool else ThreadPoolExecutor(2)
+    server = MowerServer(executor=executor, **kwargs)
+
+    if tmp_path:
+        path = str(tmp_path / 'mower.sock')
+        tcp_server = await server.start(path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        tcp_server = await server.start(host='127.0.0.1', port=0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    results = []
+    try:
+        for payload in payloads:
+            try:
+                results.append(await request(reader, writer, payload))
+            except ValueError as e:
+                results.append(e)
+    finally:
+        writer.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+        server.close()
+
+    return results
+
+
+def test_serve_tcp():
+    assert run(serve_and_request([SAMPLE_INPUT])) == [['1 3 N', '5 1 E']]
+
+
+def test_serve_unix(tmp_path):
+    assert run(serve_and_request([SAMPLE_INPUT], tmp_path)) == [['1 3 N', '5 1 E']]
+
+
+def test_serve_several_requests_and_batches(monkeypatch):
+    monkeypatch.setattr(parallel, 'BATCH_MAX_MOWERS', 1)
+    monkeypatch.setattr('mower.server.BATCH_MAX_MOWERS', 1)
+
+    payload = b'5 5\n' + b'1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n' * 10
+    results = run(serve_and_request([payload, SAMPLE_INPUT, b'5 5\n'], jobs=1))
+    assert results == [['1 3 N', '5 1 E'] * 10, ['1 3 N', '5 1 E'], []]
+
+
+def test_serve_invalid_payload():
+    results = run(serve_and_request([b'5 5\n1 2 N\nLFX\n', SAMPLE_INPUT]))
+
+    assert isinstance(results[0], ValueError)
+    assert 'Invalid moves' in str(results[0])
+
+    # Connection is still usable
+    assert results[1] == ['1 3 N', '5 1 E']
+
+
+def test_serve_request_too_large():
+    results = run(serve_and_request([SAMPLE_INPUT], max_request_size=10))
+
+    assert isinstance(results[0], ValueError)
+    assert 'Request too large' in str(results[0])
+
+
+async def send_header(header):
+    server = MowerServer(executor=ThreadPoolExecutor(1))
+    tcp_server = await server.start(host='127.0.0.1', port=0)
+    port = tcp_server.sockets[0].getsockname()[1]
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(header)
+    response = await reader.readline()
+
+    writer.close()
+    tcp_server.close()
+    await tcp_server.wait_closed()
+    server.close()
+
+    return response
+
+
+def test_serve_invalid_header():
+    assert run(send_header(b'HELLO\n')) == b'ERROR Invalid request header: "HELLO"\n'
+
+
+def test_serve_header_too_long():
+    assert run(send_header(b'SUBMIT ' + b'1' * (1 << 17) + b'\n')) == \
+        b'ERROR Request header too long\n'
+
+
+def test_serve_with_process_pool():
+    results = run(serve_and_request([SAMPLE_INPUT], process_pool=True, jobs=2))
+    assert results == [['1 3 N', '5 1 E']]
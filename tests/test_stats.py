@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+
+from mower.stats import NoStats, Stats, peak_rss_bytes
+
+
+def test_stats():
+    stats = Stats()
+
+    with stats.phase('parse'):
+        time.sleep(0.01)
+    with stats.phase('simulate'):
+        time.sleep(0.01)
+    with stats.phase('simulate'):
+        time.sleep(0.01)
+
+    stats.count(1, 100, 3)
+    stats.count(2, 200, 4)
+
+    assert stats.phase_seconds['parse'] >= 0.01
+    assert stats.phase_seconds['simulate'] >= 0.02
+    assert stats.phase_seconds['output'] == 0
+    assert (stats.mowers, stats.moves, stats.wall_hits) == (3, 300, 7)
+    assert stats.moves_per_second == pytest.approx(300 / stats.phase_seconds['simulate'])
+
+    report = str(stats)
+    assert 'mowers: 3' in report
+    assert 'hits: 7' in report
+
+
+def test_stats_unknown_wall_hits():
+    stats = Stats()
+    stats.count(1, 100, 3)
+    stats.count(1, 100)
+    stats.count(1, 100, 3)
+    assert stats.wall_hits is None
+    assert stats.moves_per_second is None
+    assert 'hits: n/a' in str(stats)
+    assert 'moves/s: n/a' in str(stats)
+
+
+def test_dump_stats(tmp_path):
+    stats = Stats()
+    stats.count(2, 20, 1)
+
+    path = tmp_path / 'stats.json'
+    stats.dump(str(path))
+
+    dumped = json.loads(path.read_text())
+    assert dumped['phase_seconds'] == {'parse': 0, 'simulate': 0, 'output': 0}
+    assert (dumped['mowers'], dumped['moves'], dumped['wall_hits']) == (2, 20, 1)
+    assert dumped['peak_rss_bytes'] > 0
+
+
+def test_no_stats():
+    stats = NoStats()
+
+    with stats.phase('parse'):
+        pass
+    stats.count(1, 100, 3)
+
+    assert stats.phase_seconds['parse'] == 0
+    assert (stats.mowers, stats.moves, stats.wall_hits) == (0, 0, 0)
+
+
+def test_peak_rss_bytes():
+    assert peak_rss_bytes() > 2 ** 20
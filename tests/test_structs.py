@@ -6,10 +6,21 @@ from mower.structs import Mower, Orientation, Position
 
 def test_init_position():
     position = Position(-7, 8)
-    assert position.cplx_position == complex(-7, 8)
     assert (position.x, position.y) == (-7, 8)
 
 
+def test_position_is_exact_for_large_ints():
+    position = Position(2 ** 60 + 1, 3 ** 40)
+    position.forward(Orientation('E'), grid_size=(2 ** 61, 3 ** 41))
+    assert (position.x, position.y) == (2 ** 60 + 2, 3 ** 40)
+
+
+@pytest.mark.parametrize('struct', [Position(1, 2), Orientation('N'),
+                                    Mower(Position(1, 2), Orientation('N'), (5, 5))])
+def test_structs_have_no_dict(struct):
+    assert not hasattr(struct, '__dict__')
+
+
 def test_str_position():
     assert str(Position(1, -2)) == '1 -2'
 
@@ -24,13 +35,25 @@ def test_forward_position(orientation, dst_position):
     position = Position(1, 2)
     orientation = Orientation(orientation)
 
-    with mock.patch.object(position, 'restrict_to_grid') as restrict_to_grid:
+    with mock.patch.object(Position, 'restrict_to_grid') as restrict_to_grid:
         position.forward(orientation, grid_size=(100, 100))
         restrict_to_grid.assert_called_once()
 
     assert (position.x, position.y) == dst_position
 
 
+@pytest.mark.parametrize('orientation, steps, dst_position', [
+    pytest.param('N', 3, (1, 5), id='N'),
+    pytest.param('S', 5, (1, 0), id='S_clamped'),
+    pytest.param('W', 0, (1, 2), id='W_zero'),
+    pytest.param('E', 100, (9, 2), id='E_clamped')
+])
+def test_forward_position_several_steps(orientation, steps, dst_position):
+    position = Position(1, 2)
+    position.forward(Orientation(orientation), grid_size=(9, 9), steps=steps)
+    assert (position.x, position.y) == dst_position
+
+
 @pytest.mark.parametrize('src_position, grid_size, dst_position', [
     pytest.param((0, 0), (9, 4), (0, 0), id='inside_bottom_left_corner'),
     pytest.param((0, 4), (9, 4), (0, 4), id='inside_top_left_corner'),
@@ -48,10 +71,10 @@ def test_restrict_position_to_grid(src_position, grid_size, dst_position):
 
 
 @pytest.mark.parametrize('orientation, expected', [
-    pytest.param('N', complex(0, 1), id='valid_north'),
-    pytest.param('S', complex(0, -1), id='valid_south'),
-    pytest.param('W', complex(-1, 0), id='valid_west'),
-    pytest.param('E', complex(1, 0), id='valid_east'),
+    pytest.param('N', 0, id='valid_north'),
+    pytest.param('S', 2, id='valid_south'),
+    pytest.param('W', 3, id='valid_west'),
+    pytest.param('E', 1, id='valid_east'),
     pytest.param('', ValueError('Invalid orientation'), id='invalid_empty'),
     pytest.param('X', ValueError('Invalid orientation'), id='invalid_non_existing')
 ])
@@ -64,7 +87,7 @@ def test_init_orientation(orientation, expected):
     else:
         # Expect a successful initialization with the right attribute
         orientation_obj = Orientation(orientation)
-        assert orientation_obj.cplx_orientation == expected
+        assert orientation_obj.index == expected
         assert orientation_obj.orientation == orientation
 
 
@@ -97,15 +120,32 @@ def test_rotate_orientation(src_orientation, rotate_method, dst_orientation):
     assert orientation.orientation == dst_orientation
 
 
-def test_mower_initialization():
-    position = Position(8, 9)
+@pytest.mark.parametrize('quarter_turns, dst_orientation', [
+    pytest.param(0, 'N', id='zero'),
+    pytest.param(1, 'W', id='one_left'),
+    pytest.param(2, 'S', id='two_left'),
+    pytest.param(3, 'E', id='three_left'),
+    pytest.param(-1, 'E', id='one_right'),
+    pytest.param(9, 'W', id='nine_left')
+])
+def test_rotate_orientation_several_quarter_turns(quarter_turns, dst_orientation):
+    orientation = Orientation('N')
+    orientation.rotate(quarter_turns)
+    assert orientation.orientation == dst_orientation
+
 
-    with mock.patch.object(position, 'restrict_to_grid') as restrict_to_grid:
-        mower = Mower(position, Orientation('W'), grid_size=(10, 10))
-        restrict_to_grid.assert_called_once()
+@pytest.mark.parametrize('src_position, dst_position', [
+    pytest.param((8, 9), (8, 9), id='inside'),
+    pytest.param((12, 9), (10, 9), id='outside_x'),
+    pytest.param((8, -9), (8, 0), id='outside_y')
+])
+def test_mower_initialization(src_position, dst_position):
+    mower = Mower(Position(*src_position), Orientation('W'), grid_size=(10, 10))
 
-    assert (mower.x, mower.y) == (8, 9)
+    assert (mower.x, mower.y) == dst_position
     assert mower.orientation == 'W'
+    assert mower.orientation_index == 3
+    assert mower.grid_size == (10, 10)
 
 
 def test_str_mower():
@@ -113,21 +153,41 @@ def test_str_mower():
     assert str(mower) == '8 9 W'
 
 
-@pytest.mark.parametrize('move, rotate_left_calls, rotate_right_calls, forward_calls', [
-    pytest.param('L', 1, 0, 0, id='rotate_left'),
-    pytest.param('R', 0, 1, 0, id='rotate_right'),
-    pytest.param('F', 0, 0, 1, id='forward')
+@pytest.mark.parametrize('src_state, move, dst_state, wall_hits', [
+    pytest.param((8, 9, 'W'), 'L', (8, 9, 'S'), 0, id='rotate_left'),
+    pytest.param((8, 9, 'W'), 'R', (8, 9, 'N'), 0, id='rotate_right'),
+    pytest.param((8, 9, 'W'), 'F', (7, 9, 'W'), 0, id='forward_W'),
+    pytest.param((8, 9, 'E'), 'F', (9, 9, 'E'), 0, id='forward_E'),
+    pytest.param((8, 9, 'N'), 'F', (8, 10, 'N'), 0, id='forward_N'),
+    pytest.param((8, 9, 'S'), 'F', (8, 8, 'S'), 0, id='forward_S'),
+    pytest.param((0, 9, 'W'), 'F', (0, 9, 'W'), 1, id='forward_blocked_W'),
+    pytest.param((10, 9, 'E'), 'F', (10, 9, 'E'), 1, id='forward_blocked_E'),
+    pytest.param((8, 10, 'N'), 'F', (8, 10, 'N'), 1, id='forward_blocked_N'),
+    pytest.param((8, 0, 'S'), 'F', (8, 0, 'S'), 1, id='forward_blocked_S')
+])
+def test_step_mower(src_state, move, dst_state, wall_hits):
+    x, y, orientation = src_state
+    mower = Mower(Position(x, y), Orientation(orientation), grid_size=(10, 10))
+    assert mower.step(move) == wall_hits
+    assert (mower.x, mower.y, mower.orientation) == dst_state
+
+
+def test_step_mower_invalid_move():
+    mower = Mower(Position(8, 9), Orientation('W'), grid_size=(10, 10))
+    with pytest.raises(NotImplementedError, match='Invalid move'):
+        mower.step('X')
+
+
+@pytest.mark.parametrize('src_state, quarter_turns, steps, dst_state, wall_hits', [
+    pytest.param((8, 9, 'W'), 0, 3, (5, 9, 'W'), 0, id='forward_W'),
+    pytest.param((8, 9, 'W'), 0, 30, (0, 9, 'W'), 22, id='forward_clamped_W'),
+    pytest.param((8, 9, 'W'), 1, 4, (8, 5, 'S'), 0, id='left_forward_S'),
+    pytest.param((8, 9, 'W'), -1, 4, (8, 10, 'N'), 3, id='right_forward_clamped_N'),
+    pytest.param((8, 9, 'W'), 2, 1, (9, 9, 'E'), 0, id='u_turn_forward_E')
 ])
-def test_step_mower(move, rotate_left_calls, rotate_right_calls, forward_calls):
-    position = Position(8, 9)
-    orientation = Orientation('W')
-    mower = Mower(position, orientation, grid_size=(10, 10))
-
-    with mock.patch.object(orientation, 'rotate_left') as rotate_left:
-        with mock.patch.object(orientation, 'rotate_right') as rotate_right:
-            with mock.patch.object(position, 'forward') as forward:
-                mower.step(move)
-
-                assert rotate_left.call_count == rotate_left_calls
-                assert rotate_right.call_count == rotate_right_calls
-                assert forward.call_count == forward_calls
+def test_rotate_and_forward_mower(src_state, quarter_turns, steps, dst_state, wall_hits):
+    x, y, orientation = src_state
+    mower = Mower(Position(x, y), Orientation(orientation), grid_size=(10, 10))
+    mower.rotate(quarter_turns)
+    assert mower.forward(steps) == wall_hits
+    assert (mower.x, mower.y, mower.orientation) == dst_state
@@ -0,0 +1,77 @@
+import pytest
+
+from mower.structs import Mower, Orientation, Position
+from mower.trace import (MAGIC, MAX_COORDINATE, MappedTrace, TraceRecord, TraceWriter,
+                         check_grid_size, iter_trace)
+
+EXPECTED_RECORDS = [
+    TraceRecord(1, 0, 1, 2, 'N'),
+    TraceRecord(1, 1, 1, 2, 'W'),
+    TraceRecord(1, 2, 0, 2, 'W'),
+    TraceRecord(1, 3, 0, 2, 'W'),
+    TraceRecord(1, 4, 0, 2, 'S'),
+    TraceRecord(2, 0, 2 ** 40, 0, 'E'),
+    TraceRecord(2, 1, 2 ** 40, 0, 'E')
+]
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    path = str(tmp_path / 'trace.bin')
+
+    with TraceWriter(path, buffer_size=16) as tracer:
+        mower = Mower(Position(1, 2), Orientation('N'), grid_size=(5, 5))
+        tracer.record(1, 0, mower)
+        # Trace moves in two chunks
+        step = tracer.trace(1, mower, 'LF')
+        assert step == 2
+        step = tracer.trace(1, mower, '', step)
+        assert step == 2
+        step = tracer.trace(1, mower, 'FL', step)
+        assert step == 4
+        assert str(mower) == '0 2 S'
+
+        mower = Mower(Position(2 ** 40, 0), Orientation('E'), grid_size=(2 ** 40, 5))
+        tracer.record(2, 0, mower)
+        tracer.trace(2, mower, 'F')
+
+    return path
+
+
+def test_iter_trace(trace_path):
+    assert list(iter_trace(trace_path)) == EXPECTED_RECORDS
+
+
+def test_mapped_trace(trace_path):
+    with MappedTrace(trace_path) as trace:
+        assert len(trace) == len(EXPECTED_RECORDS)
+        assert list(trace) == EXPECTED_RECORDS
+        assert trace[-2] == EXPECTED_RECORDS[-2]
+
+        with pytest.raises(IndexError):
+            print(trace[len(EXPECTED_RECORDS)])
+
+
+@pytest.mark.parametrize('content, expected', [
+    pytest.param(b'MOWTRAC', ValueError('missing "MOWTRACE" header'), id='invalid_magic'),
+    pytest.param(MAGIC + b'\0' * 7, ValueError('truncated record'), id='truncated_record')
+])
+@pytest.mark.parametrize('read', [lambda path: list(iter_trace(path)), MappedTrace],
+                         ids=['iter_trace', 'MappedTrace'])
+def test_invalid_trace(tmp_path, content, expected, read):
+    path = tmp_path / 'trace.bin'
+    path.write_bytes(content)
+
+    with pytest.raises(type(expected), match=str(expected)):
+        read(str(path))
+
+
+@pytest.mark.parametrize('grid_size', [(5, 5), (MAX_COORDINATE, MAX_COORDINATE)])
+def test_check_grid_size(grid_size):
+    check_grid_size(grid_size)
+
+
+def test_check_grid_size_too_large():
+    with pytest.raises(ValueError, match=r'Grid size \(5, 9223372036854775808\) too large for '
+                                         r'trace files'):
+        check_grid_size((5, 1 << 63))
@@ -0,0 +1,142 @@
+import os
+import random
+
+import pytest
+
+from mower.engines import step_engine
+from mower.structs import Mower, Orientation, Position
+from mower.trajectory import MAGIC, MAX_COORDINATE, TrajectoryIndex, is_up_to_date
+
+GRID_SIZE = (6, 9)
+
+
+def make_mower(x, y, orientation):
+    return Mower(Position(x, y), Orientation(orientation), GRID_SIZE)
+
+
+def random_mowers(n_mowers, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randint(0, GRID_SIZE[0]), rng.randint(0, GRID_SIZE[1]), rng.choice('NESW'),
+             ''.join(rng.choice('LRF') for _ in range(rng.randint(0, 40))))
+            for _ in range(n_mowers)]
+
+
+def build_index(mowers, interval):
+    index = TrajectoryIndex(GRID_SIZE, interval)
+    for x, y, orientation, moves in mowers:
+        index.add(make_mower(x, y, orientation), moves)
+    return index
+
+
+def assert_matches_replay(index, mowers):
+    assert len(index) == len(mowers)
+
+    for mower_id, (x, y, orientation, moves) in enumerate(mowers, 1):
+        for step in range(len(moves) + 1):
+            expected = make_mower(x, y, orientation)
+            step_engine(expected, moves[:step])
+            assert str(index.where(mower_id, step)) == str(expected)
+
+
+@pytest.mark.parametrize('interval', [1, 3, 4, 7, 1024])
+def test_where(interval):
+    mowers = random_mowers(10)
+    assert_matches_replay(build_index(mowers, interval), mowers)
+
+
+def test_add_moves_mower():
+    mower = make_mower(1, 2, 'N')
+    TrajectoryIndex(GRID_SIZE, 4).add(mower, 'LFLFLFLFF')
+    assert str(mower) == '1 3 N'
+
+
+@pytest.mark.parametrize('mower_id, step, expected', [
+    pytest.param(0, 0, 'Invalid mower id: 0, must be in \\[1, 2\\]', id='mower_id_too_small'),
+    pytest.param(3, 0, 'Invalid mower id: 3', id='mower_id_too_large'),
+    pytest.param(1, -1, 'Invalid step: -1, must be in \\[0, 4\\]', id='negative_step'),
+    pytest.param(1, 5, 'Invalid step: 5', id='step_too_large')
+])
+def test_where_out_of_range(mower_id, step, expected):
+    index = build_index([(1, 2, 'N', 'LFLF'), (3, 3, 'E', 'FF')], 2)
+    with pytest.raises(IndexError, match=expected):
+        index.where(mower_id, step)
+
+
+def test_invalid_interval():
+    with pytest.raises(ValueError, match='Invalid snapshot interval'):
+        TrajectoryIndex(GRID_SIZE, 0)
+
+
+@pytest.mark.parametrize('grid_size', [
+    pytest.param((MAX_COORDINATE + 1, 5), id='x'),
+    pytest.param((5, 99999999999999999999), id='y')
+])
+def test_grid_too_large(tmp_path, grid_size):
+    with pytest.raises(ValueError, match='too large for trajectory indexes'):
+        TrajectoryIndex(grid_size)
+
+    path = tmp_path / 'input.txt'
+    path.write_text('{} {}\n1 2 N\nLF\n'.format(*grid_size))
+    with pytest.raises(ValueError, match='too large for trajectory indexes'):
+        TrajectoryIndex.build(str(path))
+
+
+def test_largest_grid(tmp_path):
+    path, index_path = tmp_path / 'input.txt', str(tmp_path / 'index.bin')
+    path.write_text(f'{MAX_COORDINATE} 5\n{MAX_COORDINATE} 2 N\nLFRRF\n')
+
+    TrajectoryIndex.build(str(path), interval=2).save(index_path)
+    index = TrajectoryIndex.load(index_path)
+    assert index.grid_size == (MAX_COORDINATE, 5)
+    assert str(index.where(1, 5)) == f'{MAX_COORDINATE} 2 E'
+
+
+@pytest.mark.parametrize('interval', [1, 5])
+def test_save_and_load(tmp_path, interval):
+    path = str(tmp_path / 'index.bin')
+    mowers = random_mowers(10) + [(0, 0, 'N', '')]
+
+    build_index(mowers, interval).save(path)
+
+    index = TrajectoryIndex.load(path)
+    assert (index.grid_size, index.interval) == (GRID_SIZE, interval)
+    assert_matches_replay(index, mowers)
+
+
+@pytest.mark.parametrize('cut, expected', [
+    pytest.param(len(MAGIC) - 1, 'missing "MOWINDEX" header', id='invalid_magic'),
+    pytest.param(len(MAGIC) + 8, 'truncated file', id='truncated_header'),
+    pytest.param(-1, 'truncated file', id='truncated_moves')
+])
+def test_load_invalid(tmp_path, cut, expected):
+    path = tmp_path / 'index.bin'
+    build_index(random_mowers(2), 3).save(str(path))
+    path.write_bytes(path.read_bytes()[:cut])
+
+    with pytest.raises(ValueError, match=expected):
+        TrajectoryIndex.load(str(path))
+
+
+def test_build(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n')
+
+    index = TrajectoryIndex.build(str(path), interval=4)
+    assert index.grid_size == (5, 5)
+    assert str(index.where(1, 9)) == '1 3 N'
+    assert str(index.where(2, 10)) == '5 1 E'
+    assert str(index.where(2, 2)) == '5 3 E'
+
+
+def test_is_up_to_date(tmp_path):
+    path, index_path = tmp_path / 'input.txt', tmp_path / 'index.bin'
+    path.write_text('5 5\n')
+    assert not is_up_to_date(str(index_path), str(path))
+
+    index_path.write_bytes(b'')
+    os.utime(str(path), (0, 0))
+    assert is_up_to_date(str(index_path), str(path))
+
+    os.utime(str(index_path), (0, 0))
+    os.utime(str(path), (1, 1))
+    assert not is_up_to_date(str(index_path), str(path))
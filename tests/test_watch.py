@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from mower.watch import WatchedFile
+
+INSTRUCTIONS = '5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n'
+
+
+def write(path, content, mtime_ns):
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def update(watched):
+    return [(i, str(mower)) for i, mower in watched.update()]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'instructions.txt'
+    write(path, INSTRUCTIONS, 1)
+    return path
+
+
+def test_first_update(path):
+    watched = WatchedFile(str(path))
+    assert update(watched) == [(1, '1 3 N'), (2, '5 1 E')]
+    assert watched.grid_size == (5, 5)
+    assert watched.n_mowers == 2
+
+
+@pytest.mark.parametrize('content, expected', [
+    pytest.param(INSTRUCTIONS, [], id='unchanged'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRFL\n', [(2, '5 1 N')],
+                 id='moves_changed'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n3 2 E\nFFRFFRFRRF\n', [(2, '5 0 E')],
+                 id='initial_state_changed'),
+    pytest.param(INSTRUCTIONS + '0 0 N\nFF\n', [(3, '0 2 N')], id='mower_added'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n', [], id='mower_removed'),
+    pytest.param('5 5\n1 2 N  \nLFLFLFLFF\r\n3 3 E\nFFRFFRFRRF', [], id='whitespace'),
+    pytest.param('5 5\n1 2 N\nLFLFLFLFF\n\n3 3 E\nFFRFFRFRRF\n', [], id='truncated'),
+    pytest.param('6 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFRFFRFRRF\n', [(1, '1 3 N'), (2, '5 1 E')],
+                 id='grid_size_changed'),
+])
+def test_update(path, content, expected):
+    watched = WatchedFile(str(path))
+    watched.update()
+
+    write(path, content, 2)
+    assert update(watched) == expected
+
+
+def test_missing_moves_line(path):
+    write(path, '5 5\n1 2 N', 1)
+    assert update(WatchedFile(str(path))) == [(1, '1 2 N')]
+
+
+def test_invalid_update_keeps_state(path):
+    watched = WatchedFile(str(path))
+    watched.update()
+
+    write(path, '5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFFX\n', 2)
+    with pytest.raises(ValueError, match='Invalid moves: "FFX"'):
+        watched.update()
+
+    write(path, '5 5\n1 2 N\nLFLFLFLFF\n3 3 E\nFF\n', 3)
+    assert update(watched) == [(2, '5 3 E')]
+
+
+def test_changed(path):
+    watched = WatchedFile(str(path))
+    assert watched.changed()
+    assert not watched.changed()
+
+    # Same size, new modification time
+    write(path, INSTRUCTIONS.replace('N', 'S'), 2)
+    assert watched.changed()
+    assert not watched.changed()
+
+    # Same modification time, new size
+    write(path, INSTRUCTIONS + '0 0 N\nF\n', 2)
+    assert watched.changed()
+
+    path.unlink()
+    assert watched.changed()
+    assert not watched.changed()
+
+
+def test_engine(path):
+    calls = []
+    watched = WatchedFile(str(path), lambda mower, moves: calls.append(moves))
+    watched.update()
+    assert calls == ['LFLFLFLFF', 'FFRFFRFRRF']